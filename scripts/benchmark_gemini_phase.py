@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the Gemini analysis phase.
+
+Runs run_gemini_phase against the fake Gemini service (no API key, no quota)
+and reports throughput for several concurrency levels.
+
+Usage:
+    python scripts/benchmark_gemini_phase.py --videos 60 --latency 1.0 --rpm 120
+    python scripts/benchmark_gemini_phase.py --videos 60 --batch-size 5
+"""
+import argparse
+import sys
+import tempfile
+import time
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.fake_gemini import FakeGeminiService  # noqa: E402
+from src.utils.batch_tracker import BatchTracker  # noqa: E402
+from src.utils.rate_limiter import TokenBucketLimiter  # noqa: E402
+from scripts.run_pipeline import run_gemini_phase  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Gemini phase offline")
+    parser.add_argument("--videos", type=int, default=60, help="Videos to analyze")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake call latency (s)")
+    parser.add_argument("--rpm", type=float, default=120, help="Requests per minute budget")
+    parser.add_argument("--quota-rpm", type=float, default=None,
+                        help="Simulated server quota; calls beyond it get 429")
+    parser.add_argument("--batch-size", type=int, default=1, help="Videos per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    videos = [{"webVideoUrl": f"https://www.tiktok.com/@bench/video/{i}"}
+              for i in range(args.videos)]
+
+    print(f"{'concurrency':>12} {'seconds':>8} {'videos/min':>11} {'requests':>9} {'429s':>5}")
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            service = FakeGeminiService(latency=args.latency,
+                                        requests_per_minute=args.quota_rpm)
+            limiter = TokenBucketLimiter(requests_per_minute=args.rpm)
+
+            start = time.perf_counter()
+            run_gemini_phase(videos, "@bench", BatchTracker("benchmark"),
+                             concurrency=concurrency, limiter=limiter,
+                             analyzer=service.analyze_tiktok_video,
+                             batch_size=args.batch_size,
+                             batch_analyzer=service.analyze_tiktok_videos)
+            elapsed = time.perf_counter() - start
+
+        print(f"{concurrency:>12} {elapsed:>8.1f} {args.videos / elapsed * 60:>11.1f} "
+              f"{service.calls:>9} {service.throttled:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compile a served model pickle into the NumPy tree-ensemble format.
+
+Writes `<model>.npz` next to the pickle; the API serves it instead of the
+pickle when it is present and up to date (disable with ML_MODEL_COMPILED=0).
+The compiled predictions are checked against the original model before
+the file is written.
+
+Usage:
+    python scripts/compile_model.py
+    python scripts/compile_model.py --model models/iter_002_model.pkl --samples 5000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.ml_model import MLModelManager  # noqa: E402
+from src.models.tree_ensemble import compile_model  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compile a tree-ensemble model to NumPy arrays")
+    parser.add_argument("--model", type=Path, default=None,
+                        help="Model pickle (default: the model the API serves)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Output .npz (default: next to the pickle)")
+    parser.add_argument("--samples", type=int, default=2000,
+                        help="Random rows used to check the compiled predictions")
+    parser.add_argument("--tolerance", type=float, default=1e-6,
+                        help="Maximum absolute difference allowed")
+    return parser.parse_args()
+
+
+def _timed(predict, X, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    args = parse_args()
+    model_path = args.model or MLModelManager().model_path
+    output = args.output or model_path.with_suffix(".npz")
+
+    if not model_path.exists():
+        print(f"❌ Model not found: {model_path}")
+        return 1
+
+    model = joblib.load(model_path)
+    compiled = compile_model(model)
+    print(f"🔧 {compiled.source}: {compiled.n_trees} trees, {compiled.n_nodes} nodes, "
+          f"depth {compiled.max_depth}")
+
+    # Random inputs spread over the thresholds the model actually uses
+    rng = np.random.default_rng(0)
+    internal = compiled.feature >= 0
+    X = np.zeros((args.samples, compiled.n_features_in_), dtype=np.float32)
+    for column in range(compiled.n_features_in_):
+        thresholds = compiled.threshold[internal & (compiled.feature == column)]
+        if thresholds.size:
+            X[:, column] = rng.uniform(thresholds.min() - 1, thresholds.max() + 1, args.samples)
+
+    # The original model gets the column names it was fitted with
+    names = getattr(compiled, "feature_names_in_", None)
+    X_model = X if names is None else pd.DataFrame(X, columns=list(names))
+
+    expected = np.asarray(model.predict(X_model), dtype=float)
+    error = float(np.abs(compiled.predict(X) - expected).max())
+    print(f"📊 Max abs difference on {args.samples} rows: {error:.3g}")
+    if error > args.tolerance:
+        print(f"❌ Above tolerance {args.tolerance}, not writing {output}")
+        return 1
+
+    for rows in (1, 50, args.samples):
+        print(f"   {rows:>5} rows: original {_timed(model.predict, X_model[:rows]):8.2f} ms, "
+              f"compiled {_timed(compiled.predict, X[:rows]):8.2f} ms")
+
+    compiled.save(output)
+    print(f"✅ Compiled model written: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,19 +10,23 @@ Complete pipeline script for TikTok virality analysis with batch processing:
 - Improved batch processing with account rotation
 - Better error handling and retry logic
 """
-from src.scraping.tiktok_scraper import TikTokScraper
+from src.scraping.tiktok_scraper import SCRAPE_MODES, TikTokScraper
+from src.services.gemini_health import get_gemini_health
+from src.utils.analysis_index import get_analysis_index
 from src.utils.batch_tracker import BatchTracker
 from src.utils.data_validator import DataValidator
+from src.utils.rate_limiter import TokenBucketLimiter, is_retryable_failure
+from src.utils.stage_pipeline import Stage, StagePipeline
 from config.settings import TIKTOK_ACCOUNTS
 import argparse
 import json
 import logging
 import sys
-import time
 import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -169,6 +173,79 @@ def parse_args():
         help="Feature set to use with modular system (default: metadata)"
     )
 
+    # Scraping throughput
+    parser.add_argument(
+        "--scrape-mode",
+        choices=list(SCRAPE_MODES),
+        default='serial',
+        help="How a batch's accounts are scraped: one after the other, packed "
+             "into one actor run, or as concurrent runs (default: serial)"
+    )
+
+    parser.add_argument(
+        "--scrape-concurrency",
+        type=int,
+        default=4,
+        help="Actor runs in flight at once with --scrape-mode concurrent (default: 4)"
+    )
+
+    # Gemini analysis throughput
+    parser.add_argument(
+        "--gemini-concurrency",
+        type=int,
+        default=1,
+        help="Number of Gemini analyses in flight at once (default: 1)"
+    )
+
+    parser.add_argument(
+        "--gemini-batch-size",
+        type=int,
+        default=1,
+        help="Videos analyzed per Gemini request; the instructions are sent "
+             "once per request (default: 1)"
+    )
+
+    parser.add_argument(
+        "--gemini-rpm",
+        type=float,
+        default=30,
+        help="Gemini requests per minute budget (default: 30)"
+    )
+
+    parser.add_argument(
+        "--gemini-tpm",
+        type=float,
+        default=None,
+        help="Gemini tokens per minute budget (default: unlimited)"
+    )
+
+    parser.add_argument(
+        "--gemini-stub",
+        action="store_true",
+        help="Use the offline fake Gemini service (testing and benchmarks)"
+    )
+
+    parser.add_argument(
+        "--feature-workers",
+        type=int,
+        default=1,
+        help="Processes used for feature extraction: accounts of a batch are "
+             "sharded across them, or a single account's videos are chunked (default: 1)"
+    )
+
+    parser.add_argument(
+        "--stage-queue-size",
+        type=int,
+        default=2,
+        help="Accounts buffered between two pipeline stages (default: 2)"
+    )
+
+    parser.add_argument(
+        "--no-feature-cache",
+        action="store_true",
+        help="Recompute all features instead of reusing data/feature_cache"
+    )
+
     # ITER_004: Randomization and diversity arguments
     parser.add_argument(
         "--random-seed",
@@ -217,87 +294,181 @@ def setup_logging(dataset_name: str):
     return logging.getLogger(__name__)
 
 
-def run_scraping_phase(accounts: List[str], max_videos: int, tracker: BatchTracker) -> List[Dict]:
-    """Run TikTok scraping phase for a batch of accounts."""
+def validate_scraped_account(
+    result: Dict,
+    account: str,
+    tracker: BatchTracker,
+    validator: Optional[DataValidator] = None
+) -> Optional[Dict]:
+    """Validate a scraped account and keep only its valid videos.
+
+    Returns:
+        The result with filtered videos, or None once the account has been
+        marked as failed
+    """
+    logger = logging.getLogger(__name__)
+    validator = validator or DataValidator()
+
+    is_valid, errors = validator.validate_account(result)
+
+    if not is_valid:
+        # Check if there are critical errors
+        if validator.has_critical_errors(errors):
+            error_summary = validator.get_error_summary(errors)
+            critical_errors = ', '.join(error_summary["critical"])
+            logger.error(
+                f"❌ Account {account} has critical errors: {critical_errors}")
+            tracker.mark_account_failed(
+                account, "scraping", f"Critical errors: {critical_errors}")
+            return None
+
+        # For validation errors, log as warning and continue
+        error_summary = validator.get_error_summary(errors)
+        validation_errors = ', '.join(error_summary["validation"])
+        logger.warning(
+            f"⚠️ Account {account} failed validation: {validation_errors}")
+        tracker.mark_account_failed(
+            account, "scraping", f"Validation failed: {validation_errors}")
+        return None
+
+    # Filter valid videos
+    valid_videos = validator.filter_valid_videos(result.get('videos', []))
+    if len(valid_videos) == 0:
+        logger.warning(
+            f"⚠️ Account {account} has no valid videos after filtering")
+        tracker.mark_account_failed(
+            account, "scraping", "No valid videos after filtering")
+        return None
+
+    # Update result with filtered videos
+    result['videos'] = valid_videos
+    logger.info(
+        f"✅ Successfully scraped and validated account: {account} ({len(valid_videos)} valid videos)")
+    return result
+
+
+def run_scraping_phase(
+    accounts: List[str],
+    max_videos: int,
+    tracker: BatchTracker,
+    scrape_mode: str = 'serial',
+    scrape_concurrency: int = 4,
+    scraper: Optional[TikTokScraper] = None
+) -> List[Dict]:
+    """Run TikTok scraping phase for a batch of accounts.
+
+    Args:
+        accounts: Accounts of the batch
+        max_videos: Maximum number of videos per account
+        tracker: Batch tracker for error logging
+        scrape_mode: 'serial', 'packed' (one actor run for the whole batch)
+            or 'concurrent' (one run per account, several in flight)
+        scrape_concurrency: Actor runs in flight at once in concurrent mode
+        scraper: Scraper to reuse (default: a new one for the batch)
+    """
     logger = logging.getLogger(__name__)
-    logger.info(f"🔍 Starting TikTok scraping for {len(accounts)} accounts...")
+    logger.info(
+        f"🔍 Starting TikTok scraping for {len(accounts)} accounts (mode: {scrape_mode})...")
 
     validator = DataValidator()
     results = []
 
+    try:
+        # One client shared by every account of the batch
+        scraper = scraper or TikTokScraper()
+        scraped = scraper.scrape_multiple_profiles(
+            accounts, max_videos, mode=scrape_mode, max_concurrency=scrape_concurrency)
+    except Exception as e:
+        error_msg = f"Scraping failed: {str(e)}"
+        logger.error(f"❌ {error_msg}")
+        for account in accounts:
+            tracker.mark_account_failed(account, "scraping", error_msg)
+        return results
+
+    scraped_by_account = {
+        result.get('username', '').lstrip('@').lower(): result for result in scraped}
+
     for account in accounts:
-        try:
-            scraper = TikTokScraper()
-            account_results = scraper.scrape_multiple_profiles(
-                [account], max_videos)
-
-            # Validate account data
-            for result in account_results:
-                is_valid, errors = validator.validate_account(result)
-
-                if not is_valid:
-                    # Check if there are critical errors
-                    if validator.has_critical_errors(errors):
-                        error_summary = validator.get_error_summary(errors)
-                        critical_errors = ', '.join(error_summary["critical"])
-                        logger.error(
-                            f"❌ Account {account} has critical errors: {critical_errors}")
-                        tracker.mark_account_failed(
-                            account, "scraping", f"Critical errors: {critical_errors}")
-                        continue
-
-                    # For validation errors, log as warning and continue
-                    error_summary = validator.get_error_summary(errors)
-                    validation_errors = ', '.join(error_summary["validation"])
-                    logger.warning(
-                        f"⚠️ Account {account} failed validation: {validation_errors}")
-                    tracker.mark_account_failed(
-                        account, "scraping", f"Validation failed: {validation_errors}")
-                    continue
-
-                # Filter valid videos
-                valid_videos = validator.filter_valid_videos(
-                    result.get('videos', []))
-                if len(valid_videos) == 0:
-                    logger.warning(
-                        f"⚠️ Account {account} has no valid videos after filtering")
-                    tracker.mark_account_failed(
-                        account, "scraping", "No valid videos after filtering")
-                    continue
-
-                # Update result with filtered videos
-                result['videos'] = valid_videos
-                results.append(result)
-                logger.info(
-                    f"✅ Successfully scraped and validated account: {account} ({len(valid_videos)} valid videos)")
+        result = scraped_by_account.get(account.lstrip('@').lower())
+        if result is None:
+            error_msg = "Scraping failed: no data returned by the scraper"
+            logger.error(f"❌ {error_msg}")
+            tracker.mark_account_failed(account, "scraping", error_msg)
+            continue
 
+        try:
+            result = validate_scraped_account(result, account, tracker, validator)
         except Exception as e:
             error_msg = f"Scraping failed: {str(e)}"
             logger.error(f"❌ {error_msg}")
             tracker.mark_account_failed(account, "scraping", error_msg)
             continue
 
+        if result is not None:
+            results.append(result)
+
     return results
 
 
-def run_gemini_phase(videos: List[Dict], account: str, tracker: BatchTracker):
-    """Run Gemini analysis phase for a batch of videos."""
+def run_gemini_phase(
+    videos: List[Dict],
+    account: str,
+    tracker: BatchTracker,
+    concurrency: int = 1,
+    limiter: Optional[TokenBucketLimiter] = None,
+    analyzer: Optional[Callable[[str], Dict]] = None,
+    max_retries: int = 3,
+    batch_size: int = 1,
+    batch_analyzer: Optional[Callable[[List[str], int], Dict[str, Dict]]] = None
+):
+    """Run Gemini analysis phase for a batch of videos.
+
+    Args:
+        videos: Scraped videos of the account
+        account: Account name
+        tracker: Batch tracker for error logging
+        concurrency: Number of requests in flight at once
+        limiter: Shared requests/tokens per minute budget (default: 30 RPM)
+        analyzer: Analysis function (default: Gemini service; see
+            src/services/fake_gemini.py for an offline stub)
+        max_retries: Retries of a throttled (429/5xx) analysis
+        batch_size: Videos analyzed per request (1 for one request per video)
+        batch_analyzer: Batched analysis function, (urls, max_batch_size) ->
+            results by URL (default: Gemini service, or `analyzer` per URL)
+    """
     logger = logging.getLogger(__name__)
     logger.info(
-        f"🧠 Starting Gemini analysis for {len(videos)} videos from {account}")
+        f"🧠 Starting Gemini analysis for {len(videos)} videos from {account} "
+        f"(concurrency: {concurrency})")
 
     validator = DataValidator()
 
     try:
-        from src.services.gemini_service import analyze_tiktok_video
+        from src.services.gemini_service import batch_token_estimate, incomplete_retries
+        if batch_analyzer is None:
+            if analyzer is not None:
+                def batch_analyzer(urls, max_batch_size):
+                    return {url: analyzer(url) for url in urls}
+            else:
+                from src.services.gemini_service import analyze_tiktok_videos
+                batch_analyzer = analyze_tiktok_videos
+        if analyzer is None:
+            from src.services.gemini_service import analyze_tiktok_video
+            analyzer = analyze_tiktok_video
+        batch_size = max(1, batch_size)
+        if limiter is None:
+            # Same throughput as the former fixed pause between calls
+            limiter = TokenBucketLimiter(requests_per_minute=30)
 
         date_str = datetime.now().strftime("%Y%m%d")
         # Unified structure: data/dataset_name/gemini_analysis/account/date
         analysis_dir = Path(
             "data") / f"dataset_{tracker.dataset_name}" / "gemini_analysis" / account / date_str
         analysis_dir.mkdir(parents=True, exist_ok=True)
+        account_index = get_analysis_index(analysis_dir.parent)
 
         successful_analyses = 0
+        pending = []
         for video in videos:
             video_url = video.get("webVideoUrl")
             if not video_url:
@@ -312,38 +483,95 @@ def run_gemini_phase(videos: List[Dict], account: str, tracker: BatchTracker):
                 successful_analyses += 1
                 continue
 
-            try:
-                result = analyze_tiktok_video(video_url)
-
-                # Validate analysis result
-                is_valid, errors = validator.validate_gemini_analysis(result)
-                if not is_valid:
-                    if validator.has_critical_errors(errors):
-                        error_summary = validator.get_error_summary(errors)
-                        critical_errors = ', '.join(error_summary["critical"])
-                        logger.error(
-                            f"❌ Critical analysis errors for video {video_id}: {critical_errors}")
-                        tracker.log_error(
-                            account, "analysis", f"Critical errors for video {video_id}: {critical_errors}")
-                    else:
-                        error_summary = validator.get_error_summary(errors)
-                        validation_errors = ', '.join(
-                            error_summary["validation"])
-                        logger.warning(
-                            f"⚠️ Analysis validation failed for video {video_id}: {validation_errors}")
-                        tracker.log_error(
-                            account, "analysis", f"Validation failed for video {video_id}: {validation_errors}")
-                    continue
-
-                with open(output_file, 'w') as f:
-                    json.dump(result, f, indent=2)
-                successful_analyses += 1
-                time.sleep(2)  # Rate limiting
-            except Exception as e:
-                error_msg = f"Analysis failed for video {video_id}: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                tracker.log_error(account, "analysis", error_msg)
-                # Continue with next video instead of failing completely
+            pending.append((video_id, video_url, output_file))
+
+        def analyze(video_urls: List[str]) -> Dict[str, Dict]:
+            if len(video_urls) == 1:
+                return {video_urls[0]: analyzer(video_urls[0])}
+            return batch_analyzer(video_urls, len(video_urls))
+
+        def analyze_group(video_urls: List[str]) -> Dict[str, Dict]:
+            # Videos a batch response left out are sent again, each time
+            # through the limiter like the first request
+            results = {}
+            queue = [list(video_urls)]
+            while queue:
+                group = queue.pop()
+                results.update(analyze_with_backoff(group))
+                queue.extend(incomplete_retries(group, results))
+            return results
+
+        def analyze_with_backoff(video_urls: List[str]) -> Dict[str, Dict]:
+            results = {}
+            remaining = list(video_urls)
+            for _ in range(max_retries + 1):
+                limiter.acquire(batch_token_estimate(len(remaining)))
+                results.update(analyze(remaining))
+                throttled = [url for url in remaining
+                             if is_retryable_failure(results.get(url, {}))]
+                if not throttled:
+                    if any(results.get(url, {}).get('success') for url in remaining):
+                        limiter.report_success()
+                    return results
+                limiter.report_throttled()
+                remaining = throttled
+            return results
+
+        # One request per group of `batch_size` videos
+        groups = [pending[start:start + batch_size]
+                  for start in range(0, len(pending), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                executor.submit(analyze_group, [video_url for _, video_url, _ in group]): group
+                for group in groups
+            }
+
+            # Results are validated and written from this thread only
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    group_results = future.result()
+                except Exception as e:
+                    group_results = {video_url: e for _, video_url, _ in group}
+
+                for video_id, video_url, output_file in group:
+                    try:
+                        result = group_results.get(video_url)
+                        if isinstance(result, Exception):
+                            raise result
+                        if result is None:
+                            raise Exception("no result returned")
+
+                        # Validate analysis result
+                        is_valid, errors = validator.validate_gemini_analysis(result)
+                        if not is_valid:
+                            if validator.has_critical_errors(errors):
+                                error_summary = validator.get_error_summary(errors)
+                                critical_errors = ', '.join(error_summary["critical"])
+                                logger.error(
+                                    f"❌ Critical analysis errors for video {video_id}: {critical_errors}")
+                                tracker.log_error(
+                                    account, "analysis", f"Critical errors for video {video_id}: {critical_errors}")
+                            else:
+                                error_summary = validator.get_error_summary(errors)
+                                validation_errors = ', '.join(
+                                    error_summary["validation"])
+                                logger.warning(
+                                    f"⚠️ Analysis validation failed for video {video_id}: {validation_errors}")
+                                tracker.log_error(
+                                    account, "analysis", f"Validation failed for video {video_id}: {validation_errors}")
+                            continue
+
+                        with open(output_file, 'w') as f:
+                            json.dump(result, f, indent=2)
+                        account_index.add(video_id, output_file)
+                        successful_analyses += 1
+                    except Exception as e:
+                        error_msg = f"Analysis failed for video {video_id}: {str(e)}"
+                        logger.error(f"❌ {error_msg}")
+                        tracker.log_error(account, "analysis", error_msg)
+                        # Continue with next video instead of failing completely
 
         if successful_analyses == 0:
             raise Exception(
@@ -364,11 +592,19 @@ def run_feature_extraction_phase(
     analysis_dir: Path,
     output_dir: Path,
     account: str,
-    tracker: BatchTracker,
+    tracker: Optional[BatchTracker],
     feature_system: str = 'legacy',
-    feature_set: str = 'metadata'
+    feature_set: str = 'metadata',
+    use_feature_cache: bool = True,
+    feature_workers: int = 1,
+    videos: Optional[List[Dict]] = None
 ):
-    """Run feature extraction phase for a batch."""
+    """Run feature extraction phase for a batch.
+
+    `videos` are the account's scraped videos; when omitted, every video of
+    the batch file at `raw_data_path` is used. Errors are logged to `tracker`
+    when given; in a worker process it is None and the caller logs them.
+    """
     logger = logging.getLogger(__name__)
     logger.info(
         f"📊 Starting feature extraction for {account} using {feature_system} system")
@@ -381,55 +617,48 @@ def run_feature_extraction_phase(
             try:
                 # Try modular system first
                 from src.features.modular_feature_system import FeatureExtractorManager
+                from src.features.feature_cache import FeatureCache
 
                 logger.info(
                     f"🔧 Using modular feature system with {feature_set} feature set")
-                manager = FeatureExtractorManager([feature_set])
+                # Unchanged videos (same raw item and analysis) are served from the cache
+                cache = FeatureCache.from_env() if use_feature_cache else None
+                manager = FeatureExtractorManager([feature_set], cache=cache)
 
                 # Load raw data and analysis data
-                with open(raw_data_path, 'r') as f:
-                    raw_data = json.load(f)
-
-                # Process each video with modular system
-                all_features = []
-                all_metadata = []
-
-                for video in raw_data.get('videos', []):
-                    # Find corresponding analysis file (search recursively like legacy system)
-                    video_id = video.get('id', '')
-                    analysis_files = list(analysis_dir.rglob(
-                        f'video_{video_id}_analysis.json'))
-
-                    gemini_analysis = None
-                    if analysis_files:
-                        # Take the first found
-                        analysis_file = analysis_files[0]
-                        with open(analysis_file, 'r') as f:
-                            analysis_data = json.load(f)
-                            # Extract the analysis field from the response structure
-                            if analysis_data.get('success') and 'analysis' in analysis_data:
-                                gemini_analysis = analysis_data['analysis']
-                            else:
-                                gemini_analysis = analysis_data  # Fallback for old format
-
-                    # Extract features using modular system
-                    features = manager.extract_features(video, gemini_analysis)
-                    all_features.append(features)
-
-                    # Create metadata entry
-                    metadata_entry = {
-                        "video_id": video_id,
+                if videos is None:
+                    with open(raw_data_path, 'r') as f:
+                        raw_data = json.load(f)
+                    videos = raw_data.get('videos', [])
+
+                # Resolve each video's Gemini analysis, then extract the
+                # whole account in one columnar pass
+                # One directory walk for the whole account (kept up to
+                # date by run_gemini_phase), instead of one rglob per video
+                analysis_index = get_analysis_index(analysis_dir)
+                analyses = [analysis_index.load(video.get('id', ''))
+                            for video in videos]
+
+                features_df = manager.extract_features_batch(
+                    videos, analyses, workers=feature_workers)
+                if cache is not None:
+                    stats = cache.stats()
+                    logger.info(
+                        f"🗄️ Feature cache: {stats['hits']} hits, {stats['misses']} misses")
+                    cache.close()
+
+                # Create metadata entries
+                feature_counts = features_df.notna().sum(axis=1).tolist()
+                metadata = [
+                    {
+                        "video_id": video.get('id', ''),
                         "is_valid": True,
-                        "feature_count": len(features),
+                        "feature_count": int(feature_count),
                         "system_used": "modular",
                         "feature_set": feature_set
                     }
-                    all_metadata.append(metadata_entry)
-
-                # Convert to DataFrame
-                import pandas as pd
-                features_df = pd.DataFrame(all_features)
-                metadata = all_metadata
+                    for video, feature_count in zip(videos, feature_counts)
+                ]
 
                 # Save results
                 output_file = output_dir / \
@@ -471,10 +700,18 @@ def run_feature_extraction_phase(
     except Exception as e:
         error_msg = f"Feature extraction failed: {str(e)}"
         logger.error(error_msg)
-        tracker.log_error(account, "features", error_msg)
+        if tracker is not None:
+            tracker.log_error(account, "features", error_msg)
         raise
 
 
+def create_gemini_limiter(args: argparse.Namespace) -> TokenBucketLimiter:
+    """Build the Gemini rate limiter from the command line budgets."""
+    return TokenBucketLimiter(
+        requests_per_minute=getattr(args, 'gemini_rpm', 30),
+        tokens_per_minute=getattr(args, 'gemini_tpm', None))
+
+
 def aggregate_features_after_extraction(output_dir: Path, feature_set: str):
     """Aggregate features after extraction phase."""
     logger = logging.getLogger(__name__)
@@ -517,27 +754,198 @@ def aggregate_features_after_extraction(output_dir: Path, feature_set: str):
 def process_batch(
     accounts: List[str],
     args: argparse.Namespace,
-    tracker: BatchTracker
+    tracker: BatchTracker,
+    gemini_limiter: Optional[TokenBucketLimiter] = None
 ) -> bool:
-    """Process a batch of accounts through all pipeline phases."""
+    """Process a batch of accounts through all pipeline phases.
+
+    Phases are pipelined per account (scrape → validate → analyze →
+    extract → persist): an account is analyzed as soon as it is scraped and
+    its features are extracted as soon as its analyses are written, while
+    the next accounts are still in earlier stages.
+    """
     logger = logging.getLogger(__name__)
     logger.info(f"\n🚀 Processing batch of {len(accounts)} accounts...")
 
+    if gemini_limiter is None:
+        gemini_limiter = create_gemini_limiter(args)
+    gemini_analyzer = gemini_batch_analyzer = None
+    if getattr(args, 'gemini_stub', False):
+        from src.services.fake_gemini import FakeGeminiService
+        fake_service = FakeGeminiService()
+        gemini_analyzer = fake_service.analyze_tiktok_video
+        gemini_batch_analyzer = fake_service.analyze_tiktok_videos
+
+    gemini_health = get_gemini_health()
+    scrape_mode = getattr(args, 'scrape_mode', 'serial')
+    feature_workers = getattr(args, 'feature_workers', 1)
+    feature_pool = None
+
     try:
-        # 1. Scraping Phase
-        results = run_scraping_phase(
-            accounts, args.videos_per_account, tracker)
+        # Unified structure: data/dataset_name/
+        dataset_dir = Path("data") / f"dataset_{args.dataset}"
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        features_dir = dataset_dir / "features"
+        features_dir.mkdir(parents=True, exist_ok=True)
+
+        validator = DataValidator()
+        # Validated accounts, for the consolidated batch file
+        scraped_results = {}
+
+        try:
+            # One client shared by every account of the batch
+            scraper = TikTokScraper()
+        except Exception as e:
+            error_msg = f"Scraping failed: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            for account in accounts:
+                tracker.mark_account_failed(account, "scraping", error_msg)
+            scraper = None
+
+        # 1. Scraping
+        def scrape(account: str):
+            profiles = scraper.scrape_multiple_profiles(
+                [account], args.videos_per_account)
+            if not profiles:
+                raise Exception("no data returned by the scraper")
+            return account, profiles[0]
+
+        def validate(item):
+            account, result = item
+            result = validate_scraped_account(result, account, tracker, validator)
+            if result is None:
+                return None
+            scraped_results[account] = result
+            return account, result
+
+        # 2. Gemini Analysis
+        def analyze(item):
+            account, result = item
+            videos = result.get('videos', [])
+            if result.get('username') and videos:
+                # Known-down Gemini fails the account without spending requests
+                if gemini_analyzer is None and not gemini_health.is_available():
+                    status = gemini_health.status()
+                    raise Exception(
+                        f"Gemini unavailable ({status['state']}): {status['last_error']}")
+                run_gemini_phase(
+                    videos, result['username'], tracker,
+                    concurrency=args.gemini_concurrency,
+                    limiter=gemini_limiter,
+                    analyzer=gemini_analyzer,
+                    batch_size=getattr(args, 'gemini_batch_size', 1),
+                    batch_analyzer=gemini_batch_analyzer)
+            return item
+
+        # 3. Feature Extraction
+        if feature_workers > 1 and len(accounts) > 1:
+            # Accounts are sharded across processes as they arrive
+            extract_workers = min(feature_workers, len(accounts))
+            feature_pool = ProcessPoolExecutor(max_workers=extract_workers)
+        else:
+            extract_workers = 1
+
+        def extract(item):
+            account, result = item
+            username = result.get('username')
+            if not username:
+                logger.warning("⚠️ Skipping result without username")
+                return None
+
+            kwargs = dict(
+                raw_data_path=None,
+                # Unified analysis directory path
+                analysis_dir=dataset_dir / "gemini_analysis" / username,
+                output_dir=features_dir,
+                account=username,
+                feature_system=args.feature_system,
+                feature_set=args.feature_set,
+                use_feature_cache=not args.no_feature_cache,
+                videos=result.get('videos', [])
+            )
+            if feature_pool is not None:
+                # The tracker stays in this process: a pickled copy would
+                # record the worker's errors nowhere, so they are logged here
+                try:
+                    feature_pool.submit(
+                        run_feature_extraction_phase, **kwargs, tracker=None).result()
+                except Exception as e:
+                    tracker.log_error(username, "features", f"Feature extraction failed: {e}")
+                    raise
+            else:
+                # A lone account has its videos chunked across processes
+                run_feature_extraction_phase(
+                    **kwargs, tracker=tracker, feature_workers=feature_workers)
+            return item
+
+        # 4. Persist
+        def persist(item):
+            account, result = item
+            # Mark account as processed only if all phases succeeded
+            tracker.mark_account_processed(result['username'])
+            logger.info(
+                f"✅ Successfully completed all phases for {result['username']}")
+            return result['username']
+
+        stages = [
+            Stage('analysis', analyze),
+            Stage('features', extract, workers=extract_workers),
+            Stage('persist', persist),
+        ]
+        if scraper is None:
+            items = []
+        elif scrape_mode == 'packed':
+            # One actor run for the whole batch, then stream its accounts
+            by_username = {
+                result['username'].lower(): result
+                for result in run_scraping_phase(
+                    accounts, args.videos_per_account, tracker,
+                    scrape_mode=scrape_mode, scraper=scraper)}
+            items = []
+            for account in accounts:
+                result = by_username.get(account.lstrip('@').lower())
+                if result is not None:
+                    scraped_results[account] = result
+                    items.append((account, (account, result)))
+        else:
+            scrape_workers = (getattr(args, 'scrape_concurrency', 4)
+                              if scrape_mode == 'concurrent' else 1)
+            stages = [
+                Stage('scraping', scrape, workers=scrape_workers),
+                Stage('validation', validate),
+            ] + stages
+            items = [(account, account) for account in accounts]
+
+        pipeline = StagePipeline(
+            stages, queue_size=getattr(args, 'stage_queue_size', 2))
+        outcome = pipeline.run(items)
+
+        failure_messages = {
+            'scraping': "Scraping failed",
+            'validation': "Scraping failed",
+            'analysis': "Analysis failed",
+            'features': "Feature extraction failed",
+            'persist': "Persisting results failed",
+        }
+        for account, stage, error in outcome.failed:
+            # Mark account as failed to prevent infinite loop
+            result = scraped_results.get(account)
+            name = result.get('username', account) if result else account
+            phase = 'scraping' if stage == 'validation' else stage
+            tracker.mark_account_failed(
+                name, phase, f"{failure_messages.get(stage, 'Failed')}: {str(error)}")
+
+        stage_times = ', '.join(f"{name} {seconds:.1f}s"
+                                for name, seconds in outcome.stage_seconds.items())
+        logger.info(
+            f"⏱️ Batch pipeline: {outcome.elapsed:.1f}s wall time (busy: {stage_times})")
 
         # If no results from scraping, log and continue (don't fail the batch)
-        if not results:
+        if not scraped_results:
             logger.warning(
                 "⚠️ No valid accounts found in scraping phase, continuing with next batch")
             return True  # Don't fail the batch, just continue
 
-        # Unified structure: data/dataset_name/
-        dataset_dir = Path("data") / f"dataset_{args.dataset}"
-        dataset_dir.mkdir(parents=True, exist_ok=True)
-
         # Save consolidated results in unified structure
         consolidated_data = {
             "dataset": args.dataset,
@@ -546,68 +954,17 @@ def process_batch(
             "videos": []
         }
 
-        for result in results:
-            consolidated_data["videos"].extend(result.get("videos", []))
+        for account in accounts:
+            if account in scraped_results:
+                consolidated_data["videos"].extend(
+                    scraped_results[account].get("videos", []))
 
         consolidated_path = dataset_dir / \
             f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(consolidated_path, 'w') as f:
             json.dump(consolidated_data, f, indent=2)
 
-            # 2. Gemini Analysis Phase - FIXED LOGIC
-        for result in results:
-            account = result.get('username')
-            videos = result.get('videos', [])
-
-            if account and videos:  # Only run if we have account and videos
-                try:
-                    run_gemini_phase(videos, account, tracker)
-                except Exception as e:
-                    logger.error(
-                        f"❌ Gemini analysis failed for {account}: {str(e)}")
-                    # Mark account as failed to prevent infinite loop
-                    tracker.mark_account_failed(
-                        account, "analysis", f"Analysis failed: {str(e)}")
-                    continue
-
-        # 3. Feature Extraction Phase
-        features_dir = dataset_dir / "features"
-        features_dir.mkdir(parents=True, exist_ok=True)
-
-        for result in results:
-            account = result.get('username')
-            if not account:
-                logger.warning("⚠️ Skipping result without username")
-                continue
-
-            try:
-                # Unified analysis directory path
-                analysis_dir = dataset_dir / "gemini_analysis" / account
-
-                features_df, _ = run_feature_extraction_phase(
-                    raw_data_path=consolidated_path,
-                    analysis_dir=analysis_dir,
-                    output_dir=features_dir,
-                    account=account,
-                    tracker=tracker,
-                    feature_system=args.feature_system,
-                    feature_set=args.feature_set
-                )
-
-                # Mark account as processed only if all phases succeeded
-                tracker.mark_account_processed(account)
-                logger.info(
-                    f"✅ Successfully completed all phases for {account}")
-
-            except Exception as e:
-                logger.error(
-                    f"❌ Feature extraction failed for {account}: {str(e)}")
-                # Mark account as failed to prevent infinite loop
-                tracker.mark_account_failed(
-                    account, "features", f"Feature extraction failed: {str(e)}")
-                continue
-
-        # 4. Automatic Feature Aggregation
+        # 5. Automatic Feature Aggregation
         if args.feature_system == 'modular':
             logger.info("🔄 Starting automatic feature aggregation...")
             aggregated_df = aggregate_features_after_extraction(
@@ -625,6 +982,10 @@ def process_batch(
         logger.error(f"❌ Batch processing failed: {str(e)}")
         return False
 
+    finally:
+        if feature_pool is not None:
+            feature_pool.shutdown()
+
 
 def main():
     """Run the complete pipeline with batch processing."""
@@ -650,6 +1011,8 @@ def main():
     try:
         # Initialize batch tracker
         tracker = BatchTracker(args.dataset)
+        # One Gemini budget shared by every batch of the run
+        gemini_limiter = create_gemini_limiter(args)
 
         if args.retry_failed:
             # Process failed accounts
@@ -705,7 +1068,7 @@ def main():
                 f"   Categories in batch: {[cat for cat, accs in account_categories.items() if any(acc in batch for acc in accs)]}")
 
             # Process batch
-            success = process_batch(batch, args, tracker)
+            success = process_batch(batch, args, tracker, gemini_limiter)
             if success:
                 processed_accounts.update(batch)
                 total_processed += len(batch)
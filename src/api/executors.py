@@ -0,0 +1,138 @@
+"""
+⚙️ Execution layer for blocking work in the API
+
+🎯 CPU-bound work (model predict, feature extraction) and blocking I/O
+   (Apify actor runs, Gemini batches, SQLite cache) never run on the event loop
+📊 Three dedicated, size-limited pools: a CPU pool sized to the cores, an
+   external pool for network calls that can be slow (Apify, Gemini) and a
+   small I/O pool for fast local work (SQLite cache, job store, /metrics),
+   so slow external calls cannot starve cache lookups or the probes; callers beyond
+   a pool's backlog wait asynchronously instead of piling up in an
+   unbounded executor queue
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CPU_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_IO_WORKERS = 4
+DEFAULT_EXTERNAL_WORKERS = 16
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded backlog, awaited from async code.
+
+    At most `max_pending` calls are queued or running in the pool; further
+    callers wait on an asyncio semaphore, which keeps latency predictable
+    under load instead of growing an invisible executor queue.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+
+    @classmethod
+    def from_env(cls, name: str, default_workers: int) -> "BoundedExecutor":
+        """Pool sized by API_<NAME>_WORKERS, backlog by API_<NAME>_MAX_PENDING"""
+        workers = int(os.getenv(f"API_{name.upper()}_WORKERS", default_workers))
+        pending = int(os.getenv(f"API_{name.upper()}_MAX_PENDING", workers * 8))
+        return cls(name, workers, pending)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Worker threads, started on first use (and again after a shutdown)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"api-{self.name}")
+            return self._executor
+
+    def _limit(self) -> asyncio.Semaphore:
+        """Backlog limit for the running event loop"""
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._semaphores:
+            self._semaphores = {loop_id: asyncio.Semaphore(self.max_pending)}
+        return self._semaphores[loop_id]
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `func(*args, **kwargs)` in the pool and await its result"""
+        limit = self._limit()
+        self.waiting += 1
+        try:
+            await limit.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), partial(func, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            limit.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed
+        }
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker threads; queued calls are cancelled"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instances
+cpu_executor = BoundedExecutor.from_env("cpu", DEFAULT_CPU_WORKERS)
+io_executor = BoundedExecutor.from_env("io", DEFAULT_IO_WORKERS)
+external_executor = BoundedExecutor.from_env("external", DEFAULT_EXTERNAL_WORKERS)
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Model and feature work, on the CPU pool"""
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Short local blocking calls (SQLite cache, job store, metrics), on the I/O pool"""
+    return await io_executor.run(func, *args, **kwargs)
+
+
+async def run_external(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Blocking calls to external services (Apify, Gemini), on their own pool"""
+    return await external_executor.run(func, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Any]:
+    """Pool usage for /health"""
+    return {
+        "cpu": cpu_executor.stats(),
+        "io": io_executor.stats(),
+        "external": external_executor.stats()
+    }
+
+
+def shutdown_executors():
+    cpu_executor.shutdown()
+    io_executor.shutdown()
+    external_executor.shutdown()
@@ -5,7 +5,8 @@
 📊 34 advanced features with automatic extraction
 """
 import logging
-from typing import Dict, Any, Optional
+import math
+from typing import Dict, Any, List, Optional
 import sys
 import os
 
@@ -14,13 +15,21 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from features.modular_feature_system import create_feature_extractor, FeatureExtractorManager
+    from features.feature_cache import FeatureCache
     FEATURE_SYSTEM_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"⚠️ Feature system not available: {e}")
     FEATURE_SYSTEM_AVAILABLE = False
 
+from .executors import run_cpu
+from .metrics import timed
+
 logger = logging.getLogger(__name__)
 
+# Profile batches at least this large are spread over a process pool
+# (API_FEATURE_PROCESSES > 1); smaller ones stay on the CPU thread pool
+DEFAULT_PROCESS_MIN_BATCH = 200
+
 
 class FeatureIntegrationManager:
     """Feature integration manager for API"""
@@ -28,13 +37,19 @@ class FeatureIntegrationManager:
     def __init__(self):
         self.feature_extractor = None
         self.feature_manager = None
+        self.feature_cache = None
         self.available = FEATURE_SYSTEM_AVAILABLE
+        self.batch_processes = int(os.getenv("API_FEATURE_PROCESSES", "1"))
+        self.process_min_batch = int(
+            os.getenv("API_FEATURE_PROCESS_MIN_BATCH", DEFAULT_PROCESS_MIN_BATCH))
 
         if self.available:
             try:
-                # Create modular feature extractor with model-compatible features
+                # Create modular feature extractor with model-compatible features,
+                # backed by the persistent feature cache (FEATURE_CACHE=off disables it)
+                self.feature_cache = FeatureCache.from_env()
                 self.feature_extractor = create_feature_extractor(
-                    'model_compatible')
+                    'model_compatible', cache=self.feature_cache)
                 self.feature_manager = FeatureExtractorManager(
                     ['model_compatible'])
                 logger.info("✅ Model-compatible feature extractor loaded")
@@ -42,6 +57,7 @@ class FeatureIntegrationManager:
                 logger.error(f"❌ Feature extractor loading error: {e}")
                 self.available = False
 
+    @timed("feature_extraction")
     async def extract_features_from_file(self, video_file) -> Dict[str, Any]:
         """Extract features from uploaded video file"""
         if not self.available or not self.feature_extractor:
@@ -60,15 +76,21 @@ class FeatureIntegrationManager:
                 "shareCount": 0
             }
 
-            features = self.feature_extractor.extract_features(video_data)
+            features = await run_cpu(self.feature_extractor.extract_features, video_data)
             logger.info(f"✅ {len(features)} features extracted from file")
             return features
         except Exception as e:
             logger.error(f"❌ File feature extraction error: {e}")
             return self._mock_feature_extraction_from_file(video_file)
 
-    async def extract_features_from_video_data(self, video_data: Dict[str, Any], gemini_analysis: Optional[Dict] = None) -> Dict[str, Any]:
-        """Extract features from video data dictionary with optional Gemini analysis"""
+    @timed("feature_extraction")
+    async def extract_features_from_video_data(self, video_data: Dict[str, Any], gemini_analysis: Optional[Dict] = None,
+                                               columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extract features from video data dictionary with optional Gemini analysis
+
+        When `columns` is given (e.g. the model's expected features), only those
+        features and their dependencies are computed.
+        """
         logger.info(
             f"🔍 Starting feature extraction - Available: {self.available}, Extractor: {self.feature_extractor is not None}")
 
@@ -84,11 +106,9 @@ class FeatureIntegrationManager:
                 f"🔍 Gemini analysis available: {gemini_analysis is not None}")
 
             # Extract features with modular system and Gemini analysis
-            if gemini_analysis:
-                features = self.feature_extractor.extract_features(
-                    video_data, gemini_analysis)
-            else:
-                features = self.feature_extractor.extract_features(video_data)
+            features = await run_cpu(
+                self.feature_extractor.extract_features,
+                video_data, gemini_analysis or None, columns=columns)
 
             logger.info(
                 f"✅ {len(features)} features extracted from video data")
@@ -99,18 +119,57 @@ class FeatureIntegrationManager:
             logger.error(f"❌ Traceback: {traceback.format_exc()}")
             return self._mock_feature_extraction(video_data)
 
-    def extract_features(self, video_data: Dict[str, Any], gemini_analysis: Optional[Dict] = None) -> Dict[str, Any]:
-        """Extract features with modular system"""
+    @timed("feature_extraction")
+    async def extract_features_batch_from_video_data(
+        self,
+        videos: List[Dict[str, Any]],
+        gemini_analyses: Optional[List[Optional[Dict]]] = None,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract features for several videos in one columnar pass
+
+        Runs on the CPU pool, or over API_FEATURE_PROCESSES processes for
+        large batches. Returns one feature dict per video, in input order,
+        restricted to `columns` when given.
+        """
+        if not videos:
+            return []
+        if not self.available or not self.feature_extractor:
+            logger.warning(
+                "⚠️ Using mock features - feature system not available")
+            return [self._mock_feature_extraction(video) for video in videos]
+
+        try:
+            workers = self.batch_processes if len(videos) >= self.process_min_batch else 1
+            frame = await run_cpu(
+                self.feature_extractor.extract_features_batch,
+                videos, gemini_analyses, workers=workers)
+            if columns is not None:
+                frame = frame[[column for column in columns if column in frame.columns]]
+
+            # Missing values are left out, like in per-video extraction
+            features_list = [
+                {name: value for name, value in record.items()
+                 if not (isinstance(value, float) and math.isnan(value))}
+                for record in frame.to_dict("records")
+            ]
+            logger.info(
+                f"✅ {frame.shape[1]} features extracted for {len(features_list)} videos")
+            return features_list
+        except Exception as e:
+            logger.error(f"❌ Batch feature extraction error: {e}")
+            return [self._mock_feature_extraction(video) for video in videos]
+
+    def extract_features(self, video_data: Dict[str, Any], gemini_analysis: Optional[Dict] = None,
+                         columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extract features with modular system (only `columns` when given)"""
         if not self.available or not self.feature_extractor:
             return self._mock_feature_extraction(video_data)
 
         try:
             # Extract with modular system
-            if gemini_analysis:
-                features = self.feature_extractor.extract_features(
-                    video_data, gemini_analysis)
-            else:
-                features = self.feature_extractor.extract_features(video_data)
+            features = self.feature_extractor.extract_features(
+                video_data, gemini_analysis or None, columns=columns)
 
             logger.info(f"✅ {len(features)} features extracted")
             return features
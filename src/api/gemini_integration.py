@@ -4,20 +4,29 @@
 🎯 Production-ready Gemini AI integration for video analysis
 📊 Uses Gemini AI for advanced video content analysis
 """
+import asyncio
 import logging
 import os
-import json
-from typing import Dict, Any, Optional
+from datetime import datetime
+from typing import Awaitable, Dict, Any, List, Optional
 from pathlib import Path
 
 # Import Gemini analysis function
 try:
-    from src.services.gemini_service import analyze_tiktok_video
+    from src.services.gemini_service import (analyze_tiktok_video_async, analyze_tiktok_videos,
+                                             incomplete_retries)
     GEMINI_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"⚠️ Gemini analysis not available: {e}")
     GEMINI_AVAILABLE = False
 
+from src.services.gemini_health import get_gemini_health
+
+from .executors import run_external
+from .metrics import timed
+from .single_flight import SingleFlight
+from .tiered_cache import TieredCache, legacy_json_loader
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,13 +36,31 @@ class GeminiIntegrationService:
     def __init__(self):
         self.available = GEMINI_AVAILABLE
         self.cache_dir = Path("data/api_cache/gemini")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Content analysis does not go stale: long TTL (API_CACHE_TTL_GEMINI)
+        self.cache = TieredCache.from_env(
+            "gemini", legacy_loader=legacy_json_loader(self.cache_dir, "analysis"))
+
+        # Gemini calls never run on the event loop: bounded concurrency and
+        # a per-request timeout keep one slow analysis from stalling the worker
+        self.max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+        self.timeout = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+        self.batch_size = int(os.getenv("GEMINI_BATCH_SIZE", "5"))
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+        # One Gemini call per video, whatever the number of callers
+        self._flights = SingleFlight("Gemini analysis")
 
         if self.available:
             logger.info("✅ Gemini integration service initialized")
         else:
             logger.warning("⚠️ Gemini integration not available - using mocks")
 
+    def _limit(self) -> asyncio.Semaphore:
+        """Concurrency limit of Gemini calls for the running event loop"""
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._semaphores:
+            self._semaphores = {loop_id: asyncio.Semaphore(self.max_concurrency)}
+        return self._semaphores[loop_id]
+
     def _get_cache_key(self, video_url: str) -> str:
         """Generate cache key for Gemini analysis"""
         # Extract video ID from URL
@@ -42,41 +69,31 @@ class GeminiIntegrationService:
             return f"gemini_analysis_{video_id}"
         return f"gemini_analysis_{hash(video_url)}"
 
+    @timed("cache_read")
     async def get_cached_gemini_analysis(self, video_url: str) -> Optional[Dict[str, Any]]:
-        """Get cached Gemini analysis if available"""
+        """Get cached Gemini analysis if available and fresh"""
         try:
-            cache_key = self._get_cache_key(video_url)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
+            cached_data = await self.cache.aget(self._get_cache_key(video_url))
+            if cached_data is not None:
                 logger.info(f"✅ Using cached Gemini analysis for {video_url}")
-                return cached_data
-            return None
+            return cached_data
         except Exception as e:
             logger.warning(f"⚠️ Error reading Gemini cache: {e}")
             return None
 
+    @timed("cache_write")
     async def cache_gemini_analysis(self, video_url: str, analysis: Dict[str, Any]) -> None:
         """Cache Gemini analysis"""
         try:
-            cache_key = self._get_cache_key(video_url)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            cache_data = {
-                "video_url": video_url,
-                "analysis": analysis,
-                "cached_at": "2025-01-06T00:00:00Z"
-            }
-
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-
+            await self.cache.aset(self._get_cache_key(video_url), analysis)
             logger.info(f"✅ Cached Gemini analysis for {video_url}")
         except Exception as e:
             logger.warning(f"⚠️ Error caching Gemini analysis: {e}")
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the Gemini analysis cache"""
+        return self.cache.stats()
+
     async def analyze_video(self, video_url: str, use_cache: bool = True) -> Dict[str, Any]:
         """Analyze video with Gemini AI"""
         if not self.available:
@@ -91,10 +108,11 @@ class GeminiIntegrationService:
 
             # Run Gemini analysis
             logger.info(f"🧠 Running Gemini analysis for {video_url}")
-            result = analyze_tiktok_video(video_url)
+            result = await self._flights.run(
+                self._get_cache_key(video_url), lambda: self._analyze_limited(video_url))
 
-            # Cache the result
-            if use_cache:
+            # Cache the result (failures and timeouts are retried next time)
+            if use_cache and result.get("success"):
                 await self.cache_gemini_analysis(video_url, result)
 
             return result
@@ -103,6 +121,115 @@ class GeminiIntegrationService:
             logger.error(f"❌ Gemini analysis failed: {e}")
             return self._mock_gemini_analysis(video_url)
 
+    async def analyze_videos(self, video_urls: List[str],
+                             use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Analyze several videos, sending the uncached ones in shared requests.
+
+        Each video sent is registered with the single-flight first, so a
+        concurrent `analyze_video` for it joins the batch instead of making
+        its own call; videos already in flight are joined the same way.
+        """
+        video_urls = list(dict.fromkeys(video_urls))
+        if not self.available:
+            return {url: self._mock_gemini_analysis(url) for url in video_urls}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if use_cache:
+            for url in video_urls:
+                cached_analysis = await self.get_cached_gemini_analysis(url)
+                if cached_analysis:
+                    results[url] = cached_analysis
+
+        missing = [url for url in video_urls if url not in results]
+        if not missing:
+            return results
+
+        # Keys are claimed before anything is awaited: no caller can slip in between
+        sent: asyncio.Future = asyncio.get_running_loop().create_future()
+        flights: Dict[str, Awaitable[Dict[str, Any]]] = {}
+        batch = []
+        for url in missing:
+            flights[url], joined = self._flights.start(
+                self._get_cache_key(url), lambda url=url: self._batch_part(sent, url))
+            if not joined:
+                batch.append(url)
+
+        logger.info(f"🧠 Running batched Gemini analysis for {len(batch)} videos")
+        try:
+            sent.set_result(await self._analyze_batches(batch))
+        except asyncio.CancelledError:
+            sent.cancel()
+            raise
+        except Exception as e:
+            sent.set_exception(e)
+
+        for url, flight in flights.items():
+            try:
+                result = await flight
+            except Exception as e:
+                logger.error(f"❌ Gemini analysis failed for {url}: {e}")
+                result = self._mock_gemini_analysis(url)
+            if use_cache and result.get("success"):
+                await self.cache_gemini_analysis(url, result)
+            results[url] = result
+        return results
+
+    @staticmethod
+    async def _batch_part(sent: asyncio.Future, video_url: str) -> Dict[str, Any]:
+        """One video's result, once its batch has been answered"""
+        return (await asyncio.shield(sent))[video_url]
+
+    async def _analyze_batches(self, video_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Batches of `batch_size`, in parallel within the concurrency limit.
+
+        Videos a response left out (or could not be parsed for) come back
+        `incomplete` and are sent again in smaller groups, through the same
+        limit, until `incomplete_retries` has nothing left to resend.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        size = max(1, self.batch_size)
+        groups = [video_urls[i:i + size] for i in range(0, len(video_urls), size)]
+        while groups:
+            answers = await asyncio.gather(*(self._analyze_group(group) for group in groups))
+            retries = []
+            for group, group_results in zip(groups, answers):
+                results.update(group_results)
+                retries.extend(incomplete_retries(group, group_results))
+            groups = retries
+        return results
+
+    async def _analyze_group(self, video_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One Gemini request for a group, within the concurrency limit and timeout"""
+        async with self._limit():
+            try:
+                return await self._analyze_batch(video_urls)
+            except asyncio.TimeoutError:
+                logger.error(f"⏱️ Batched Gemini analysis timed out for {len(video_urls)} videos")
+                error, status_code = f"Gemini analysis timed out after {self.timeout}s", 504
+            except Exception as e:
+                logger.error(f"❌ Batched Gemini analysis failed: {e}")
+                error, status_code = str(e), None
+        failure = {"success": False, "error": error, "status_code": status_code,
+                   "timestamp": datetime.now().isoformat()}
+        return {url: dict(failure) for url in video_urls}
+
+    @timed("gemini", service="gemini",
+           failed=lambda results: not any(r.get("success") for r in results.values()))
+    async def _analyze_batch(self, video_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        # The batch client is blocking and can take minutes: external pool
+        return await asyncio.wait_for(
+            run_external(analyze_tiktok_videos, video_urls, max_batch_size=len(video_urls)),
+            timeout=self.timeout)
+
+    async def _analyze_limited(self, video_url: str) -> Dict[str, Any]:
+        """One Gemini call, within the concurrency limit and timeout"""
+        async with self._limit():
+            return await self._analyze(video_url)
+
+    @timed("gemini", service="gemini", failed=lambda result: not result.get("success"))
+    async def _analyze(self, video_url: str) -> Dict[str, Any]:
+        return await analyze_tiktok_video_async(video_url, timeout=self.timeout)
+
     def _mock_gemini_analysis(self, video_url: str) -> Dict[str, Any]:
         """Mock Gemini analysis for testing"""
         return {
@@ -136,8 +263,18 @@ class GeminiIntegrationService:
         }
 
     def is_available(self) -> bool:
-        """Check if Gemini service is available"""
-        return self.available
+        """Check if Gemini service is available, from the shared health state (no network call)"""
+        return self.available and get_gemini_health().is_available(allow_probe=False)
+
+    def health_status(self, probe: bool = False) -> Dict[str, Any]:
+        """Shared Gemini health state; `probe` pings the model list if the state is stale"""
+        health = get_gemini_health()
+        if self.available and probe and health.is_stale():
+            health.refresh()
+        status = health.status()
+        if not self.available:
+            status.update(state="not_installed", available=False)
+        return status
 
 
 # Global instance
@@ -0,0 +1,515 @@
+"""
+🗂️ Background jobs for long-running analyses
+
+🎯 Submitting returns a job id at once; the work runs in a bounded pool of
+   asyncio workers, outside the HTTP request that submitted it
+📊 Job state, progress events and results live in one SQLite file, so any
+   API process can report on (or pick up) any job
+🔁 Jobs left running by a dead process are re-queued once their heartbeat
+   goes stale, and failed once they have used up their attempts
+⚙️ Store calls run on the I/O pool, never on the event loop
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .executors import run_io
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_PATH = Path("data/api_jobs/jobs.sqlite")
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 30 * 60
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_STALE_AFTER = 120.0
+DEFAULT_RETENTION = 7 * 24 * 3600
+DEFAULT_MAX_ATTEMPTS = 3
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# await report(event, payload): records one progress event of the running job
+Reporter = Callable[[str, Any], Awaitable[None]]
+Handler = Callable[[Dict[str, Any], Reporter], Awaitable[Any]]
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class JobStore:
+    """SQLite-backed job state, progress events and results"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_JOBS_PATH,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                owner TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            );
+        """)
+        self._conn.commit()
+
+    def create(self, kind: str, params: Dict[str, Any]) -> str:
+        """Queue a new job and return its id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, _dumps(params), self._clock()))
+            self._conn.commit()
+        return job_id
+
+    def claim_next(self, owner: str, kinds: List[str]) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job of a known kind to running"""
+        if not kinds:
+            return None
+        placeholders = ",".join("?" * len(kinds))
+        with self._lock:
+            while True:
+                candidate = self._conn.execute(
+                    f"SELECT id FROM jobs WHERE status=? AND kind IN ({placeholders}) "
+                    f"ORDER BY created_at LIMIT 1", (QUEUED, *kinds)).fetchone()
+                if candidate is None:
+                    return None
+                now = self._clock()
+                # The status check makes the claim atomic across processes
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status=?, owner=?, started_at=?, heartbeat_at=?, "
+                    "attempts=attempts+1 WHERE id=? AND status=?",
+                    (RUNNING, owner, now, now, candidate["id"], QUEUED))
+                self._conn.commit()
+                if cursor.rowcount:
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE id=?", (candidate["id"],)).fetchone()
+                    return self._to_dict(row)
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET heartbeat_at=? WHERE id=? AND status=?",
+                [(self._clock(), job_id, RUNNING) for job_id in job_ids])
+            self._conn.commit()
+
+    def add_event(self, job_id: str, event: str, payload: Any) -> int:
+        """Append a progress event; returns its sequence number"""
+        with self._lock:
+            now = self._clock()
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id=?",
+                (job_id,)).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO job_events (job_id, seq, event, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)", (job_id, seq, event, _dumps(payload), now))
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at=? WHERE id=? AND status=?", (now, job_id, RUNNING))
+            self._conn.commit()
+        return seq
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """Progress events with a sequence number above `after`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, event, payload, created_at FROM job_events "
+                "WHERE job_id=? AND seq>? ORDER BY seq", (job_id, after)).fetchall()
+        return [{"seq": row["seq"], "event": row["event"],
+                 "data": json.loads(row["payload"]), "created_at": row["created_at"]}
+                for row in rows]
+
+    def finish(self, job_id: str, owner: str, status: str, result: Any = None,
+               error: Optional[str] = None) -> bool:
+        """Record the outcome of a job `owner` is running.
+
+        Same compare-and-set as `claim_next`: a worker whose job was
+        re-queued (stale heartbeat) and claimed elsewhere, or cancelled,
+        does not overwrite the row. Returns False in that case.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status=?, result=?, error=?, finished_at=? "
+                "WHERE id=? AND owner=? AND status=?",
+                (status, None if result is None else _dumps(result), error,
+                 self._clock(), job_id, owner, RUNNING))
+            self._conn.commit()
+        if not cursor.rowcount:
+            logger.warning(f"⚠️ Job {job_id} is no longer run by {owner}: "
+                           f"{status} result dropped")
+            return False
+        return True
+
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued job now; flag a running one for its worker"""
+        with self._lock:
+            now = self._clock()
+            self._conn.execute(
+                "UPDATE jobs SET status=?, finished_at=? WHERE id=? AND status=?",
+                (CANCELLED, now, job_id, QUEUED))
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested=1 WHERE id=? AND status=?", (job_id, RUNNING))
+            self._conn.commit()
+        return self.get(job_id)
+
+    def cancel_requested(self, job_ids: List[str]) -> List[str]:
+        if not job_ids:
+            return []
+        placeholders = ",".join("?" * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM jobs WHERE cancel_requested=1 AND id IN ({placeholders})",
+                job_ids).fetchall()
+        return [row["id"] for row in rows]
+
+    def requeue_stale(self, stale_after: float,
+                      max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+        """Give running jobs whose worker stopped heart-beating back to the queue.
+
+        A job that already used `max_attempts` attempts is failed instead:
+        if it keeps killing its process, retrying it forever would too.
+        """
+        with self._lock:
+            now = self._clock()
+            cutoff = now - stale_after
+            failed = self._conn.execute(
+                "UPDATE jobs SET status=?, owner=NULL, error=?, finished_at=? "
+                "WHERE status=? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, f"Worker lost {max_attempts} times", now, RUNNING, cutoff,
+                 max_attempts)).rowcount
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status=?, owner=NULL WHERE status=? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff))
+            self._conn.commit()
+        if failed:
+            logger.error(f"❌ Jobs failed after {max_attempts} lost workers: {failed}")
+        return cursor.rowcount
+
+    def requeue_owned(self, owner: str) -> int:
+        """Give the running jobs of a stopping worker back to the queue.
+
+        A clean stop is not the job's fault: the attempt is not counted.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status=?, owner=NULL, attempts=MAX(attempts - 1, 0) "
+                "WHERE status=? AND owner=?",
+                (QUEUED, RUNNING, owner))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs (and their events) older than `older_than` seconds"""
+        with self._lock:
+            cutoff = self._clock() - older_than
+            placeholders = ",".join("?" * len(FINISHED_STATUSES))
+            self._conn.execute(
+                f"DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE "
+                f"status IN ({placeholders}) AND finished_at < ?)", (*FINISHED_STATUSES, cutoff))
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+                (*FINISHED_STATUSES, cutoff))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
+            events = self._conn.execute(
+                "SELECT COUNT(*) FROM job_events WHERE job_id=?", (job_id,)).fetchone()[0]
+        if row is None:
+            return None
+        job = self._to_dict(row, include_result)
+        job["events_count"] = events
+        return job
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM jobs"
+        args: tuple = ()
+        if status:
+            query += " WHERE status=?"
+            args = (status,)
+        with self._lock:
+            rows = self._conn.execute(
+                query + " ORDER BY created_at DESC LIMIT ?", (*args, limit)).fetchall()
+        return [self._to_dict(row, include_result=False) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, include_result: bool = True) -> Dict[str, Any]:
+        job = {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "params": json.loads(row["params"]),
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if include_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """Bounded pool of asyncio workers running jobs from a JobStore.
+
+    Handlers are registered per job kind: `handler(params, report)` is a
+    coroutine returning the JSON-serializable result; `report(event,
+    payload)` records progress that clients can poll or stream.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = DEFAULT_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        retention: float = DEFAULT_RETENTION,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        self.store = store
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.retention = retention
+        self.max_attempts = max(1, max_attempts)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, Handler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        """Manager configured by API_JOBS_PATH, API_JOB_WORKERS, API_JOB_TIMEOUT_SECONDS
+        and API_JOB_MAX_ATTEMPTS"""
+        return cls(
+            JobStore(os.getenv("API_JOBS_PATH", str(DEFAULT_JOBS_PATH))),
+            workers=int(os.getenv("API_JOB_WORKERS", DEFAULT_WORKERS)),
+            timeout=float(os.getenv("API_JOB_TIMEOUT_SECONDS", DEFAULT_TIMEOUT)),
+            max_attempts=int(os.getenv("API_JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        )
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._handlers)
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a job; workers are started on the running loop if needed"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = await run_io(self.store.create, kind, params)
+        logger.info(f"🗂️ Job {job_id} queued ({kind})")
+        self._ensure_started()
+        if self._wake is not None:
+            self._wake.set()
+        return await self.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await run_io(self.store.request_cancel, job_id)
+        self._cancel_running(job_id)
+        return job
+
+    async def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        return await run_io(self.store.get, job_id, include_result)
+
+    async def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        return await run_io(self.store.list, status, limit)
+
+    async def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        return await run_io(self.store.events, job_id, after)
+
+    def _cancel_running(self, job_id: str) -> None:
+        task = self._running.get(job_id)
+        if task is not None:
+            self._cancelled.add(job_id)
+            task.cancel()
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop"""
+        self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is loop and self._tasks:
+            return
+        # A new event loop (tests, reload): the previous tasks died with theirs
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._running = {}
+        self._tasks = [loop.create_task(self._worker(n)) for n in range(self.workers)]
+        self._tasks.append(loop.create_task(self._heartbeat()))
+        logger.info(f"🗂️ Job workers started: {self.workers}")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running go back to the queue"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await run_io(self.store.requeue_owned, self.owner)
+        self._loop = None
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            job = await run_io(self.store.claim_next, self.owner, self.kinds)
+            if job is None:
+                self._wake.clear()
+                try:
+                    # Woken by a local submit; polling picks up other processes' jobs
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        handler = self._handlers[job["kind"]]
+        logger.info(f"🗂️ Job {job_id} started ({job['kind']})")
+
+        async def report(event: str, payload: Any) -> None:
+            await run_io(self.store.add_event, job_id, event, payload)
+
+        task = asyncio.ensure_future(handler(job["params"], report))
+        self._running[job_id] = task
+        try:
+            result = await asyncio.wait_for(task, timeout=self.timeout)
+        except asyncio.CancelledError:
+            if job_id not in self._cancelled:
+                # The worker itself is stopping: leave the job for requeue
+                raise
+            await run_io(self.store.finish, job_id, self.owner, CANCELLED)
+            logger.info(f"🗂️ Job {job_id} cancelled")
+        except asyncio.TimeoutError:
+            await run_io(self.store.finish, job_id, self.owner, FAILED,
+                         error=f"Timed out after {self.timeout:.0f}s")
+            logger.error(f"⏱️ Job {job_id} timed out")
+        except Exception as e:
+            await run_io(self.store.finish, job_id, self.owner, FAILED, error=str(e))
+            logger.error(f"❌ Job {job_id} failed: {e}")
+        else:
+            await run_io(self.store.finish, job_id, self.owner, SUCCEEDED, result=result)
+            logger.info(f"✅ Job {job_id} succeeded")
+        finally:
+            self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+
+    def _recover(self) -> int:
+        """Re-queue jobs of dead workers and purge old finished ones (blocking)"""
+        requeued = self.store.requeue_stale(self.stale_after, self.max_attempts)
+        purged = self.store.purge(self.retention)
+        if requeued or purged:
+            logger.info(f"🗂️ Jobs re-queued: {requeued}, purged: {purged}")
+        return requeued
+
+    def _beat(self, running: List[str]) -> Tuple[List[str], int]:
+        """One heartbeat round (blocking): remote cancels and re-queued jobs"""
+        self.store.heartbeat(running)
+        cancelled = self.store.cancel_requested(running)
+        return cancelled, self.store.requeue_stale(self.stale_after, self.max_attempts)
+
+    async def _heartbeat(self) -> None:
+        """Keep running jobs fresh, apply remote cancels and recover stale jobs"""
+        interval = max(self.poll_interval, self.stale_after / 4)
+        try:
+            if await run_io(self._recover) and self._wake is not None:
+                self._wake.set()
+        except Exception as e:
+            logger.warning(f"⚠️ Job recovery error: {e}")
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                cancelled, requeued = await run_io(self._beat, list(self._running))
+                for job_id in cancelled:
+                    self._cancel_running(job_id)
+                if requeued and self._wake is not None:
+                    self._wake.set()
+            except Exception as e:
+                logger.warning(f"⚠️ Job heartbeat error: {e}")
+
+    async def follow(self, job_id: str, after: int = 0) -> AsyncIterator[Tuple[str, Any]]:
+        """Progress events of a job as they are recorded, then its final state"""
+        while True:
+            job = await self.get(job_id, include_result=False)
+            # Events recorded before the status was read are all delivered
+            for event in await self.events(job_id, after):
+                after = event["seq"]
+                yield event["event"], event["data"]
+            if job is None or job["status"] in FINISHED_STATUSES:
+                yield "job", job
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and worker counters for monitoring (reads SQLite: call it off the loop)"""
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "running_here": len(self._running),
+            "jobs": self.store.counts()
+        }
+
+
+# Global instance
+job_manager = JobManager.from_env()
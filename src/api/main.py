@@ -8,20 +8,27 @@
 📚 Documentation: https://railway.app/docs
 🔗 OpenAPI: /docs
 """
-# Load environment variables from .env file
 from fastapi import FastAPI, HTTPException, Depends
+from fastapi.responses import Response
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 import logging
 import os
 
-from .routers import analysis, inference, simulation, video_inference
+# Load environment variables from .env file before the modules below: their
+# global instances (pools, caches, job workers) read their settings at import
+load_dotenv()
+
+from .routers import analysis, inference, jobs, simulation, video_inference
+from .executors import executor_stats, run_external, run_io, shutdown_executors
+from .metrics import (CONTENT_TYPE, MetricsMiddleware, cache_families, executor_families,
+                      job_families, metrics)
+from .jobs import job_manager
 from .ml_model import ml_manager
+from .feature_integration import feature_manager
 from .gemini_integration import gemini_service
-
-load_dotenv()
+from .tiktok_scraper_integration import tiktok_scraper_integration
 
 logger = logging.getLogger(__name__)
 
@@ -70,12 +77,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latency, status and in-flight count of every request, for /metrics
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(analysis.router, prefix="/analysis", tags=["Analysis"])
 app.include_router(inference.router, prefix="/inference", tags=["Inference"])
 app.include_router(simulation.router, prefix="/simulation",
                    tags=["Simulation"])
 app.include_router(video_inference.router, prefix="/video",
                    tags=["Video Inference"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 
 
 @app.on_event("startup")
@@ -103,6 +114,16 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Model loading error: {e}")
 
+    # Long analyses submitted to /jobs run in background workers
+    await job_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop job workers (their running jobs are re-queued), then the executor pools"""
+    await job_manager.stop()
+    shutdown_executors()
+
 
 @app.get("/")
 async def root():
@@ -119,15 +140,47 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check for Railway"""
+    # Stale Gemini state is refreshed by a model-list ping: a network call to
+    # Google, so it runs on the external pool, not on the I/O pool it could starve
+    gemini_health = await run_external(gemini_service.health_status, probe=True)
     return {
         "status": "healthy",
         "version": "1.0.0",
         "model_loaded": ml_manager.model is not None,
         "feature_extractor_loaded": ml_manager.feature_extractor is not None,
-        "gemini_available": gemini_service.is_available(),
+        "gemini_available": gemini_health["available"],
+        "gemini": gemini_health,
+        "caches": {
+            **tiktok_scraper_integration.cache_stats(),
+            "gemini": gemini_service.cache_stats()
+        },
+        "jobs": await run_io(job_manager.stats),
+        "executors": executor_stats(),
         "environment": os.getenv("RAILWAY_ENVIRONMENT", "development")
     }
 
+@metrics.collector
+def _runtime_metrics():
+    """Caches, executor pools and jobs already keep counters: read them at scrape time"""
+    caches = {
+        **tiktok_scraper_integration.cache_stats(),
+        "gemini": gemini_service.cache_stats()
+    }
+    if feature_manager.feature_cache is not None:
+        caches["feature"] = feature_manager.feature_cache.stats()
+    return [
+        *cache_families(caches),
+        *executor_families(executor_stats()),
+        *job_families(job_manager.stats())
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    # Cache and job counters come from SQLite: rendered off the event loop
+    return Response(content=await run_io(metrics.render), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,370 @@
+"""
+📈 Prometheus-style metrics for the API
+
+🎯 Per-stage latency histograms (Apify fetch, Gemini, feature extraction,
+   model predict, cache I/O), HTTP latency, in-flight gauges and
+   external-call error counters, exposed in the Prometheus text format
+📊 Instrumented by an ASGI middleware and the `timed` decorator; state that
+   already has counters (caches, pools, jobs) is read at scrape time through
+   registered collectors
+"""
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds: from in-memory hits (sub-millisecond) to Apify runs (minutes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class Sample(NamedTuple):
+    suffix: str
+    labels: Dict[str, str]
+    value: float
+
+
+class MetricFamily(NamedTuple):
+    """One metric as rendered: name, type, help text and its samples"""
+    name: str
+    kind: str
+    help: str
+    samples: List[Sample]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. requests or errors"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = [Sample("", self._labels(key), value) for key, value in self._values.items()]
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight"""
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over cumulative buckets"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(Sample("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(Sample("_sum", labels, total))
+            samples.append(Sample("_count", labels, cumulative))
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """Metrics of the process, rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, func: Collector) -> Collector:
+        """Register a function returning metric families computed at scrape time"""
+        self._collectors.append(func)
+        return func
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                # One failing source must not take the whole scrape down
+                logger.warning(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return families
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample in metric.samples:
+                lines.append(f"{metric.name}{sample.suffix}{_format_labels(sample.labels)} "
+                             f"{_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def family(name: str, kind: str, help: str, values: Iterable[Tuple[Dict[str, Any], float]]) -> MetricFamily:
+    """Metric family from (labels, value) pairs, for collectors"""
+    samples = [Sample("", {k: str(v) for k, v in labels.items()}, float(value))
+               for labels, value in values if value is not None]
+    return MetricFamily(name, kind, help, samples)
+
+
+# Lookup counters of TieredCache.stats() / FeatureCache.stats(), by result label
+CACHE_RESULTS = {
+    "memory_hits": "memory_hit", "disk_hits": "disk_hit", "legacy_hits": "legacy_hit",
+    "hits": "hit", "misses": "miss",
+}
+
+
+def cache_families(caches: Dict[str, Dict[str, Any]]) -> List[MetricFamily]:
+    """Lookups and hit ratio of each cache, from its `stats()`"""
+    lookups, ratios = [], []
+    for cache, stats in caches.items():
+        counts = {result: stats[key] for key, result in CACHE_RESULTS.items() if key in stats}
+        lookups.extend(({"cache": cache, "result": result}, count) for result, count in counts.items())
+        total = sum(counts.values())
+        if total:
+            ratios.append(({"cache": cache}, (total - counts.get("miss", 0)) / total))
+    return [
+        family("api_cache_lookups_total", "counter", "Cache lookups by result", lookups),
+        family("api_cache_hit_ratio", "gauge", "Share of cache lookups answered from the cache", ratios),
+    ]
+
+
+def executor_families(pools: Dict[str, Dict[str, Any]]) -> List[MetricFamily]:
+    """Usage of the CPU, I/O and external pools, from `executor_stats()`"""
+    def values(key):
+        return [({"pool": pool}, stats[key]) for pool, stats in pools.items()]
+    return [
+        family("api_executor_workers", "gauge", "Threads of the pool", values("workers")),
+        family("api_executor_in_flight", "gauge", "Calls queued or running in the pool", values("in_flight")),
+        family("api_executor_waiting", "gauge", "Calls waiting for room in the pool backlog", values("waiting")),
+        family("api_executor_completed_total", "counter", "Calls completed by the pool", values("completed")),
+    ]
+
+
+def job_families(stats: Dict[str, Any]) -> List[MetricFamily]:
+    """Background job queue, from `JobManager.stats()`"""
+    return [
+        family("api_jobs", "gauge", "Jobs in the store by status",
+               [({"status": status}, count) for status, count in stats["jobs"].items()]),
+        family("api_job_workers", "gauge", "Job workers started in this process",
+               [({}, stats["workers"])]),
+    ]
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+STAGE_LATENCY = metrics.histogram(
+    "api_stage_duration_seconds",
+    "Latency of one pipeline stage (apify_fetch, gemini, feature_extraction, model_predict, "
+    "cache_read, cache_write, remote_inference)",
+    ["stage"])
+STAGE_IN_FLIGHT = metrics.gauge(
+    "api_stage_in_flight", "Calls of a pipeline stage currently running", ["stage"])
+EXTERNAL_ERRORS = metrics.counter(
+    "api_external_errors_total", "Failed calls to an external service", ["service"])
+HTTP_LATENCY = metrics.histogram(
+    "api_http_request_duration_seconds",
+    "HTTP request latency, until the last byte of the response", ["method", "route"])
+HTTP_REQUESTS = metrics.counter(
+    "api_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_IN_FLIGHT = metrics.gauge(
+    "api_http_requests_in_flight", "HTTP requests currently being handled")
+
+
+def timed(stage: str, service: Optional[str] = None,
+          failed: Optional[Callable[[Any], bool]] = None):
+    """Record the latency of a sync or async function under `stage`.
+
+    When `service` is set, exceptions (and results for which `failed`
+    returns True) also count as errors of that external service.
+    """
+    def record_error(result: Any = None, raised: bool = False):
+        if service is not None and (raised or (failed is not None and failed(result))):
+            EXTERNAL_ERRORS.inc(service=service)
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                STAGE_IN_FLIGHT.inc(stage=stage)
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    record_error(raised=True)
+                    raise
+                finally:
+                    STAGE_LATENCY.observe(time.perf_counter() - start, stage=stage)
+                    STAGE_IN_FLIGHT.dec(stage=stage)
+                record_error(result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            STAGE_IN_FLIGHT.inc(stage=stage)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                record_error(raised=True)
+                raise
+            finally:
+                STAGE_LATENCY.observe(time.perf_counter() - start, stage=stage)
+                STAGE_IN_FLIGHT.dec(stage=stage)
+            record_error(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """Route path pattern (not the raw path) to keep label cardinality bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP latency, status and in-flight requests.
+
+    Latency runs until the last body chunk is sent, so streamed responses
+    are measured in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = _route_template(scope)
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=scope["method"], route=route)
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status)
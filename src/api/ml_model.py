@@ -6,14 +6,40 @@
 🔧 Support for multiple model types (RandomForest, XGBoost)
 """
 import joblib
+import math
 import os
-from typing import Dict, Any, Optional
+import threading
+import warnings
+from typing import Dict, Any, List, Set, Tuple
 import logging
 from pathlib import Path
-import pandas as pd
+import numpy as np
+
+from src.models.tree_ensemble import load_compiled_model
+
+from .metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# The exact 16 features used in the pre-publication model
+EXPECTED_FEATURE_NAMES = (
+    'duration', 'hashtag_count', 'estimated_hashtag_count', 'hour_of_day',
+    'day_of_week', 'month', 'visual_quality_score', 'has_hook',
+    'viral_potential_score', 'emotional_trigger_count',
+    'audience_connection_score', 'sound_quality_score',
+    'production_quality_score', 'trend_alignment_score', 'color_vibrancy_score',
+    'video_duration_optimized'
+)
+
+# Feature importance (based on our results)
+FEATURE_IMPORTANCE = {
+    "audience_connection_score": 0.124,
+    "hour_of_day": 0.108,
+    "video_duration_optimized": 0.101,
+    "emotional_trigger_count": 0.099,
+    "estimated_hashtag_count": 0.096
+}
+
 
 class MLModelManager:
     """ML model manager for API with support for multiple model types"""
@@ -31,6 +57,11 @@ class MLModelManager:
         self.model_path = self._get_model_path(project_root)
         self.feature_extractor_path = project_root / "models/baseline_virality_model.pkl"
 
+        # Static metadata, computed once instead of on every prediction
+        self._r2_score = self._compute_r2_score()
+        self._local = threading.local()
+        self._prepare_inputs()
+
         logger.info(f"🔧 ML Model Manager initialized:")
         logger.info(f"   - Model Type: {self.model_type}")
         logger.info(f"   - Model Version: {self.model_version}")
@@ -43,11 +74,36 @@ class MLModelManager:
         else:  # randomforest (default)
             return project_root / f"models/{self.model_version}_model.pkl"
 
+    def _get_compiled_model_path(self) -> Path:
+        """Compiled NumPy export of the model (see scripts/compile_model.py)"""
+        return self.model_path.with_suffix(".npz")
+
+    def _use_compiled_model(self) -> bool:
+        """Serve the compiled export when it exists and is not older than the pickle"""
+        if os.getenv("ML_MODEL_COMPILED", "1") == "0":
+            return False
+        compiled_path = self._get_compiled_model_path()
+        if not compiled_path.exists():
+            return False
+        if (self.model_path.exists()
+                and compiled_path.stat().st_mtime < self.model_path.stat().st_mtime):
+            logger.warning(f"⚠️ Compiled model is older than {self.model_path}, ignoring it")
+            return False
+        return True
+
     def load_model(self) -> bool:
         """Load trained ML model"""
         try:
-            if os.path.exists(self.model_path):
+            if self._use_compiled_model():
+                # NumPy-only evaluator: no sklearn/xgboost import needed
+                compiled_path = self._get_compiled_model_path()
+                self.model = load_compiled_model(compiled_path)
+                self._prepare_inputs()
+                logger.info(f"✅ Compiled ML model loaded: {compiled_path}")
+                return True
+            elif os.path.exists(self.model_path):
                 self.model = joblib.load(self.model_path)
+                self._prepare_inputs()
                 logger.info(f"✅ ML model loaded: {self.model_path}")
                 return True
             else:
@@ -60,6 +116,30 @@ class MLModelManager:
             logger.error(f"❌ Model loading error: {e}")
             return False
 
+    def _prepare_inputs(self):
+        """Precompute the column layout the model is fed with.
+
+        Features go to the model as a float32 NumPy row instead of a
+        DataFrame. When the model was fitted with named columns, their
+        order is used, so dropping the names is safe.
+        """
+        fitted_names = getattr(self.model, "feature_names_in_", None)
+        if fitted_names is not None:
+            self._feature_names = tuple(str(name) for name in fitted_names)
+        else:
+            self._feature_names = EXPECTED_FEATURE_NAMES
+        self._feature_index = {name: i for i, name in enumerate(self._feature_names)}
+        # Thread-local buffers are rebuilt lazily for the new width
+        self._local = threading.local()
+
+    def _row_buffer(self) -> np.ndarray:
+        """Reusable (1, n_features) input row owned by the calling thread"""
+        row = getattr(self._local, "row", None)
+        if row is None or row.shape[1] != len(self._feature_names):
+            row = np.zeros((1, len(self._feature_names)), dtype=np.float32)
+            self._local.row = row
+        return row
+
     def _list_available_models(self, project_root: Path):
         """List available models in the models directory"""
         models_dir = project_root / "models"
@@ -84,6 +164,7 @@ class MLModelManager:
             logger.error(f"❌ Feature extractor loading error: {e}")
             return False
 
+    @timed("model_predict")
     def predict(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Prediction with ML model"""
         if self.model is None:
@@ -91,49 +172,115 @@ class MLModelManager:
             return self._mock_prediction(features)
 
         try:
-            # Convert features to the format expected by the model
-            # The model expects a DataFrame with feature names
-            feature_names = self._get_expected_feature_names()
-            feature_values = []
-
-            for feature_name in feature_names:
-                if feature_name in features:
-                    feature_values.append(features[feature_name])
-                else:
-                    # Use default value for missing features
-                    feature_values.append(0.0)
-
-            # Create DataFrame with proper feature names
-            feature_df = pd.DataFrame([feature_values], columns=feature_names)
-
-            # Make prediction
-            prediction = self.model.predict(feature_df)[0]
-
-            # Apply inverse transformation (expm1) since model was trained on log1p transformed data
-            import numpy as np
-            virality_score = float(np.expm1(prediction))
-
-            # Normalize to 0-1 range for API consistency
-            if virality_score > 1.0:
-                virality_score = min(virality_score / 1000000, 1.0)
-            elif virality_score < 0.0:
-                virality_score = 0.0
-
-            return {
-                "virality_score": virality_score,
-                "confidence": 0.85,
-                "r2_score": self._get_r2_score(),
-                "model_type": self.model_type,
-                "model_version": self.model_version,
-                "features_importance": self._get_feature_importance(),
-                "recommendations": self._get_recommendations(features)
-            }
+            row = self._row_buffer()
+            row.fill(0.0)  # Missing features default to 0.0
+            index = self._feature_index
+            for feature_name, value in features.items():
+                col = index.get(feature_name)
+                if col is not None:
+                    row[0, col] = float(value)
+
+            prediction = float(self._model_predict(row)[0])
+            return self._build_prediction(self._normalize_score(prediction), features)
         except Exception as e:
             logger.error(f"❌ Prediction error: {e}")
             return self._mock_prediction(features)
 
+    @timed("model_predict")
+    def predict_batch(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predictions for several feature dicts with a single model call"""
+        if not features_list:
+            return []
+
+        if self.model is None:
+            # Fallback to mock if model not loaded
+            return [self._mock_prediction(features) for features in features_list]
+
+        try:
+            # One row per video, in the column order the model was trained on;
+            # a video with unusable values is mocked alone, not the whole batch
+            matrix, invalid = self._feature_matrix(features_list)
+            valid = [row for row in range(len(features_list)) if row not in invalid]
+            results = {row: self._mock_prediction(features_list[row]) for row in invalid}
+            if valid:
+                predictions = np.asarray(self._model_predict(matrix[valid]), dtype=float)
+                scores = self._normalize_scores(predictions)
+                for row, score in zip(valid, scores):
+                    results[row] = self._build_prediction(float(score), features_list[row])
+            return [results[row] for row in range(len(features_list))]
+        except Exception as e:
+            logger.error(f"❌ Prediction error: {e}")
+            return [self._mock_prediction(features) for features in features_list]
+
+    def _model_predict(self, inputs: np.ndarray) -> np.ndarray:
+        """Raw model outputs for rows laid out in `self._feature_names` order"""
+        with warnings.catch_warnings():
+            # Columns are passed positionally in the fitted order: the
+            # missing-names warning is expected, and only silenced here
+            warnings.filterwarnings(
+                "ignore", message="X does not have valid feature names",
+                category=UserWarning)
+            return self.model.predict(inputs)
+
+    def _feature_matrix(self, features_list: List[Dict[str, Any]]) -> Tuple[np.ndarray, Set[int]]:
+        """Stack feature dicts into one (n_videos, n_features) matrix.
+
+        Returns the matrix and the rows holding a value that is not a
+        number (None, text); those rows must not be sent to the model.
+        """
+        # Missing features keep the default value 0.0
+        matrix = np.zeros((len(features_list), len(self._feature_names)), dtype=np.float32)
+        invalid: Set[int] = set()
+        index = self._feature_index
+        for row, features in enumerate(features_list):
+            for feature_name, value in features.items():
+                col = index.get(feature_name)
+                if col is None:
+                    continue
+                try:
+                    # float() refuses None, which NumPy would store as NaN
+                    matrix[row, col] = float(value)
+                except (TypeError, ValueError):
+                    logger.warning(f"⚠️ Non-numeric feature {feature_name}={value!r}, "
+                                   f"mocking prediction {row}")
+                    invalid.add(row)
+                    break
+        return matrix, invalid
+
+    def _normalize_score(self, prediction: float) -> float:
+        """Map one raw model output to the 0-1 virality score range"""
+        # Apply inverse transformation (expm1) since model was trained on log1p transformed data
+        virality_score = math.expm1(prediction)
+
+        # Normalize to 0-1 range for API consistency
+        if virality_score > 1.0:
+            return min(virality_score / 1000000, 1.0)
+        return max(virality_score, 0.0)
+
+    def _normalize_scores(self, predictions: np.ndarray) -> np.ndarray:
+        """Vectorized `_normalize_score` for batch predictions"""
+        scores = np.expm1(predictions)
+        return np.where(scores > 1.0, np.minimum(scores / 1000000, 1.0),
+                        np.maximum(scores, 0.0))
+
+    def _build_prediction(self, virality_score: float,
+                          features: Dict[str, Any]) -> Dict[str, Any]:
+        """Prediction payload returned by the API for one video"""
+        return {
+            "virality_score": virality_score,
+            "confidence": 0.85,
+            "r2_score": self._get_r2_score(),
+            "model_type": self.model_type,
+            "model_version": self.model_version,
+            "features_importance": self._get_feature_importance(),
+            "recommendations": self._get_recommendations(features)
+        }
+
     def _get_r2_score(self) -> float:
         """Get R² score based on model type and version"""
+        return self._r2_score
+
+    def _compute_r2_score(self) -> float:
         if self.model_type == "xgboost" and self.model_version == "iter_003":
             return 0.875  # Expected XGBoost performance
         elif self.model_version == "iter_002":
@@ -141,17 +288,9 @@ class MLModelManager:
         else:
             return 0.457  # ITER_001 baseline
 
-    def _get_expected_feature_names(self) -> list:
-        """Get the feature names expected by the model"""
-        # These are the exact 16 features used in the pre-publication model
-        return [
-            'duration', 'hashtag_count', 'estimated_hashtag_count', 'hour_of_day',
-            'day_of_week', 'month', 'visual_quality_score', 'has_hook',
-            'viral_potential_score', 'emotional_trigger_count',
-            'audience_connection_score', 'sound_quality_score',
-            'production_quality_score', 'trend_alignment_score', 'color_vibrancy_score',
-            'video_duration_optimized'
-        ]
+    def get_feature_names(self) -> list:
+        """Feature names the model consumes, in model column order"""
+        return list(self._feature_names)
 
     def _mock_prediction(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Mock prediction for testing"""
@@ -161,13 +300,7 @@ class MLModelManager:
             "r2_score": self._get_r2_score(),
             "model_type": self.model_type,
             "model_version": self.model_version,
-            "features_importance": {
-                "audience_connection_score": 0.124,
-                "hour_of_day": 0.108,
-                "video_duration_optimized": 0.101,
-                "emotional_trigger_count": 0.099,
-                "estimated_hashtag_count": 0.096
-            },
+            "features_importance": self._get_feature_importance(),
             "recommendations": [
                 "Optimize publication timing (6-8am, 12-2pm, 6-8pm hours)",
                 "Reduce hashtag count (less is better)",
@@ -178,13 +311,8 @@ class MLModelManager:
 
     def _get_feature_importance(self) -> Dict[str, float]:
         """Feature importance (based on our results)"""
-        return {
-            "audience_connection_score": 0.124,
-            "hour_of_day": 0.108,
-            "video_duration_optimized": 0.101,
-            "emotional_trigger_count": 0.099,
-            "estimated_hashtag_count": 0.096
-        }
+        # Copied so callers cannot alter the shared table
+        return dict(FEATURE_IMPORTANCE)
 
     def _get_recommendations(self, features: Dict[str, Any]) -> list:
         """Recommendations based on features"""
@@ -9,6 +9,23 @@ class ViralityPrediction(BaseModel):
     recommendations: List[str]
 
 
+# Upper bound of one /inference/predict-batch request
+MAX_BATCH_PREDICTIONS = 500
+
+
+class BatchPredictionRequest(BaseModel):
+    features: List[Dict[str, Any]] = Field(
+        max_length=MAX_BATCH_PREDICTIONS,
+        description="One feature dict per video, scored with a single model call"
+    )
+
+
+class BatchPrediction(BaseModel):
+    predictions: List[ViralityPrediction]
+    count: int
+    inference_time: float
+
+
 class FeatureExtraction(BaseModel):
     features: Dict[str, object]
     count: int
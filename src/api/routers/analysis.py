@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
 from datetime import datetime
+from typing import Optional
 import logging
 from ..models import TikTokURLRequest, TikTokAnalysis, TikTokProfileRequest
-from ..services.tiktok_service import analyze_tiktok_url_service, analyze_tiktok_profile_service, analyze_video_service
+from ..services.tiktok_service import (
+    analyze_tiktok_url_service, analyze_tiktok_profile_service, analyze_video_service,
+    stream_tiktok_profile_service
+)
+from ..streaming import resolve_stream_format, stream_events
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -16,7 +21,15 @@ async def analyze_tiktok_url(request: TikTokURLRequest):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @router.post("/analyze-tiktok-profile")
-async def analyze_tiktok_profile(request: TikTokProfileRequest):
+async def analyze_tiktok_profile(
+    request: TikTokProfileRequest,
+    http_request: Request,
+    stream: Optional[str] = Query(
+        None, description="Stream each video analysis as it is ready: 'ndjson' or 'sse'")
+):
+    stream_format = resolve_stream_format(stream, http_request.headers.get("accept"))
+    if stream_format:
+        return stream_events(stream_tiktok_profile_service(request), stream_format)
     try:
         return await analyze_tiktok_profile_service(request)
     except Exception as e:
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from datetime import datetime
 import logging
-from ..models import FeatureExtraction, ViralityPrediction
-from ..services.inference_service import extract_features_service, predict_virality_service
+from ..models import BatchPrediction, BatchPredictionRequest, FeatureExtraction, ViralityPrediction
+from ..services.inference_service import extract_features_service, predict_batch_service, predict_virality_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,7 +18,15 @@ async def extract_features(video_file: UploadFile = File(...)):
 @router.post("/predict", response_model=ViralityPrediction)
 async def predict_virality(features: dict):
     try:
-        return predict_virality_service(features)
+        return await predict_virality_service(features)
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@router.post("/predict-batch", response_model=BatchPrediction)
+async def predict_virality_batch(request: BatchPredictionRequest):
+    try:
+        return await predict_batch_service(request.features)
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
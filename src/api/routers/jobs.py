@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional
+import logging
+from ..jobs import job_manager
+from ..models import TikTokProfileRequest
+from ..simulation_endpoint import SimulationRequest
+from ..services.job_service import PROFILE_ANALYSIS, SIMULATION
+from ..streaming import resolve_stream_format, stream_events
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _get_job_or_404(job_id: str, include_result: bool = True) -> dict:
+    job = await job_manager.get(job_id, include_result=include_result)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@router.post("/profile-analysis", status_code=202)
+async def submit_profile_analysis(request: TikTokProfileRequest):
+    return await job_manager.submit(PROFILE_ANALYSIS, request.model_dump())
+
+@router.post("/simulation", status_code=202)
+async def submit_simulation(request: SimulationRequest):
+    return await job_manager.submit(SIMULATION, request.model_dump())
+
+@router.get("")
+async def list_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    return {"jobs": await job_manager.list(status=status, limit=limit)}
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, include_result: bool = True):
+    return await _get_job_or_404(job_id, include_result)
+
+@router.get("/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    http_request: Request,
+    after: int = Query(0, ge=0, description="Only events with a higher sequence number"),
+    stream: Optional[str] = Query(
+        None, description="Follow progress until the job finishes: 'ndjson' or 'sse'")
+):
+    job = await _get_job_or_404(job_id, include_result=False)
+    stream_format = resolve_stream_format(stream, http_request.headers.get("accept"))
+    if stream_format:
+        return stream_events(job_manager.follow(job_id, after), stream_format)
+    return {"job": job, "events": await job_manager.events(job_id, after)}
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    await _get_job_or_404(job_id, include_result=False)
+    return await job_manager.cancel(job_id)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional
 import logging
 from ..simulation_endpoint import TikTokSimulationService, SimulationRequest, SimulationResponse
 from ..feature_integration import feature_manager
 from ..ml_model import ml_manager
 from ..tiktok_scraper_integration import tiktok_scraper_integration
+from ..streaming import resolve_stream_format, stream_events
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,7 +14,15 @@ simulation_service = TikTokSimulationService(
     feature_manager, ml_manager, tiktok_scraper_integration)
 
 @router.post("/simulate-virality", response_model=SimulationResponse)
-async def simulate_virality(request: SimulationRequest):
+async def simulate_virality(
+    request: SimulationRequest,
+    http_request: Request,
+    stream: Optional[str] = Query(
+        None, description="Stream each scenario result as it is ready: 'ndjson' or 'sse'")
+):
+    stream_format = resolve_stream_format(stream, http_request.headers.get("accept"))
+    if stream_format:
+        return stream_events(simulation_service.iter_simulation(request), stream_format)
     try:
         return await simulation_service.simulate_virality(request)
     except Exception as e:
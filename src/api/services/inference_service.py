@@ -1,9 +1,10 @@
 from datetime import datetime
 import logging
 from fastapi import UploadFile
-from ..models import FeatureExtraction, ViralityPrediction
+from ..models import BatchPrediction, FeatureExtraction, ViralityPrediction
 from ..feature_integration import feature_manager
 from ..ml_model import ml_manager
+from ..executors import run_cpu
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +18,7 @@ async def extract_features_service(video_file: UploadFile) -> FeatureExtraction:
         extraction_time=extraction_time
     )
 
-def predict_virality_service(features: dict) -> ViralityPrediction:
-    prediction = ml_manager.predict(features)
+def _to_virality_prediction(prediction: dict) -> ViralityPrediction:
     return ViralityPrediction(
         virality_score=prediction.get("virality_score", 0.0),
         confidence=prediction.get("confidence", 0.0),
@@ -26,3 +26,16 @@ def predict_virality_service(features: dict) -> ViralityPrediction:
         features_importance=prediction.get("features_importance", {}),
         recommendations=prediction.get("recommendations", [])
     )
+
+async def predict_virality_service(features: dict) -> ViralityPrediction:
+    return _to_virality_prediction(await run_cpu(ml_manager.predict, features))
+
+async def predict_batch_service(features_list: list) -> BatchPrediction:
+    start_time = datetime.now()
+    predictions = await run_cpu(ml_manager.predict_batch, features_list)
+    inference_time = (datetime.now() - start_time).total_seconds()
+    return BatchPrediction(
+        predictions=[_to_virality_prediction(p) for p in predictions],
+        count=len(predictions),
+        inference_time=inference_time
+    )
@@ -0,0 +1,44 @@
+from fastapi.encoders import jsonable_encoder
+import logging
+from typing import Any, AsyncIterator, Dict, Tuple
+from ..jobs import Reporter, job_manager
+from ..models import TikTokProfileRequest
+from ..simulation_endpoint import SimulationRequest, TikTokSimulationService
+from ..feature_integration import feature_manager
+from ..ml_model import ml_manager
+from ..tiktok_scraper_integration import tiktok_scraper_integration
+from .tiktok_service import stream_tiktok_profile_service
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ANALYSIS = "profile_analysis"
+SIMULATION = "simulation"
+
+simulation_service = TikTokSimulationService(
+    feature_manager, ml_manager, tiktok_scraper_integration)
+
+async def _record_events(events: AsyncIterator[Tuple[str, Any]], report: Reporter,
+                         item_event: str, items_key: str) -> Dict[str, Any]:
+    """Report every streamed event as job progress and assemble the final result"""
+    result: Dict[str, Any] = {items_key: []}
+    async for event, payload in events:
+        payload = jsonable_encoder(payload)
+        await report(event, payload)
+        if event == item_event:
+            result[items_key].append(payload)
+        else:
+            result.update(payload)
+    return result
+
+async def run_profile_analysis_job(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    request = TikTokProfileRequest(**params)
+    return await _record_events(
+        stream_tiktok_profile_service(request), report, "video", "video_analyses")
+
+async def run_simulation_job(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    request = SimulationRequest(**params)
+    return await _record_events(
+        simulation_service.iter_simulation(request), report, "scenario", "scenarios")
+
+job_manager.register(PROFILE_ANALYSIS, run_profile_analysis_job)
+job_manager.register(SIMULATION, run_simulation_job)
@@ -1,9 +1,11 @@
+import asyncio
 from datetime import datetime
 import logging
 from fastapi import UploadFile
 from ..models import TikTokURLRequest, TikTokAnalysis, TikTokProfileRequest
 from ..gemini_integration import gemini_service
 from ..ml_model import ml_manager
+from ..executors import run_cpu
 from ..feature_integration import feature_manager
 from ..tiktok_scraper_integration import tiktok_scraper_integration
 
@@ -39,8 +41,9 @@ async def analyze_tiktok_url_service(request: TikTokURLRequest) -> TikTokAnalysi
         except Exception as e:
             logger.warning(f"Gemini analysis error: {e}")
 
-    features = await feature_manager.extract_features_from_video_data(video_data, gemini_analysis)
-    prediction = ml_manager.predict(features)
+    features = await feature_manager.extract_features_from_video_data(
+        video_data, gemini_analysis, columns=ml_manager.get_feature_names())
+    prediction = await run_cpu(ml_manager.predict, features)
     analysis_time = (datetime.now() - start_time).total_seconds()
 
     return TikTokAnalysis(
@@ -54,53 +57,157 @@ async def analyze_tiktok_url_service(request: TikTokURLRequest) -> TikTokAnalysi
         gemini_used=gemini_used
     )
 
-async def analyze_tiktok_profile_service(request: TikTokProfileRequest):
-    start_time = datetime.now()
-    cache_used = False
-
+async def _get_profile_data(request: TikTokProfileRequest):
+    """Profile data and whether it came from the cache"""
     if request.use_cache:
         cached_data = await tiktok_scraper_integration.get_cached_profile_data(request.username)
         if cached_data:
-            profile_data = cached_data
-            cache_used = True
             logger.info(f"Using cached data for profile: {request.username}")
-        else:
-            profile_data = await tiktok_scraper_integration.get_profile_data(request.username, request.max_videos)
-            await tiktok_scraper_integration.cache_profile_data(request.username, profile_data)
-    else:
+            return cached_data, True
         profile_data = await tiktok_scraper_integration.get_profile_data(request.username, request.max_videos)
+        await tiktok_scraper_integration.cache_profile_data(request.username, profile_data)
+        return profile_data, False
+    return await tiktok_scraper_integration.get_profile_data(request.username, request.max_videos), False
 
-    video_analyses = []
-    for video in profile_data.get("videos", []):
-        try:
-            features = await feature_manager.extract_features_from_video_data(video)
-            prediction = ml_manager.predict(features)
-            video_analyses.append({
-                "video_id": video.get("id"),
-                "url": video.get("webVideoUrl"),
-                "features": features,
-                "prediction": prediction
-            })
-        except Exception as e:
-            logger.warning(f"Failed to analyze video {video.get('id')}: {e}")
-            continue
+def _use_gemini(request: TikTokProfileRequest) -> bool:
+    return request.use_gemini and gemini_service.is_available()
 
-    analysis_time = (datetime.now() - start_time).total_seconds()
+async def _score_profile_videos(videos: list, gemini_analyses: list) -> list:
+    """Features in one columnar pass, then one model call for all `videos`"""
+    features_list = await feature_manager.extract_features_batch_from_video_data(
+        videos, gemini_analyses, columns=ml_manager.get_feature_names())
+    predictions = await run_cpu(ml_manager.predict_batch, features_list)
+
+    return [
+        {
+            "video_id": video.get("id"),
+            "url": video.get("webVideoUrl"),
+            "features": features,
+            "prediction": prediction,
+            "gemini_used": gemini_analysis is not None
+        }
+        for video, gemini_analysis, features, prediction
+        in zip(videos, gemini_analyses, features_list, predictions)
+    ]
+
+def _profile_summary(video_analyses_count: int, gemini_count: int,
+                     start_time: datetime, cache_used: bool) -> dict:
+    return {
+        "videos_analyzed": video_analyses_count,
+        "analysis_time": (datetime.now() - start_time).total_seconds(),
+        "cache_used": cache_used,
+        "gemini_used": gemini_count > 0,
+        "gemini_videos_analyzed": gemini_count,
+        "status": "completed"
+    }
+
+async def analyze_tiktok_profile_service(request: TikTokProfileRequest):
+    start_time = datetime.now()
+    profile_data, cache_used = await _get_profile_data(request)
+    videos = profile_data.get("videos", [])
+
+    # Uncached videos share batched Gemini requests (cache first); the Gemini
+    # integration bounds how many requests are actually in flight
+    gemini_analyses = [None] * len(videos)
+    if _use_gemini(request):
+        gemini_analyses = await _profile_gemini_analyses(videos, request.use_cache)
+
+    video_analyses = await _score_profile_videos(videos, gemini_analyses)
+    gemini_count = sum(analysis["gemini_used"] for analysis in video_analyses)
 
     return {
         "username": request.username,
         "profile_data": profile_data.get("profile_info", {}),
-        "videos_analyzed": len(video_analyses),
         "video_analyses": video_analyses,
-        "analysis_time": analysis_time,
-        "cache_used": cache_used,
-        "status": "completed"
+        **_profile_summary(len(video_analyses), gemini_count, start_time, cache_used)
     }
 
+async def stream_tiktok_profile_service(request: TikTokProfileRequest):
+    """Profile analysis as ("profile" | "video" | "summary", payload) events
+
+    Videos are scored as soon as their Gemini lookup finishes; lookups
+    finishing together (e.g. cache hits) are scored in one batch.
+    """
+    start_time = datetime.now()
+    profile_data, cache_used = await _get_profile_data(request)
+    videos = profile_data.get("videos", [])
+
+    yield "profile", {
+        "username": request.username,
+        "profile_data": profile_data.get("profile_info", {}),
+        "videos_total": len(videos),
+        "cache_used": cache_used
+    }
+
+    analyzed = 0
+    gemini_count = 0
+    if not _use_gemini(request):
+        for analysis in await _score_profile_videos(videos, [None] * len(videos)):
+            analyzed += 1
+            yield "video", analysis
+    else:
+        async def lookup(index: int):
+            return index, await _profile_video_gemini_analysis(videos[index], request.use_cache)
+
+        pending = {asyncio.ensure_future(lookup(index)) for index in range(len(videos))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                ready = sorted((task.result() for task in done), key=lambda item: item[0])
+                video_analyses = await _score_profile_videos(
+                    [videos[index] for index, _ in ready], [analysis for _, analysis in ready])
+                for analysis in video_analyses:
+                    analyzed += 1
+                    gemini_count += analysis["gemini_used"]
+                    yield "video", analysis
+        finally:
+            # Client gone: stop waiting on lookups nobody will read
+            for task in pending:
+                task.cancel()
+
+    yield "summary", {
+        "username": request.username,
+        **_profile_summary(analyzed, gemini_count, start_time, cache_used)
+    }
+
+async def _profile_gemini_analyses(videos: list, use_cache: bool) -> list:
+    """Gemini analyses of all profile videos from batched requests, None where unavailable"""
+    urls = [video.get("webVideoUrl") for video in videos]
+    try:
+        results = await gemini_service.analyze_videos([url for url in urls if url], use_cache=use_cache)
+    except Exception as e:
+        logger.warning(f"Batched Gemini analysis error: {e}")
+        return [None] * len(videos)
+
+    analyses = []
+    for url in urls:
+        result = results.get(url) if url else None
+        if result and result.get("success"):
+            analyses.append(result.get("analysis"))
+        else:
+            if url:
+                logger.warning(f"Gemini analysis failed for {url}")
+            analyses.append(None)
+    return analyses
+
+async def _profile_video_gemini_analysis(video: dict, use_cache: bool):
+    """Gemini analysis of one profile video, or None when unavailable"""
+    url = video.get("webVideoUrl")
+    if not url:
+        return None
+    try:
+        result = await gemini_service.analyze_video(url, use_cache=use_cache)
+        if result and result.get("success"):
+            return result.get("analysis")
+        logger.warning(f"Gemini analysis failed for {url}")
+    except Exception as e:
+        logger.warning(f"Gemini analysis error for {url}: {e}")
+    return None
+
 async def analyze_video_service(video_file: UploadFile):
     start_time = datetime.now()
     features = await feature_manager.extract_features_from_file(video_file)
-    prediction = ml_manager.predict(features)
+    prediction = await run_cpu(ml_manager.predict, features)
     analysis_time = (datetime.now() - start_time).total_seconds()
 
     return {
@@ -7,6 +7,7 @@ import json
 from fastapi import UploadFile, HTTPException
 import google.generativeai as genai
 
+from ..metrics import timed
 from ..models import VideoInferenceResponse
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ else:
     gemini_model = None
 
 
+@timed("remote_inference", service="huggingface")
 async def perform_video_inference(video_file: UploadFile) -> VideoInferenceResponse:
     start_time = time.time()
 
@@ -203,6 +205,6 @@ async def perform_video_inference(video_file: UploadFile) -> VideoInferenceRespo
 
     end_time = time.time()
     inference_time = end_time - start_time
-    print(f"Remote inference time: {inference_time:.2f} seconds")
+    logger.info(f"Remote inference time: {inference_time:.2f} seconds")
     return VideoInferenceResponse(result=result_text, inference_time=inference_time)
 
@@ -3,11 +3,15 @@
 📊 Simulates different publication scenarios for virality prediction
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
 from pydantic import BaseModel, Field
 
+from .executors import run_cpu
+
+# Noise added to each simulated score, drawn uniformly in [-NOISE_AMPLITUDE, NOISE_AMPLITUDE]
+NOISE_AMPLITUDE = 0.05
+
 
 class SimulationScenario(BaseModel):
     """Simulation scenario for pre-publication testing"""
@@ -55,6 +59,10 @@ class SimulationRequest(BaseModel):
         default=True, description="Use cached video data if available")
     simulation_count: int = Field(
         default=5, ge=1, le=20, description="Number of simulations per scenario")
+    include_features: bool = Field(
+        default=True, description="Include the feature dict of every simulation")
+    random_seed: Optional[int] = Field(
+        default=None, description="Seed for reproducible hashtag sampling and score noise")
 
 
 class SimulationResult(BaseModel):
@@ -103,13 +111,15 @@ class TikTokSimulationService:
             "sunday": [10, 14, 19, 22]
         }
 
-    def generate_scenario_variations(self, base_scenario: SimulationScenario) -> List[SimulationScenario]:
+    def generate_scenario_variations(self, base_scenario: SimulationScenario,
+                                     rng: Optional[np.random.Generator] = None) -> List[SimulationScenario]:
         """Generate variations of a base scenario"""
+        rng = rng if rng is not None else np.random.default_rng()
         variations = []
 
         # Variation 1: Optimal hours
         for hour in self.optimal_hours.get(base_scenario.publication_day.lower(), [9, 12, 18, 21]):
-            variation = base_scenario.copy()
+            variation = base_scenario.model_copy()
             variation.name = f"{base_scenario.name}_optimal_hour_{hour}"
             variation.description = f"{base_scenario.description} - Optimal hour: {hour}h"
             variation.publication_hour = hour
@@ -117,15 +127,15 @@ class TikTokSimulationService:
 
         # Variation 2: Trending hashtags
         if base_scenario.trending_hashtags:
-            variation = base_scenario.copy()
+            variation = base_scenario.model_copy()
             variation.name = f"{base_scenario.name}_trending_hashtags"
             variation.description = f"{base_scenario.description} - With trending hashtags"
             variation.hashtags = base_scenario.hashtags + \
-                random.sample(self.trending_hashtags, 3)
+                [str(h) for h in rng.choice(self.trending_hashtags, 3, replace=False)]
             variations.append(variation)
 
         # Variation 3: Engagement boost
-        variation = base_scenario.copy()
+        variation = base_scenario.model_copy()
         variation.name = f"{base_scenario.name}_engagement_boost"
         variation.description = f"{base_scenario.description} - Engagement boost"
         variation.engagement_multiplier = 1.5
@@ -253,8 +263,12 @@ class TikTokSimulationService:
 
         return recommendations
 
-    async def run_simulation(self, request: SimulationRequest) -> SimulationResponse:
-        """Run complete pre-publication simulation"""
+    async def iter_simulation(self, request: SimulationRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """Run the simulation, yielding results as they are ready
+
+        Events, in order: ("base", base score and cache info), one
+        ("scenario", SimulationResult) per scenario, then ("summary", ...).
+        """
 
         # Get video data for content analysis only (not engagement)
         video_data = None
@@ -287,44 +301,55 @@ class TikTokSimulationService:
             video_length=video_data.get("duration", 30)
         ))
 
-        # Calculate base score (pre-publication)
-        base_score = self.ml_manager.predict(base_features)['virality_score']
+        rng = np.random.default_rng(request.random_seed)
 
-        results = []
-        best_scenario = None
-        best_score = 0.0
-
-        # Test each scenario
-        for scenario in request.scenarios:
-            scenario_results = []
+        # Repeats of a variation share their features: one row per variation
+        scenario_variations = [
+            (scenario, self.generate_scenario_variations(scenario, rng))
+            for scenario in request.scenarios
+        ]
+        variation_features = [
+            self.create_pre_publication_features(video_data, variation)
+            for _, variations in scenario_variations
+            for variation in variations
+        ]
 
-            # Generate scenario variations
-            variations = self.generate_scenario_variations(scenario)
+        # Base score (pre-publication) and the whole grid in one model call
+        predictions = await run_cpu(self.ml_manager.predict_batch, [base_features] + variation_features)
+        base_score = predictions[0]['virality_score']
+        variation_scores = np.array([p['virality_score'] for p in predictions[1:]], dtype=float)
 
-            for variation in variations:
-                for i in range(request.simulation_count):
-                    # Create pre-publication features for this scenario
-                    simulated_features = self.create_pre_publication_features(
-                        video_data, variation)
+        # Add noise for variance: one draw per (variation, repeat)
+        noise = rng.uniform(-NOISE_AMPLITUDE, NOISE_AMPLITUDE,
+                            size=(len(variation_features), request.simulation_count))
+        simulated_scores = np.clip(variation_scores[:, None] + noise, 0.0, 1.0)
 
-                    # Predict virality
-                    virality_score = self.ml_manager.predict(
-                        simulated_features)['virality_score']
+        yield "base", {
+            "video_url": request.video_url,
+            "base_virality_score": base_score,
+            "cache_used": cache_used
+        }
 
-                    # Add noise for variance
-                    noise = random.uniform(-0.05, 0.05)
-                    virality_score = max(0.0, min(1.0, virality_score + noise))
+        best_scenario = None
+        best_score = 0.0
+        recommendations_count = 0
 
+        row = 0
+        for scenario, variations in scenario_variations:
+            scenario_results = []
+            for variation in variations:
+                for virality_score in simulated_scores[row]:
                     simulation_result = {
                         "variation": variation.name,
-                        "features": simulated_features,
-                        "virality_score": virality_score,
+                        "virality_score": float(virality_score),
                         "publication_hour": variation.publication_hour,
                         "hashtags": variation.hashtags,
                         "engagement_multiplier": variation.engagement_multiplier
                     }
-
+                    if request.include_features:
+                        simulation_result["features"] = variation_features[row]
                     scenario_results.append(simulation_result)
+                row += 1
 
             # Calculate scenario statistics
             scores = [r["virality_score"] for r in scenario_results]
@@ -336,8 +361,9 @@ class TikTokSimulationService:
 
             # Generate recommendations
             recommendations = self.generate_recommendations(scenario, scores)
+            recommendations_count += len(recommendations)
 
-            result = SimulationResult(
+            yield "scenario", SimulationResult(
                 scenario_name=scenario.name,
                 scenario_description=scenario.description,
                 simulations=scenario_results,
@@ -347,26 +373,29 @@ class TikTokSimulationService:
                 recommendations=recommendations
             )
 
-            results.append(result)
-
-        # Summary
-        summary = {
-            "total_simulations": len(request.scenarios) * request.simulation_count,
-            "scenarios_tested": len(request.scenarios),
-            "improvement_potential": best_score - base_score,
-            "recommendations_count": sum(len(r.recommendations) for r in results),
-            "cache_used": cache_used,
-            "simulation_type": "pre_publication"
+        yield "summary", {
+            "best_scenario": best_scenario or "None",
+            "best_score": best_score,
+            "summary": {
+                "total_simulations": len(request.scenarios) * request.simulation_count,
+                "scenarios_tested": len(request.scenarios),
+                "improvement_potential": best_score - base_score,
+                "recommendations_count": recommendations_count,
+                "cache_used": cache_used,
+                "simulation_type": "pre_publication"
+            }
         }
 
-        return SimulationResponse(
-            video_url=request.video_url,
-            base_virality_score=base_score,
-            scenarios=results,
-            best_scenario=best_scenario or "None",
-            best_score=best_score,
-            summary=summary
-        )
+    async def run_simulation(self, request: SimulationRequest) -> SimulationResponse:
+        """Run complete pre-publication simulation"""
+        response: Dict[str, Any] = {"scenarios": []}
+        async for event, payload in self.iter_simulation(request):
+            if event == "scenario":
+                response["scenarios"].append(payload)
+            else:
+                response.update(payload)
+        response.pop("cache_used", None)
+        return SimulationResponse(**response)
 
     async def simulate_virality(self, request: SimulationRequest) -> SimulationResponse:
         """Simulate virality prediction with different parameters"""
@@ -0,0 +1,72 @@
+"""
+🛬 Single-flight request coalescing
+
+🎯 Concurrent callers asking for the same key share one in-flight task
+📊 Used to stop duplicate Apify actor runs and Gemini calls during spikes
+"""
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls by key.
+
+    The first caller starts the work as a task; callers arriving while it
+    runs await the same task. Nothing is kept once the task finishes, so
+    errors are not cached and later calls start fresh work.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `func()` for `key`, or join the call already in flight"""
+        return await self.start(key, func)[0]
+
+    def start(self, key: Hashable,
+              func: Callable[[], Awaitable[Any]]) -> Tuple[Awaitable[Any], bool]:
+        """Register `key` now, without awaiting: (result awaitable, joined).
+
+        Lets a caller claim several keys before any other coroutine runs,
+        and learn which ones were already in flight elsewhere.
+        """
+        task = self._in_flight.get(key)
+        if task is not None and not task.done():
+            self.coalesced += 1
+            logger.info(f"🛬 Joining in-flight {self.name} for {key}")
+            return self._follow(task), True
+
+        task = asyncio.ensure_future(func())
+        self._in_flight[key] = task
+        self.started += 1
+        task.add_done_callback(lambda _: self._forget(key, task))
+        # Shielded: a cancelled caller (client disconnect) does not cancel
+        # the work the other callers are waiting on
+        return asyncio.shield(task), False
+
+    @staticmethod
+    async def _follow(task: asyncio.Task) -> Any:
+        # Followers get their own copy: the leader's result may be mutated
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the error as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "coalesced": self.coalesced
+        }
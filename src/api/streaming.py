@@ -0,0 +1,80 @@
+"""
+📡 Streaming responses (NDJSON / Server-Sent Events)
+
+🎯 Long analyses emit each result as soon as it is ready instead of one
+   response built in memory at the end
+📊 Every event is a (name, payload) pair: one JSON line in NDJSON, one
+   `event:`/`data:` block in SSE
+"""
+import json
+import logging
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "ndjson"
+SSE = "sse"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    SSE: "text/event-stream",
+}
+
+# (event name, JSON-serializable payload)
+Event = Tuple[str, Any]
+
+
+def resolve_stream_format(stream: Optional[str], accept: Optional[str] = None) -> Optional[str]:
+    """Streaming format asked for by the `stream` query parameter or the Accept header.
+
+    Returns None for a regular JSON response.
+    """
+    if stream:
+        stream = stream.lower()
+        if stream not in MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown stream format '{stream}' (expected one of: {', '.join(MEDIA_TYPES)})")
+        return stream
+    accept = (accept or "").lower()
+    for stream_format, media_type in MEDIA_TYPES.items():
+        if media_type in accept:
+            return stream_format
+    return None
+
+
+def format_event(event: str, payload: Any, stream_format: str) -> str:
+    """Serialize one event for the wire"""
+    data = json.dumps(jsonable_encoder(payload), ensure_ascii=False)
+    if stream_format == SSE:
+        return f"event: {event}\ndata: {data}\n\n"
+    return json.dumps({"event": event, "data": json.loads(data)}, ensure_ascii=False) + "\n"
+
+
+async def _encode(events: AsyncIterator[Event], stream_format: str) -> AsyncIterator[str]:
+    try:
+        async for event, payload in events:
+            yield format_event(event, payload, stream_format)
+    except Exception as e:
+        # Headers are already sent: the failure is reported in-band
+        logger.error(f"❌ Streaming failed: {e}")
+        yield format_event("error", {"detail": str(e)}, stream_format)
+    finally:
+        # Client disconnects close the producer (and cancel its pending work)
+        close = getattr(events, "aclose", None)
+        if close is not None:
+            await close()
+
+
+def stream_events(events: AsyncIterator[Event], stream_format: str) -> StreamingResponse:
+    """StreamingResponse writing `events` in the given format as they are produced"""
+    headers = {"Cache-Control": "no-cache"}
+    if stream_format == SSE:
+        # Keep reverse proxies from buffering the event stream
+        headers["X-Accel-Buffering"] = "no"
+    return StreamingResponse(
+        _encode(events, stream_format), media_type=MEDIA_TYPES[stream_format], headers=headers)
@@ -0,0 +1,223 @@
+"""
+🗄️ Tiered cache for API scrape and Gemini results
+
+🎯 Bounded in-process LRU (microsecond hits) in front of one SQLite file
+📊 Per data type freshness: engagement counts go stale fast, Gemini
+   content analysis does not
+🔁 Legacy per-key JSON files under data/api_cache are read once and migrated
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .executors import run_io
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path("data/api_cache/api_cache.sqlite")
+DEFAULT_MEMORY_ITEMS = 1024
+
+# Freshness per data type, in seconds (overridable with API_CACHE_TTL_<TYPE>)
+DEFAULT_TTLS = {
+    "video": 6 * 3600,
+    "profile": 6 * 3600,
+    "gemini": 30 * 24 * 3600,
+}
+
+# Legacy loader: key -> (value, stored_at) or None
+LegacyLoader = Callable[[str], Optional[Tuple[Any, float]]]
+
+
+def ttl_from_env(namespace: str) -> float:
+    """TTL of a data type, from API_CACHE_TTL_<NAMESPACE> or the default"""
+    default = DEFAULT_TTLS.get(namespace, 3600)
+    return float(os.getenv(f"API_CACHE_TTL_{namespace.upper()}", default))
+
+
+def legacy_json_loader(cache_dir: Path, unwrap: str) -> LegacyLoader:
+    """Read `<cache_dir>/<key>.json` files written by the former file cache"""
+    def load(key: str) -> Optional[Tuple[Any, float]]:
+        path = cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get(unwrap, data), path.stat().st_mtime
+    return load
+
+
+class TieredCache:
+    """Memory LRU + SQLite cache for one data type, with a TTL"""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+        legacy_loader: Optional[LegacyLoader] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.namespace = namespace
+        self.ttl = ttl_seconds
+        self.memory_items = memory_items
+        self.legacy_loader = legacy_loader
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.counters = {
+            "memory_hits": 0, "disk_hits": 0, "legacy_hits": 0,
+            "misses": 0, "expired": 0, "evictions": 0, "writes": 0
+        }
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls, namespace: str,
+                 legacy_loader: Optional[LegacyLoader] = None) -> "TieredCache":
+        """Cache configured by API_CACHE_PATH, API_CACHE_MEMORY_ITEMS and API_CACHE_TTL_<TYPE>"""
+        return cls(
+            namespace,
+            ttl_seconds=ttl_from_env(namespace),
+            path=os.getenv("API_CACHE_PATH", str(DEFAULT_CACHE_PATH)),
+            memory_items=int(os.getenv("API_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)),
+            legacy_loader=legacy_loader
+        )
+
+    def _fresh(self, stored_at: float) -> bool:
+        return self._clock() - stored_at <= self.ttl
+
+    def _remember(self, key: str, value: Any, stored_at: float):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Fresh cached value for `key`, or None.
+
+        Values are shared between callers and must be treated as read-only.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry[1]):
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+                self.counters["expired"] += 1
+
+            row = self._conn.execute(
+                "SELECT payload, stored_at FROM entries WHERE namespace=? AND key=?",
+                (self.namespace, key)).fetchone()
+            if row is not None:
+                if self._fresh(row[1]):
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.counters["disk_hits"] += 1
+                    return value
+                self.counters["expired"] += 1
+
+        legacy = self._load_legacy(key)
+        if legacy is not None:
+            return legacy
+
+        with self._lock:
+            self.counters["misses"] += 1
+        return None
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """`get` for async callers: memory hits are answered inline, disk and
+        legacy lookups run on the I/O pool"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry[1]):
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return entry[0]
+        return await run_io(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """`set` for async callers, on the I/O pool"""
+        await run_io(self.set, key, value)
+
+    def _load_legacy(self, key: str) -> Optional[Any]:
+        if self.legacy_loader is None:
+            return None
+        try:
+            loaded = self.legacy_loader(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Error reading legacy {self.namespace} cache for {key}: {e}")
+            return None
+        if loaded is None or not self._fresh(loaded[1]):
+            return None
+
+        # Migrated into the new store, keeping the original freshness
+        value, stored_at = loaded
+        self.set(key, value, stored_at=stored_at)
+        with self._lock:
+            self.counters["legacy_hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store `value` in both tiers"""
+        stored_at = self._clock() if stored_at is None else stored_at
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            # The memory tier keeps its own copy, decoupled from the caller's object
+            self._remember(key, json.loads(payload), stored_at)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, payload, stored_at) "
+                "VALUES (?, ?, ?, ?)", (self.namespace, key, payload, stored_at))
+            self._writes += 1
+            self.counters["writes"] += 1
+            # Expired rows are purged from time to time rather than on every write
+            if self._writes % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE namespace=? AND stored_at < ?",
+                    (self.namespace, self._clock() - self.ttl))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = sum(self.counters[name] for name in
+                          ("memory_hits", "disk_hits", "legacy_hits", "misses"))
+            hits = lookups - self.counters["misses"]
+            disk_entries = self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace=?",
+                (self.namespace,)).fetchone()[0]
+            return {
+                **self.counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "ttl_seconds": self.ttl
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
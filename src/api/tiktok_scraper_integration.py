@@ -7,7 +7,6 @@
 import logging
 import re
 import os
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
@@ -20,6 +19,11 @@ except ImportError as e:
     logging.warning(f"⚠️ Apify client not available: {e}")
     APIFY_AVAILABLE = False
 
+from .executors import run_external
+from .metrics import timed
+from .single_flight import SingleFlight
+from .tiered_cache import TieredCache, legacy_json_loader
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +34,14 @@ class TikTokScraperIntegration:
         self.client = None
         self.available = APIFY_AVAILABLE
         self.cache_dir = Path("data/api_cache")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Engagement counts go stale fast: short TTLs (API_CACHE_TTL_VIDEO/PROFILE)
+        self.video_cache = TieredCache.from_env(
+            "video", legacy_loader=legacy_json_loader(self.cache_dir, "video_data"))
+        self.profile_cache = TieredCache.from_env(
+            "profile", legacy_loader=legacy_json_loader(self.cache_dir, "profile_data"))
+        # One actor run per video / profile, whatever the number of callers
+        self._video_flights = SingleFlight("video scraping")
+        self._profile_flights = SingleFlight("profile scraping")
 
         if self.available:
             try:
@@ -98,77 +109,52 @@ class TikTokScraperIntegration:
         """Generate cache key for profile"""
         return f"profile_{username.lstrip('@')}"
 
+    @timed("cache_read")
     async def get_cached_video_data(self, url: str) -> Optional[Dict[str, Any]]:
-        """Get cached video data if available"""
+        """Get cached video data if available and fresh"""
         try:
-            cache_key = self._get_cache_key(url)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
+            cached_data = await self.video_cache.aget(self._get_cache_key(url))
+            if cached_data is not None:
                 logger.info(f"✅ Using cached video data for {url}")
-                # Return the video_data part
-                return cached_data.get("video_data")
-            return None
+            return cached_data
         except Exception as e:
             logger.warning(f"⚠️ Error reading cache: {e}")
             return None
 
+    @timed("cache_write")
     async def cache_video_data(self, url: str, video_data: Dict[str, Any]) -> None:
         """Cache video data"""
         try:
-            cache_key = self._get_cache_key(url)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            cache_data = {
-                "url": url,
-                "video_data": video_data,
-                "cached_at": "2025-01-06T00:00:00Z"
-            }
-
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-
+            await self.video_cache.aset(self._get_cache_key(url), video_data)
             logger.info(f"✅ Cached video data for {url}")
         except Exception as e:
             logger.warning(f"⚠️ Error caching video data: {e}")
 
+    @timed("cache_read")
     async def get_cached_profile_data(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get cached profile data if available"""
+        """Get cached profile data if available and fresh"""
         try:
-            cache_key = self._get_profile_cache_key(username)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
+            cached_data = await self.profile_cache.aget(self._get_profile_cache_key(username))
+            if cached_data is not None:
                 logger.info(f"✅ Using cached profile data for {username}")
-                return cached_data
-            return None
+            return cached_data
         except Exception as e:
             logger.warning(f"⚠️ Error reading profile cache: {e}")
             return None
 
+    @timed("cache_write")
     async def cache_profile_data(self, username: str, profile_data: Dict[str, Any]) -> None:
         """Cache profile data"""
         try:
-            cache_key = self._get_profile_cache_key(username)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-
-            cache_data = {
-                "username": username,
-                "profile_data": profile_data,
-                "cached_at": "2025-01-06T00:00:00Z"
-            }
-
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-
+            await self.profile_cache.aset(self._get_profile_cache_key(username), profile_data)
             logger.info(f"✅ Cached profile data for {username}")
         except Exception as e:
             logger.warning(f"⚠️ Error caching profile data: {e}")
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the video and profile caches"""
+        return {"video": self.video_cache.stats(), "profile": self.profile_cache.stats()}
+
     async def get_video_data_from_url(self, url: str) -> Dict[str, Any]:
         """Get video data from TikTok URL"""
         if not self.available or not self.client:
@@ -177,6 +163,14 @@ class TikTokScraperIntegration:
         if not self.validate_tiktok_url(url):
             raise ValueError("Invalid TikTok URL")
 
+        # The actor run is blocking: run it on the external pool, once per video
+        return await self._video_flights.run(
+            self._get_cache_key(url),
+            lambda: run_external(self._scrape_video, url))
+
+    @timed("apify_fetch", service="apify")
+    def _scrape_video(self, url: str) -> Dict[str, Any]:
+        """Run the Apify actor for one video URL (blocking)"""
         try:
             # Configuration for direct video scraping
             run_input = {
@@ -219,10 +213,17 @@ class TikTokScraperIntegration:
         if not self.available or not self.client:
             raise ValueError("Apify client not available")
 
-        try:
-            # Clean username
-            username = username.lstrip('@')
+        # Clean username
+        username = username.lstrip('@')
 
+        return await self._profile_flights.run(
+            (username.lower(), max_videos),
+            lambda: run_external(self._scrape_profile, username, max_videos))
+
+    @timed("apify_fetch", service="apify")
+    def _scrape_profile(self, username: str, max_videos: int) -> Dict[str, Any]:
+        """Run the Apify actor for one profile (blocking)"""
+        try:
             # Configuration for profile scraping
             run_input = {
                 "profiles": [username],
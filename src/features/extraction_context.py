@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+📊 File: extraction_context.py
+🎯 Purpose: Per-video extraction context shared by every feature set
+📚 Concepts: Memoization, Shared State, Single Parse per Record
+🔗 Related: src/features/modular_feature_system.py, src/features/timestamps.py
+
+📖 Educational Notes:
+- Several feature sets read the same raw fields (videoMeta, hashtags, createTimeISO)
+- Several feature sets test the same Gemini fields for keywords
+- The context parses each field once and memoizes whole feature set results,
+  so a composite set (comprehensive) reuses what metadata already computed
+
+🚀 Usage:
+from src.features.extraction_context import ExtractionContext
+context = ExtractionContext(video_data, gemini_analysis)
+features = context.run(feature_set)
+"""
+
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from .feature_cache import input_fingerprint
+from .keyword_rules import GEMINI_KEYWORD_MATCHER
+from .timestamps import TimestampParts, decompose_timestamp
+
+
+def hashtag_names(hashtags: Any) -> List[str]:
+    """Normalise les hashtags Apify (liste de dicts) ou API (liste de str) en noms."""
+    if not hashtags or not isinstance(hashtags, (list, tuple)):
+        return []
+    return [tag.get('name', '') if isinstance(tag, dict) else str(tag)
+            for tag in hashtags]
+
+
+class ExtractionContext:
+    """Champs analysés une seule fois pour une vidéo et son analyse Gemini."""
+
+    def __init__(self, video_data: Dict, gemini_analysis: Optional[Dict] = None):
+        self.video_data = video_data or {}
+        self.gemini_analysis = gemini_analysis
+        self._results: Dict[str, Dict] = {}
+
+    def run(self, feature_set) -> Dict:
+        """Résultat d'un feature set pour cette vidéo, calculé au plus une fois."""
+        if feature_set.name not in self._results:
+            self._results[feature_set.name] = feature_set.extract_from_context(self)
+        return self._results[feature_set.name]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Empreinte des entrées (item brut + analyse), clé du cache de features."""
+        return input_fingerprint(self.video_data, self.gemini_analysis)
+
+    # Métadonnées TikTok
+
+    @cached_property
+    def video_meta(self) -> Dict:
+        return self.video_data.get('videoMeta') or {}
+
+    @cached_property
+    def duration(self) -> float:
+        return self.video_meta.get('duration', 0)
+
+    @cached_property
+    def text(self) -> str:
+        return self.video_data.get('text', '')
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def hashtags(self) -> List[str]:
+        return hashtag_names(self.video_data.get('hashtags', []))
+
+    @cached_property
+    def hashtags_lower(self) -> List[str]:
+        return [tag.lower() for tag in self.hashtags]
+
+    @cached_property
+    def post_time(self) -> Optional[TimestampParts]:
+        return decompose_timestamp(self.video_data.get('createTimeISO', ''))
+
+    # Analyse Gemini
+
+    @property
+    def has_gemini(self) -> bool:
+        return bool(self.gemini_analysis)
+
+    @cached_property
+    def keyword_hits(self) -> FrozenSet[str]:
+        """Règles de mots-clés vérifiées, une seule passe par section Gemini."""
+        return GEMINI_KEYWORD_MATCHER.scan(self.gemini_analysis)
+
+    def matches(self, rule_name: str) -> bool:
+        """True si la règle de mots-clés `rule_name` est vérifiée."""
+        return rule_name in self.keyword_hits
+
+    def gemini_section(self, section: str) -> Dict:
+        """Section brute de l'analyse Gemini ({} si absente)."""
+        if not self.gemini_analysis:
+            return {}
+        value = self.gemini_analysis.get(section, {})
+        return value if isinstance(value, dict) else {}
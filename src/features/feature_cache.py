@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+📊 File: feature_cache.py
+🎯 Purpose: Persistent, content-addressed cache of extracted features
+📚 Concepts: Content Addressing, SQLite, LRU Eviction
+🔗 Related: src/features/modular_feature_system.py, src/api/feature_integration.py
+
+📖 Educational Notes:
+- Features only change when the raw Apify item, the Gemini analysis or the
+  extractor code change
+- Each entry is keyed by (video_id, feature set, feature set version, input hash):
+  a new scrape, a new analysis or a change to the extraction code (the version
+  is a hash of the feature set source) simply misses the cache
+- Entries are JSON payloads in one SQLite file; when the file grows past
+  `max_bytes` the least recently used entries are evicted
+
+🚀 Usage:
+from src.features.feature_cache import FeatureCache
+cache = FeatureCache('data/feature_cache/features.sqlite')
+manager = FeatureExtractorManager(['metadata'], cache=cache)
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path("data/feature_cache/features.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CacheKey(NamedTuple):
+    """Clé d'une entrée : vidéo, feature set, version du code, empreinte des entrées."""
+    video_id: str
+    feature_set: str
+    version: str
+    input_hash: str
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convertit les scalaires NumPy pour la sérialisation JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def input_fingerprint(video_data: Dict, gemini_analysis: Optional[Dict]) -> str:
+    """Empreinte SHA-1 stable d'un item brut et de son analyse Gemini."""
+    payload = json.dumps([video_data, gemini_analysis or None], sort_keys=True,
+                         default=_to_builtin, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FeatureCache:
+    """Cache SQLite des features, partageable entre threads."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # timeout : plusieurs processus d'extraction peuvent écrire en même temps
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS features (
+                video_id TEXT NOT NULL,
+                feature_set TEXT NOT NULL,
+                version TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (video_id, feature_set, version, input_hash)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_features_last_access ON features(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM features").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> Optional['FeatureCache']:
+        """Cache configuré par FEATURE_CACHE_PATH / FEATURE_CACHE_MAX_MB (désactivé si FEATURE_CACHE=off)."""
+        if os.getenv("FEATURE_CACHE", "on").lower() in ("0", "off", "false", "no"):
+            return None
+        path = os.getenv("FEATURE_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+        max_mb = int(os.getenv("FEATURE_CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024)))
+        try:
+            return cls(path, max_bytes=max_mb * 1024 * 1024)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Feature cache disabled ({path}): {e}")
+            return None
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """Features en cache pour `key`, ou None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, Dict]:
+        """Recherche groupée ; renvoie uniquement les clés trouvées."""
+        keys = list(keys)
+        found: Dict[CacheKey, Dict] = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT payload FROM features WHERE video_id=? AND feature_set=? "
+                    "AND version=? AND input_hash=?", key).fetchone()
+                if row is not None:
+                    found[key] = json.loads(row[0])
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE features SET last_access=? WHERE video_id=? AND feature_set=? "
+                    "AND version=? AND input_hash=?",
+                    [(now, *key) for key in found])
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: CacheKey, features: Dict) -> None:
+        self.put_many({key: features})
+
+    def put_many(self, entries: Dict[CacheKey, Dict]) -> None:
+        """Enregistre des features puis évince les entrées les moins récentes si besoin."""
+        if not entries:
+            return
+
+        now = time.time()
+        rows = []
+        for key, features in entries.items():
+            payload = json.dumps(features, default=_to_builtin, ensure_ascii=False)
+            rows.append((*key, payload, len(payload.encode('utf-8')), now))
+
+        with self._lock:
+            for row in rows:
+                previous = self._conn.execute(
+                    "SELECT size FROM features WHERE video_id=? AND feature_set=? "
+                    "AND version=? AND input_hash=?", row[:4]).fetchone()
+                if previous is not None:
+                    self._total_bytes -= previous[0]
+                self._total_bytes += row[5]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features "
+                "(video_id, feature_set, version, input_hash, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment lues jusqu'à 90 % de la taille max."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        # D'autres processus ont pu écrire : repartir de la taille réelle
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM features").fetchone()[0]
+        cursor = self._conn.execute(
+            "SELECT rowid, size FROM features ORDER BY last_access ASC")
+        to_delete = []
+        for rowid, size in cursor:
+            if self._total_bytes <= target:
+                break
+            to_delete.append((rowid,))
+            self._total_bytes -= size
+            evicted += 1
+        self._conn.executemany("DELETE FROM features WHERE rowid=?", to_delete)
+        logger.info(f"🧹 Feature cache evicted {evicted} entries")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM features")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+📊 File: feature_graph.py
+🎯 Purpose: Per-feature dependency graph and planner for computing only requested columns
+📚 Concepts: Dependency Graphs, Topological Sort, Lazy Evaluation
+🔗 Related: src/features/modular_feature_system.py, src/features/extraction_context.py
+
+📖 Educational Notes:
+- A feature set computes all of its features, even when the consumer needs three
+- Here every feature is a node declaring its inputs (other features)
+- The planner walks back from the requested columns, keeps only what they need,
+  and orders it so inputs are always computed before the features using them
+- Gemini-dependent nodes use their fallback value, or are skipped, when no
+  analysis is present
+
+🚀 Usage:
+from src.features.feature_graph import FeaturePlanner
+planner = FeaturePlanner.for_feature_sets([ModelCompatibleFeatureSet()])
+features = planner.evaluate(ExtractionContext(video_data, gemini_analysis), ['duration', 'has_hook'])
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+from .extraction_context import ExtractionContext
+
+logger = logging.getLogger(__name__)
+
+
+class _Marker:
+    """Valeur sentinelle nommée (lisible dans les logs et les reprs)."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+# Valeur renvoyée par un nœud qui ne produit rien pour cette vidéo
+SKIP = _Marker('SKIP')
+# Absence de fallback : le nœud Gemini est ignoré sans analyse
+NO_FALLBACK = _Marker('NO_FALLBACK')
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    """Une feature et la façon de la calculer.
+
+    Attributes:
+        name: Nom de la colonne produite
+        compute: f(context, values) -> valeur ; `values` contient les inputs
+        inputs: Features dont ce nœud a besoin
+        requires_gemini: True si le calcul lit l'analyse Gemini
+        fallback: Valeur utilisée sans analyse Gemini (NO_FALLBACK : ignoré)
+    """
+    name: str
+    compute: Callable[[ExtractionContext, Dict[str, Any]], Any]
+    inputs: Tuple[str, ...] = ()
+    requires_gemini: bool = False
+    fallback: Any = NO_FALLBACK
+
+    def available(self, has_gemini: bool) -> bool:
+        return has_gemini or not self.requires_gemini or self.fallback is not NO_FALLBACK
+
+
+class FeaturePlanner:
+    """Planifie et évalue le sous-graphe nécessaire à une liste de colonnes.
+
+    Plusieurs nœuds peuvent produire la même colonne ; ils sont essayés par
+    ordre de priorité et le premier disponible est retenu.
+    """
+
+    def __init__(self, nodes: Iterable[FeatureNode]):
+        self.candidates: Dict[str, List[FeatureNode]] = {}
+        for node in nodes:
+            self.candidates.setdefault(node.name, []).append(node)
+        self._plans: Dict[Tuple[Tuple[str, ...], bool], Tuple[FeatureNode, ...]] = {}
+
+    @classmethod
+    def for_feature_sets(cls, feature_sets: Sequence) -> 'FeaturePlanner':
+        """Planner sur des feature sets ; le dernier set l'emporte, comme dict.update."""
+        nodes: List[FeatureNode] = []
+        for feature_set in reversed(list(feature_sets)):
+            nodes.extend(feature_set.feature_nodes())
+        return cls(nodes)
+
+    def feature_names(self) -> List[str]:
+        return list(self.candidates)
+
+    def plan(self, columns: Sequence[str], has_gemini: bool) -> Tuple[FeatureNode, ...]:
+        """Nœuds à évaluer, dans l'ordre des dépendances.
+
+        Raises:
+            ValueError: colonne inconnue ou dépendance circulaire
+        """
+        key = (tuple(columns), has_gemini)
+        if key not in self._plans:
+            self._plans[key] = self._build_plan(columns, has_gemini)
+        return self._plans[key]
+
+    def _build_plan(self, columns: Sequence[str], has_gemini: bool) -> Tuple[FeatureNode, ...]:
+        unknown = [name for name in columns if name not in self.candidates]
+        if unknown:
+            raise ValueError(f"Unknown features requested: {unknown}")
+
+        ordered: List[FeatureNode] = []
+        resolved: Dict[str, Optional[FeatureNode]] = {}
+        visiting = set()
+
+        def visit(name: str) -> Optional[FeatureNode]:
+            if name in resolved:
+                return resolved[name]
+            if name in visiting:
+                raise ValueError(f"Circular feature dependency on '{name}'")
+            visiting.add(name)
+
+            chosen = None
+            for node in self.candidates.get(name, []):
+                if not node.available(has_gemini):
+                    continue
+                # Sans analyse, un nœud Gemini avec fallback n'a pas d'inputs à calculer
+                uses_fallback = node.requires_gemini and not has_gemini
+                if uses_fallback or all(visit(dep) is not None for dep in node.inputs):
+                    chosen = node
+                    break
+
+            visiting.discard(name)
+            resolved[name] = chosen
+            if chosen is not None:
+                ordered.append(chosen)
+            return chosen
+
+        for name in columns:
+            visit(name)
+        return tuple(ordered)
+
+    def evaluate(self, context: ExtractionContext, columns: Sequence[str]) -> Dict[str, Any]:
+        """Calcule uniquement les colonnes demandées (et leurs dépendances).
+
+        Les colonnes ignorées (Gemini absent, SKIP, erreur) sont absentes du
+        résultat, comme une feature que le feature set n'aurait pas produite.
+        """
+        values: Dict[str, Any] = {}
+        for node in self.plan(columns, context.has_gemini):
+            if node.requires_gemini and not context.has_gemini:
+                values[node.name] = node.fallback
+                continue
+            if any(dep not in values for dep in node.inputs):
+                continue
+            try:
+                value = node.compute(context, values)
+            except Exception as e:
+                logger.error(f"Error computing feature '{node.name}': {e}")
+                continue
+            if value is not SKIP:
+                values[node.name] = value
+
+        return {name: values[name] for name in columns if name in values}
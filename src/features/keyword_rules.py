@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+📊 File: keyword_rules.py
+🎯 Purpose: Declarative keyword rules and a compiled matcher for Gemini-derived features
+📚 Concepts: Rule Tables, Regex Alternation, Single-Pass Text Scanning
+🔗 Related: src/features/modular_feature_system.py, src/features/extraction_context.py
+
+📖 Educational Notes:
+- Gemini features are mostly "does this field mention X?" checks
+- Instead of one `'x' in text.lower()` per feature, every keyword of a section is
+  compiled into one regex alternation and the section is scanned once
+- A zero-width lookahead at every position keeps exact substring semantics,
+  including overlapping keywords ('high' inside 'high quality')
+- Adding a feature rule is one line in GEMINI_KEYWORD_RULES
+
+🚀 Usage:
+from src.features.keyword_rules import GEMINI_KEYWORD_MATCHER
+hits = GEMINI_KEYWORD_MATCHER.scan(gemini_analysis)
+'hook_effective' in hits
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+import re
+
+# Séparateur entre champs d'une section : ne peut apparaître dans aucun mot-clé
+_SEPARATOR = '\x00'
+
+
+@dataclass(frozen=True)
+class KeywordRule:
+    """Règle « le texte mentionne un des mots-clés ».
+
+    Attributes:
+        name: Identifiant de la règle, renvoyé dans les hits
+        section: Section de l'analyse Gemini (visual_analysis, ...)
+        keywords: Mots-clés en minuscules (un seul suffit)
+        field: Champ de la section ; None pour toute la section (str(section),
+            y compris quand Gemini renvoie la section en texte brut)
+    """
+    name: str
+    section: str
+    keywords: Tuple[str, ...]
+    field: Optional[str] = None
+
+
+class _SectionMatcher:
+    """Matcher compilé pour une section : une regex, un seul passage."""
+
+    def __init__(self, rules: Sequence[KeywordRule]):
+        self.rules = list(rules)
+        self.fields = sorted({rule.field for rule in self.rules if rule.field})
+        self.scan_whole_section = any(rule.field is None for rule in self.rules)
+        # Index du segment scanné par chaque règle (le texte complet en dernier)
+        self.rule_segments = [
+            self.fields.index(rule.field) if rule.field else len(self.fields)
+            for rule in self.rules
+        ]
+
+        keywords = sorted({kw for rule in self.rules for kw in rule.keywords},
+                          key=lambda kw: (-len(kw), kw))
+        # Lookahead : une correspondance possible à chaque position du texte
+        self.pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(kw) for kw in keywords) + '))')
+        # Le plus long mot-clé trouvé à une position implique ses préfixes
+        self.implied = {
+            kw: {other for other in keywords if kw.startswith(other)}
+            for kw in keywords
+        }
+
+    def scan(self, section: Any) -> Set[str]:
+        # Section non structurée (texte, liste) : aucun champ, mais les règles
+        # "section entière" scannent str(section) comme le code d'origine
+        fields = section if isinstance(section, dict) else {}
+        segments = []
+        for field in self.fields:
+            value = fields.get(field, '')
+            segments.append(value.lower() if isinstance(value, str) else '')
+        if self.scan_whole_section:
+            segments.append(str(section).lower())
+
+        starts = []
+        offset = 0
+        for segment in segments:
+            starts.append(offset)
+            offset += len(segment) + len(_SEPARATOR)
+        text = _SEPARATOR.join(segments)
+
+        # (index de segment, mot-clé) présents dans le texte
+        found: Set[Tuple[int, str]] = set()
+        for match in self.pattern.finditer(text):
+            segment_index = bisect_right(starts, match.start()) - 1
+            for keyword in self.implied[match.group(1)]:
+                found.add((segment_index, keyword))
+
+        return {
+            rule.name
+            for rule, index in zip(self.rules, self.rule_segments)
+            if any((index, kw) in found for kw in rule.keywords)
+        }
+
+
+class KeywordMatcher:
+    """Ensemble de règles compilées, une regex par section Gemini."""
+
+    def __init__(self, rules: Sequence[KeywordRule]):
+        names = [rule.name for rule in rules]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate keyword rule names: {sorted(duplicates)}")
+
+        by_section: Dict[str, List[KeywordRule]] = {}
+        for rule in rules:
+            by_section.setdefault(rule.section, []).append(rule)
+        self.sections = {section: _SectionMatcher(section_rules)
+                         for section, section_rules in by_section.items()}
+
+    def scan(self, gemini_analysis: Optional[Dict]) -> FrozenSet[str]:
+        """Renvoie les noms de toutes les règles vérifiées par l'analyse."""
+        if not gemini_analysis:
+            return frozenset()
+
+        hits: Set[str] = set()
+        for section_name, matcher in self.sections.items():
+            hits |= matcher.scan(gemini_analysis.get(section_name, {}))
+        return frozenset(hits)
+
+
+def _rule(name: str, section: str, field: Optional[str], *keywords: str) -> KeywordRule:
+    return KeywordRule(name=name, section=section, keywords=keywords, field=field)
+
+
+# Table de règles des features dérivées de Gemini
+GEMINI_KEYWORD_RULES = [
+    # visual_analysis (gemini_basic, visual_granular, comprehensive)
+    _rule('text_overlays_mentioned', 'visual_analysis', 'text_overlays', 'text overlays'),
+    _rule('transitions_mentioned', 'visual_analysis', 'transitions', 'transitions'),
+    _rule('transitions_creative', 'visual_analysis', 'transitions', 'smooth', 'creative'),
+    _rule('style_high_quality', 'visual_analysis', 'style_quality', 'high quality'),
+    _rule('multiple_people', 'visual_analysis', 'human_presence', 'multiple people'),
+    _rule('two_people', 'visual_analysis', 'human_presence', 'two people'),
+    _rule('person_present', 'visual_analysis', 'human_presence', 'person', 'human'),
+    _rule('eye_contact', 'visual_analysis', 'human_presence', 'eye contact'),
+    _rule('shot_close_up', 'visual_analysis', 'shot_type', 'close-up'),
+    _rule('shot_medium', 'visual_analysis', 'shot_type', 'medium'),
+    _rule('shot_wide', 'visual_analysis', 'shot_type', 'wide'),
+    _rule('colors_vibrant', 'visual_analysis', 'color_analysis', 'vibrant', 'saturated'),
+    _rule('colors_bright', 'visual_analysis', 'color_analysis', 'bright'),
+    _rule('colors_muted', 'visual_analysis', 'color_analysis', 'muted', 'dull'),
+
+    # content_structure
+    _rule('hook_effective', 'content_structure', 'hook_effectiveness', 'effective'),
+    _rule('story_mentioned', 'content_structure', 'story_flow', 'story'),
+    _rule('story_original', 'content_structure', 'story_flow', 'unique', 'creative'),
+    _rule('story_linear', 'content_structure', 'story_flow', 'linear'),
+    _rule('story_circular', 'content_structure', 'story_flow', 'circular'),
+    _rule('call_to_action_mentioned', 'content_structure', 'call_to_action', 'call to action'),
+
+    # engagement_factors
+    _rule('viral_potential_high', 'engagement_factors', 'viral_potential', 'high'),
+    _rule('audience_connection_strong', 'engagement_factors', 'audience_connection', 'strong'),
+
+    # technical_elements
+    _rule('length_appropriate', 'technical_elements', 'length_optimization', 'appropriate'),
+    _rule('sound_high_quality', 'technical_elements', 'sound_design', 'high quality'),
+    _rule('production_high', 'technical_elements', 'production_quality', 'high'),
+
+    # trend_alignment
+    _rule('trends_perfectly_aligned', 'trend_alignment', 'current_trends', 'perfectly'),
+
+    # Section entière (model_compatible)
+    _rule('section_visual_high_quality', 'visual_analysis', None, 'high quality'),
+    _rule('section_visual_color', 'visual_analysis', None, 'color'),
+    _rule('section_content_hook', 'content_structure', None, 'hook'),
+    _rule('section_engagement_viral', 'engagement_factors', None, 'viral'),
+    _rule('section_engagement_emotional', 'engagement_factors', None, 'emotional'),
+    _rule('section_engagement_connection', 'engagement_factors', None, 'connection'),
+    _rule('section_technical_sound', 'technical_elements', None, 'sound'),
+    _rule('section_technical_quality', 'technical_elements', None, 'quality'),
+    _rule('section_trend_trend', 'trend_alignment', None, 'trend'),
+]
+
+GEMINI_KEYWORD_MATCHER = KeywordMatcher(GEMINI_KEYWORD_RULES)
@@ -15,6 +15,8 @@
 from src.features.modular_feature_system import create_feature_extractor
 extractor = create_feature_extractor('comprehensive')
 features = extractor.extract_features(video_data, gemini_analysis)
+features_df = extractor.extract_features_batch(videos, analyses)  # columnar, whole dataset
+features = extractor.extract_features(video_data, gemini_analysis, columns=['duration', 'has_hook'])
 
 📈 Architecture Benefits:
 - Modularity: Easy to add/remove feature sets
@@ -40,15 +42,61 @@ features = extractor.extract_features(video_data, gemini_analysis)
 from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Any, Tuple, Union
 import logging
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
+import hashlib
+import inspect
+import math
 import re
 
+from . import extraction_context, keyword_rules, timestamps, video_batch
+from .extraction_context import ExtractionContext
+from .feature_cache import CacheKey, FeatureCache
+from .feature_graph import FeatureNode, FeaturePlanner, SKIP
+from .video_batch import VideoBatch, frame_records, safe_ratio, int_or_nan
+
 logger = logging.getLogger(__name__)
 
+# Modules partagés dont dépend la sortie de tous les feature sets (règles de
+# mots-clés, champs du contexte, décomposition des dates, vues colonnaires)
+_SHARED_EXTRACTION_MODULES = (extraction_context, keyword_rules, timestamps, video_batch)
+
+
+@lru_cache(maxsize=None)
+def _shared_sources_digest() -> str:
+    digest = hashlib.sha256()
+    for module in _SHARED_EXTRACTION_MODULES:
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def feature_set_version(feature_set_class: type) -> str:
+    """Version d'un feature set dérivée du code qui produit ses features.
+
+    Empreinte du source de la classe et de ses parents jusqu'à BaseFeatureSet,
+    plus les modules partagés : toute modification des règles change la
+    version et invalide les entrées du cache de features, sans bump manuel.
+    """
+    digest = hashlib.sha256(_shared_sources_digest().encode())
+    for klass in feature_set_class.__mro__:
+        if klass is ABC or klass is object:
+            continue
+        try:
+            source = inspect.getsource(klass)
+        except (OSError, TypeError):
+            # Classe sans source (définie dans un notebook, code compilé seul)
+            logger.debug("Source indisponible pour %s, version par nom", klass.__qualname__)
+            source = f"{klass.__module__}.{klass.__qualname__}"
+        digest.update(source.encode())
+    return digest.hexdigest()[:16]
+
 
 class FeatureCategory(Enum):
     """Catégories de features."""
@@ -78,6 +126,9 @@ class FeatureDefinition:
 class BaseFeatureSet(ABC):
     """Classe de base pour tous les feature sets."""
 
+    # True si toutes les features du set proviennent de l'analyse Gemini
+    requires_gemini = False
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -88,6 +139,45 @@ class BaseFeatureSet(ABC):
         """Extrait les features selon ce feature set."""
         pass
 
+    @property
+    def version(self) -> str:
+        """Version du code d'extraction, clé du cache de features.
+
+        Dérivée du source du set et des règles partagées (voir
+        `feature_set_version`) : pas de numéro à incrémenter à la main.
+        """
+        return feature_set_version(type(self))
+
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait les features depuis un contexte partagé entre feature sets.
+
+        Par défaut délègue à `extract` ; les feature sets intégrés surchargent
+        cette méthode pour réutiliser les champs déjà analysés du contexte.
+        """
+        return self.extract(context.video_data, context.gemini_analysis)
+
+    def extract_batch(self, batch: VideoBatch) -> pd.DataFrame:
+        """Extrait les features d'un batch de vidéos sous forme colonnaire.
+
+        Implémentation par défaut ligne par ligne ; les feature sets dont les
+        règles se vectorisent surchargent cette méthode.
+        """
+        rows = [context.run(self) for context in batch.contexts]
+        return pd.DataFrame(rows, index=range(len(batch)))
+
+    def feature_nodes(self) -> List[FeatureNode]:
+        """Nœuds du graphe de features (voir feature_graph.py).
+
+        Par défaut chaque feature lit le résultat mémorisé du set entier ; les
+        feature sets qui déclarent leurs features une à une surchargent cette
+        méthode pour que le planner ne calcule que les colonnes demandées.
+        """
+        def from_set(name):
+            return lambda context, values: context.run(self).get(name, SKIP)
+
+        return [FeatureNode(name, from_set(name), requires_gemini=self.requires_gemini)
+                for name in self.features]
+
     def get_feature_names(self) -> List[str]:
         """Retourne la liste des noms de features de ce set."""
         return self.features
@@ -112,66 +202,121 @@ class MetadataFeatureSet(BaseFeatureSet):
             'hashtags', 'hashtag_count', 'music_info',
             'hour_of_day', 'day_of_week', 'month', 'is_weekend', 'is_business_hours'
         ]
+        self._planner = FeaturePlanner(self.feature_nodes())
 
     def extract(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
         """Extrait les features métadonnées (logique existante du Data Processor)."""
-        features = {}
+        return ExtractionContext(video_data, gemini_analysis).run(self)
+
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait les features métadonnées depuis le contexte partagé."""
+        return self._planner.evaluate(context, self.features)
+
+    def feature_nodes(self) -> List[FeatureNode]:
+        """Features métadonnées déclarées une à une avec leurs dépendances."""
+        def field(key, default=0):
+            return lambda context, values: context.video_data.get(key, default)
+
+        def rate(name, *counts):
+            def compute(context, values):
+                views = values['view_count']
+                if views > 0:
+                    return sum(values[count] for count in counts) / views
+                return 0
+            return FeatureNode(name, compute, inputs=counts + ('view_count',))
+
+        def timed(attribute):
+            def compute(context, values):
+                post_time = context.post_time
+                return getattr(post_time, attribute) if post_time else SKIP
+            return compute
+
+        def music_info(context, values):
+            music_meta = context.video_data.get('musicMeta', {})
+            return f"{music_meta.get('musicAuthor', '')} - {music_meta.get('musicName', '')}"
+
+        return [
+            # Métriques de base
+            FeatureNode('video_id', field('id', '')),
+            FeatureNode('title', lambda context, values: context.text),
+            FeatureNode('description', lambda context, values: context.text),
+            FeatureNode('duration', lambda context, values: context.duration),
+
+            # Métriques d'engagement
+            FeatureNode('view_count', field('playCount')),
+            FeatureNode('like_count', field('diggCount')),
+            FeatureNode('comment_count', field('commentCount')),
+            FeatureNode('share_count', field('shareCount')),
+
+            # Calcul des ratios d'engagement
+            rate('like_rate', 'like_count'),
+            rate('comment_rate', 'comment_count'),
+            rate('share_rate', 'share_count'),
+            rate('engagement_rate', 'like_count', 'comment_count', 'share_count'),
+
+            # Hashtags
+            FeatureNode('hashtags', lambda context, values: ','.join(context.hashtags)),
+            FeatureNode('hashtag_count', lambda context, values: len(context.hashtags)),
+
+            # Musique
+            FeatureNode('music_info', music_info),
+
+            # Features temporelles (absentes sans date de publication)
+            FeatureNode('hour_of_day', timed('hour')),
+            FeatureNode('day_of_week', timed('weekday')),
+            FeatureNode('month', timed('month')),
+            FeatureNode('is_weekend', timed('is_weekend')),
+            FeatureNode('is_business_hours', timed('is_business_hours')),
+        ]
 
-        # Métriques de base
-        features['video_id'] = video_data.get('id', '')
-        features['title'] = video_data.get('text', '')
-        features['description'] = video_data.get('text', '')
-        features['duration'] = video_data.get(
-            'videoMeta', {}).get('duration', 0)
-
-        # Métriques d'engagement
-        features['view_count'] = video_data.get('playCount', 0)
-        features['like_count'] = video_data.get('diggCount', 0)
-        features['comment_count'] = video_data.get('commentCount', 0)
-        features['share_count'] = video_data.get('shareCount', 0)
-
-        # Calcul des ratios d'engagement
-        if features['view_count'] > 0:
-            features['like_rate'] = features['like_count'] / \
-                features['view_count']
-            features['comment_rate'] = features['comment_count'] / \
-                features['view_count']
-            features['share_rate'] = features['share_count'] / \
-                features['view_count']
-            features['engagement_rate'] = (
-                features['like_count'] + features['comment_count'] + features['share_count']) / features['view_count']
-        else:
-            features['like_rate'] = 0
-            features['comment_rate'] = 0
-            features['share_rate'] = 0
-            features['engagement_rate'] = 0
-
-        # Hashtags
-        hashtags = [tag['name'] for tag in video_data.get('hashtags', [])]
-        features['hashtags'] = ','.join(hashtags)
-        features['hashtag_count'] = len(hashtags)
-
-        # Musique
-        music_meta = video_data.get('musicMeta', {})
-        features['music_info'] = f"{music_meta.get('musicAuthor', '')} - {music_meta.get('musicName', '')}"
-
-        # Features temporelles
-        post_time = video_data.get('createTimeISO', '')
-        if post_time:
-            import pandas as pd
-            post_time = pd.to_datetime(post_time)
-            features['hour_of_day'] = post_time.hour
-            features['day_of_week'] = post_time.dayofweek
-            features['month'] = post_time.month
-            features['is_weekend'] = post_time.dayofweek >= 5
-            features['is_business_hours'] = 9 <= post_time.hour <= 17
+    def extract_batch(self, batch: VideoBatch) -> pd.DataFrame:
+        """Extrait les features métadonnées de tout le batch en une passe vectorisée."""
+        views = batch.numeric('playCount')
+        likes = batch.numeric('diggCount')
+        comments = batch.numeric('commentCount')
+        shares = batch.numeric('shareCount')
+        texts = batch.raw('text', '')
+        music = batch.raw('musicMeta', {})
+
+        columns = {
+            'video_id': batch.raw('id', ''),
+            'title': texts,
+            'description': texts,
+            'duration': batch.duration,
+            'view_count': views,
+            'like_count': likes,
+            'comment_count': comments,
+            'share_count': shares,
+            'like_rate': safe_ratio(likes, views),
+            'comment_rate': safe_ratio(comments, views),
+            'share_rate': safe_ratio(shares, views),
+            'engagement_rate': safe_ratio(likes + comments + shares, views),
+            'hashtags': [','.join(tags) for tags in batch.hashtags],
+            'hashtag_count': batch.hashtag_count,
+            'music_info': [f"{(m or {}).get('musicAuthor', '')} - {(m or {}).get('musicName', '')}"
+                           for m in music],
+        }
 
-        return features
+        times = batch.create_time
+        if times['present'].any():
+            present = times['present'].to_numpy()
+            hour = times['hour'].to_numpy()
+            weekday = times['weekday'].to_numpy()
+            columns['hour_of_day'] = int_or_nan(hour, present)
+            columns['day_of_week'] = int_or_nan(weekday, present)
+            columns['month'] = int_or_nan(times['month'].to_numpy(), present)
+            columns['is_weekend'] = pd.Series(weekday >= 5).where(present)
+            columns['is_business_hours'] = pd.Series(
+                (hour >= 9) & (hour <= 17)).where(present)
+
+        return pd.DataFrame(columns, index=range(len(batch)))
 
 
 class GeminiBasicFeatureSet(BaseFeatureSet):
     """Feature set pour les features Gemini de base (features existantes)."""
 
+    requires_gemini = True
+
     def __init__(self):
         super().__init__(
             name="gemini_basic",
@@ -187,54 +332,46 @@ class GeminiBasicFeatureSet(BaseFeatureSet):
 
     def extract(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
         """Extrait les features Gemini de base (logique existante du Data Processor)."""
+        return ExtractionContext(video_data, gemini_analysis).run(self)
+
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait les features Gemini de base depuis le contexte partagé."""
         features = {}
 
-        if not gemini_analysis:
+        if not context.has_gemini:
             logger.warning(
                 "No Gemini analysis provided for gemini_basic feature set")
             return features
 
+        hit = context.matches
+
         try:
             # Visual Analysis Features
-            visual = gemini_analysis.get('visual_analysis', {})
-            features['has_text_overlays'] = 'text overlays' in visual.get(
-                'text_overlays', '').lower()
-            features['has_transitions'] = 'transitions' in visual.get(
-                'transitions', '').lower()
-            features['visual_quality_score'] = 1.0 if 'high quality' in visual.get(
-                'style_quality', '').lower() else 0.5
+            features['has_text_overlays'] = hit('text_overlays_mentioned')
+            features['has_transitions'] = hit('transitions_mentioned')
+            features['visual_quality_score'] = 1.0 if hit('style_high_quality') else 0.5
 
             # Content Structure Features
-            content = gemini_analysis.get('content_structure', {})
-            features['has_hook'] = 1.0 if 'effective' in content.get(
-                'hook_effectiveness', '').lower() else 0.5
-            features['has_story'] = 'story' in content.get(
-                'story_flow', '').lower()
-            features['has_call_to_action'] = 'call to action' in content.get(
-                'call_to_action', '').lower()
+            features['has_hook'] = 1.0 if hit('hook_effective') else 0.5
+            features['has_story'] = hit('story_mentioned')
+            features['has_call_to_action'] = hit('call_to_action_mentioned')
 
             # Engagement Features
-            engagement = gemini_analysis.get('engagement_factors', {})
-            features['viral_potential_score'] = 1.0 if 'high' in engagement.get(
-                'viral_potential', '').lower() else 0.5
+            engagement = context.gemini_section('engagement_factors')
+            features['viral_potential_score'] = 1.0 if hit('viral_potential_high') else 0.5
             features['emotional_trigger_count'] = len(
                 engagement.get('emotional_triggers', '').split(','))
-            features['audience_connection_score'] = 1.0 if 'strong' in engagement.get(
-                'audience_connection', '').lower() else 0.5
+            features['audience_connection_score'] = 1.0 if hit(
+                'audience_connection_strong') else 0.5
 
             # Technical Features
-            technical = gemini_analysis.get('technical_elements', {})
-            features['length_optimized'] = 'appropriate' in technical.get(
-                'length_optimization', '').lower()
-            features['sound_quality_score'] = 1.0 if 'high quality' in technical.get(
-                'sound_design', '').lower() else 0.5
-            features['production_quality_score'] = 1.0 if 'high' in technical.get(
-                'production_quality', '').lower() else 0.5
+            features['length_optimized'] = hit('length_appropriate')
+            features['sound_quality_score'] = 1.0 if hit('sound_high_quality') else 0.5
+            features['production_quality_score'] = 1.0 if hit('production_high') else 0.5
 
             # Trend Features
-            trends = gemini_analysis.get('trend_alignment', {})
-            features['trend_alignment_score'] = 1.0 if 'perfectly' in trends.get(
-                'current_trends', '').lower() else 0.5
+            trends = context.gemini_section('trend_alignment')
+            features['trend_alignment_score'] = 1.0 if hit('trends_perfectly_aligned') else 0.5
             features['estimated_hashtag_count'] = len(
                 trends.get('hashtag_potential', '').split('#')) - 1
 
@@ -247,6 +384,8 @@ class GeminiBasicFeatureSet(BaseFeatureSet):
 class VisualGranularFeatureSet(BaseFeatureSet):
     """Feature set pour les features visuelles granulaires (nouvelles)."""
 
+    requires_gemini = True
+
     def __init__(self):
         super().__init__(
             name="visual_granular",
@@ -260,48 +399,49 @@ class VisualGranularFeatureSet(BaseFeatureSet):
 
     def extract(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
         """Extrait les features visuelles granulaires."""
+        return ExtractionContext(video_data, gemini_analysis).run(self)
+
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait les features visuelles granulaires depuis le contexte partagé."""
         features = {}
 
-        if not gemini_analysis:
+        if not context.has_gemini:
             logger.warning(
                 "No Gemini analysis provided for visual_granular feature set")
             return features
 
-        try:
-            visual_analysis = gemini_analysis.get('visual_analysis', {})
+        hit = context.matches
 
+        try:
             # Analyse de présence humaine
-            human_text = visual_analysis.get('human_presence', '')
-            if 'multiple people' in human_text.lower():
+            if hit('multiple_people'):
                 features['human_count'] = 3
-            elif 'two people' in human_text.lower():
+            elif hit('two_people'):
                 features['human_count'] = 2
-            elif 'person' in human_text.lower() or 'human' in human_text.lower():
+            elif hit('person_present'):
                 features['human_count'] = 1
             else:
                 features['human_count'] = 0
 
             # Contact visuel
-            features['eye_contact_with_camera'] = 'eye contact' in human_text.lower()
+            features['eye_contact_with_camera'] = hit('eye_contact')
 
             # Type de plan
-            shot_text = visual_analysis.get('shot_type', '')
-            if 'close-up' in shot_text.lower():
+            if hit('shot_close_up'):
                 features['shot_type'] = 'close_up'
-            elif 'medium' in shot_text.lower():
+            elif hit('shot_medium'):
                 features['shot_type'] = 'medium'
-            elif 'wide' in shot_text.lower():
+            elif hit('shot_wide'):
                 features['shot_type'] = 'wide'
             else:
                 features['shot_type'] = 'unknown'
 
             # Score de saturation des couleurs
-            color_text = visual_analysis.get('color_analysis', '')
-            if 'vibrant' in color_text.lower() or 'saturated' in color_text.lower():
+            if hit('colors_vibrant'):
                 features['color_vibrancy_score'] = 0.8
-            elif 'bright' in color_text.lower():
+            elif hit('colors_bright'):
                 features['color_vibrancy_score'] = 0.6
-            elif 'muted' in color_text.lower() or 'dull' in color_text.lower():
+            elif hit('colors_muted'):
                 features['color_vibrancy_score'] = 0.3
             else:
                 features['color_vibrancy_score'] = 0.5
@@ -344,41 +484,42 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
             'meme_potential', 'challenge_potential', 'completion_rate_prediction', 'virality_velocity', 'user_experience_score'
         ]
 
+        # Feature sets réutilisés (résultats mémorisés dans le contexte)
+        self._metadata_set = MetadataFeatureSet()
+        self._gemini_set = GeminiBasicFeatureSet()
+        self._visual_set = VisualGranularFeatureSet()
+
     def extract(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
         """Extrait toutes les 34 features complètes."""
-        features = {}
+        return ExtractionContext(video_data, gemini_analysis).run(self)
 
-        # Utiliser les feature sets existants
-        metadata_set = MetadataFeatureSet()
-        gemini_set = GeminiBasicFeatureSet()
-        visual_set = VisualGranularFeatureSet()
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait toutes les features en réutilisant les résultats du contexte."""
+        features = {}
 
-        # Combiner toutes les features
-        features.update(metadata_set.extract(video_data, gemini_analysis))
-        features.update(gemini_set.extract(video_data, gemini_analysis))
-        features.update(visual_set.extract(video_data, gemini_analysis))
+        # Combiner les feature sets existants (calculés une seule fois par vidéo)
+        features.update(context.run(self._metadata_set))
+        features.update(context.run(self._gemini_set))
+        features.update(context.run(self._visual_set))
 
         # Ajouter les features avancées (placeholders)
-        features.update(self._extract_advanced_features(
-            video_data, gemini_analysis))
+        features.update(self._extract_advanced_features(context))
 
         return features
 
-    def _extract_advanced_features(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
+    def _extract_advanced_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features avancées avec logique intelligente du comprehensive extractor."""
         features = {}
 
         try:
             # Phase 1: Enhanced features (calculées intelligemment)
-            features.update(self._extract_enhanced_phase1_features(video_data))
+            features.update(self._extract_enhanced_phase1_features(context))
 
             # Phase 2: Advanced features (avec logique intelligente)
-            features.update(self._extract_advanced_phase2_features(
-                video_data, gemini_analysis))
+            features.update(self._extract_advanced_phase2_features(context))
 
             # Phase 3: Innovation features (avec logique intelligente)
-            features.update(self._extract_innovation_phase3_features(
-                video_data, gemini_analysis))
+            features.update(self._extract_innovation_phase3_features(context))
 
         except Exception as e:
             logger.error(f"Error extracting advanced features: {e}")
@@ -389,12 +530,12 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 
         return features
 
-    def _extract_enhanced_phase1_features(self, video_data: Dict) -> Dict:
+    def _extract_enhanced_phase1_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features Phase 1 améliorées avec logique intelligente."""
         features = {}
 
         # Video duration optimization - based on TikTok best practices
-        duration = video_data.get('videoMeta', {}).get('duration', 0)
+        duration = context.duration
         if duration <= 15:
             # Good for quick engagement
             features['video_duration_optimized'] = 0.8
@@ -406,7 +547,7 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
             features['video_duration_optimized'] = 0.3  # Too long for TikTok
 
         # Hashtag effectiveness - based on research
-        hashtag_count = len(video_data.get('hashtags', []))
+        hashtag_count = len(context.hashtags)
         if 3 <= hashtag_count <= 5:
             features['hashtag_effectiveness_score'] = 1.0  # Optimal range
         elif 1 <= hashtag_count <= 7:
@@ -419,10 +560,8 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
         features['music_trend_alignment'] = 0.5
 
         # Publish timing score - based on hour of day
-        post_time = video_data.get('createTimeISO', '')
+        post_time = context.post_time
         if post_time:
-            import pandas as pd
-            post_time = pd.to_datetime(post_time)
             hour = post_time.hour
             # Peak hours: 7-9 AM, 12-2 PM, 7-9 PM
             if (7 <= hour <= 9) or (12 <= hour <= 14) or (19 <= hour <= 21):
@@ -449,15 +588,14 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
         features['trending_moment_alignment'] = 0.5
 
         # Competition level - based on hashtag popularity
-        hashtags = [tag['name'].lower()
-                    for tag in video_data.get('hashtags', [])]
+        hashtags = context.hashtags_lower
         popular_hashtags = ['fyp', 'foryou', 'viral', 'trending', 'tiktok']
         popular_count = sum(1 for tag in hashtags if tag in popular_hashtags)
         features['competition_level'] = min(popular_count * 0.2, 1.0)
 
         return features
 
-    def _extract_advanced_phase2_features(self, video_data: Dict, gemini_analysis: Optional[Dict]) -> Dict:
+    def _extract_advanced_phase2_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features Phase 2 avancées avec logique intelligente."""
         features = {}
 
@@ -472,99 +610,82 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
         features['color_palette_type'] = 'vibrant'
 
         # Psychological features - based on content analysis
-        features.update(self._extract_psychological_features(
-            video_data, gemini_analysis))
+        features.update(self._extract_psychological_features(context))
 
         # Creativity features - based on content structure
-        features.update(self._extract_creativity_features(
-            video_data, gemini_analysis))
+        features.update(self._extract_creativity_features(context))
 
         return features
 
-    def _extract_innovation_phase3_features(self, video_data: Dict, gemini_analysis: Optional[Dict]) -> Dict:
+    def _extract_innovation_phase3_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features Phase 3 d'innovation avec logique intelligente."""
         features = {}
 
         # Cultural context features
-        features.update(self._extract_cultural_context_features(video_data))
+        features.update(self._extract_cultural_context_features(context))
 
         # Virality potential features
-        features.update(self._extract_virality_potential_features(
-            video_data, gemini_analysis))
+        features.update(self._extract_virality_potential_features(context))
 
         # Performance features
-        features.update(self._extract_performance_features(video_data))
+        features.update(self._extract_performance_features(context))
 
         return features
 
-    def _extract_psychological_features(self, video_data: Dict, gemini_analysis: Optional[Dict]) -> Dict:
+    def _extract_psychological_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features psychologiques basées sur l'analyse du contenu."""
         features = {}
 
         # Attention grab strength - based on hook presence and visual impact
-        hook_present = gemini_analysis.get('content_structure', {}).get(
-            'hook_effectiveness', '').lower() if gemini_analysis else ''
-        visual_quality = gemini_analysis.get('visual_analysis', {}).get(
-            'style_quality', '').lower() if gemini_analysis else ''
-
         attention_score = 0.5  # Base score
-        if 'effective' in hook_present:
+        if context.matches('hook_effective'):
             attention_score += 0.3
-        if 'high quality' in visual_quality:
+        if context.matches('style_high_quality'):
             attention_score += 0.2
         features['attention_grab_strength'] = min(attention_score, 1.0)
 
         # Emotional hook strength - based on emotional triggers
-        emotional_triggers = gemini_analysis.get('engagement_factors', {}).get(
-            'emotional_triggers', '') if gemini_analysis else ''
+        emotional_triggers = context.gemini_section(
+            'engagement_factors').get('emotional_triggers', '')
         trigger_count = len([t for t in emotional_triggers.split(
             ',') if t.strip()]) if emotional_triggers else 0
         features['emotional_hook_strength'] = min(
             0.3 + (trigger_count * 0.2), 1.0)
 
         # Relatability score - based on content type and audience connection
-        audience_connection = gemini_analysis.get('engagement_factors', {}).get(
-            'audience_connection', '').lower() if gemini_analysis else ''
-        features['relatability_score'] = 0.8 if 'strong' in audience_connection else 0.5
+        features['relatability_score'] = 0.8 if context.matches(
+            'audience_connection_strong') else 0.5
 
         return features
 
-    def _extract_creativity_features(self, video_data: Dict, gemini_analysis: Optional[Dict]) -> Dict:
+    def _extract_creativity_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features de créativité basées sur la structure du contenu."""
         features = {}
 
         # Originality score - based on content uniqueness
-        content_structure = gemini_analysis.get(
-            'content_structure', {}) if gemini_analysis else {}
-        story_flow = content_structure.get('story_flow', '').lower()
-        transitions = gemini_analysis.get('visual_analysis', {}).get(
-            'transitions', '').lower() if gemini_analysis else ''
-
         originality_score = 0.5  # Base score
-        if 'unique' in story_flow or 'creative' in story_flow:
+        if context.matches('story_original'):
             originality_score += 0.3
-        if 'smooth' in transitions or 'creative' in transitions:
+        if context.matches('transitions_creative'):
             originality_score += 0.2
         features['originality_score'] = min(originality_score, 1.0)
 
         # Creative technique count - count of creative elements
         creative_elements = 0
-        if gemini_analysis:
-            if 'transitions' in gemini_analysis.get('visual_analysis', {}):
+        if context.has_gemini:
+            if 'transitions' in context.gemini_section('visual_analysis'):
                 creative_elements += 1
-            if 'text_overlays' in gemini_analysis.get('visual_analysis', {}):
+            if 'text_overlays' in context.gemini_section('visual_analysis'):
                 creative_elements += 1
-            if 'call_to_action' in gemini_analysis.get('content_structure', {}):
+            if 'call_to_action' in context.gemini_section('content_structure'):
                 creative_elements += 1
         features['creative_technique_count'] = creative_elements
 
         # Story structure type - categorize narrative structure
-        if gemini_analysis:
-            story_flow = gemini_analysis.get(
-                'content_structure', {}).get('story_flow', '').lower()
-            if 'linear' in story_flow:
+        if context.has_gemini:
+            if context.matches('story_linear'):
                 features['story_structure_type'] = 'linear'
-            elif 'circular' in story_flow:
+            elif context.matches('story_circular'):
                 features['story_structure_type'] = 'circular'
             else:
                 features['story_structure_type'] = 'linear'  # Default
@@ -573,13 +694,12 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 
         return features
 
-    def _extract_cultural_context_features(self, video_data: Dict) -> Dict:
+    def _extract_cultural_context_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features de contexte culturel basées sur le contenu et le timing."""
         features = {}
 
         # Cultural relevance score - based on hashtags and content
-        hashtags = [tag['name'].lower()
-                    for tag in video_data.get('hashtags', [])]
+        hashtags = context.hashtags_lower
         cultural_keywords = ['trend', 'viral', 'fyp', 'foryou', 'tiktok']
         cultural_matches = sum(1 for tag in hashtags if any(
             keyword in tag for keyword in cultural_keywords))
@@ -588,7 +708,7 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 
         # Generational appeal - based on content characteristics
         # Simple heuristic: shorter videos tend to appeal more to Gen Z
-        duration = video_data.get('videoMeta', {}).get('duration', 60)
+        duration = context.video_meta.get('duration', 60)
         if duration <= 15:
             features['generational_appeal'] = 'Gen Z'
         elif duration <= 30:
@@ -601,17 +721,16 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 
         return features
 
-    def _extract_virality_potential_features(self, video_data: Dict, gemini_analysis: Optional[Dict]) -> Dict:
+    def _extract_virality_potential_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features de potentiel viral basées sur les caractéristiques du contenu."""
         features = {}
 
         # Shareability score - based on content characteristics
-        viral_potential = gemini_analysis.get('engagement_factors', {}).get(
-            'viral_potential', '').lower() if gemini_analysis else ''
-        features['shareability_score'] = 0.8 if 'high' in viral_potential else 0.5
+        features['shareability_score'] = 0.8 if context.matches(
+            'viral_potential_high') else 0.5
 
         # Meme potential - based on content type and structure
-        content_type = video_data.get('text', '').lower()
+        content_type = context.text_lower
         meme_keywords = ['meme', 'funny', 'lol', 'haha', '😂', '🤣']
         meme_matches = sum(
             1 for keyword in meme_keywords if keyword in content_type)
@@ -625,12 +744,12 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 
         return features
 
-    def _extract_performance_features(self, video_data: Dict) -> Dict:
+    def _extract_performance_features(self, context: ExtractionContext) -> Dict:
         """Extrait les features de performance basées sur le contenu et les métadonnées."""
         features = {}
 
         # Completion rate prediction - based on video length and engagement
-        duration = video_data.get('videoMeta', {}).get('duration', 60)
+        duration = context.video_meta.get('duration', 60)
         # Shorter videos tend to have higher completion rates
         if duration <= 15:
             features['completion_rate_prediction'] = 0.8
@@ -655,6 +774,20 @@ class ComprehensiveFeatureSet(BaseFeatureSet):
 class ModelCompatibleFeatureSet(BaseFeatureSet):
     """Feature set compatible avec le modèle ML (exactement 16 features)."""
 
+    # Features Gemini : règle de mots-clés, score si trouvée, score sinon
+    # (le score "sinon" sert aussi de fallback sans analyse Gemini)
+    GEMINI_SCORES = {
+        'visual_quality_score': ('section_visual_high_quality', 0.8, 0.6),
+        'has_hook': ('section_content_hook', 1.0, 0.0),
+        'viral_potential_score': ('section_engagement_viral', 0.7, 0.5),
+        'emotional_trigger_count': ('section_engagement_emotional', 3, 1),
+        'audience_connection_score': ('section_engagement_connection', 0.7, 0.5),
+        'sound_quality_score': ('section_technical_sound', 0.8, 0.6),
+        'production_quality_score': ('section_technical_quality', 0.8, 0.6),
+        'trend_alignment_score': ('section_trend_trend', 0.6, 0.4),
+        'color_vibrancy_score': ('section_visual_color', 0.7, 0.5),
+    }
+
     def __init__(self):
         super().__init__(
             name="model_compatible",
@@ -668,97 +801,85 @@ class ModelCompatibleFeatureSet(BaseFeatureSet):
             'production_quality_score', 'trend_alignment_score', 'color_vibrancy_score',
             'video_duration_optimized'
         ]
+        self._planner = FeaturePlanner(self.feature_nodes())
 
     def extract(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
         """Extrait exactement les 16 features attendues par le modèle ML."""
-        features = {}
+        return ExtractionContext(video_data, gemini_analysis).run(self)
+
+    def extract_from_context(self, context: ExtractionContext) -> Dict:
+        """Extrait les 16 features du modèle depuis le contexte partagé."""
+        return self._planner.evaluate(context, self.features)
+
+    def feature_nodes(self) -> List[FeatureNode]:
+        """Les 16 features du modèle, déclarées une à une avec leurs dépendances."""
+        def post_time(attribute, default):
+            def compute(context, values):
+                parts = context.post_time
+                return getattr(parts, attribute) if parts else default
+            return compute
+
+        def keyword_score(rule, hit, miss):
+            return lambda context, values: hit if context.matches(rule) else miss
+
+        nodes = [
+            # 1-3. Durée et hashtags (listes de str ou de dicts)
+            FeatureNode('duration', lambda context, values: context.duration),
+            FeatureNode('hashtag_count', lambda context, values: len(context.hashtags)),
+            # Même que hashtag_count pour compatibilité
+            FeatureNode('estimated_hashtag_count',
+                        lambda context, values: values['hashtag_count'],
+                        inputs=('hashtag_count',)),
+
+            # 4-6. Features temporelles (défaut : midi, lundi, janvier)
+            FeatureNode('hour_of_day', post_time('hour', 12)),
+            FeatureNode('day_of_week', post_time('weekday', 0)),
+            FeatureNode('month', post_time('month', 1)),
+
+            # 16. video_duration_optimized
+            FeatureNode('video_duration_optimized',
+                        lambda context, values: 1.0 if 15 <= values['duration'] <= 60 else 0.0,
+                        inputs=('duration',)),
+        ]
 
-        # 1. duration
-        features['duration'] = video_data.get(
-            'videoMeta', {}).get('duration', 0)
+        # 7-15. Features Gemini (avec fallbacks)
+        for name, (rule, hit, miss) in self.GEMINI_SCORES.items():
+            nodes.append(FeatureNode(name, keyword_score(rule, hit, miss),
+                                     requires_gemini=True, fallback=miss))
+        return nodes
+
+    def _extract_gemini_features(self, context: ExtractionContext) -> Dict:
+        """Features dérivées de l'analyse Gemini, ou fallbacks sans analyse."""
+        return self._planner.evaluate(context, list(self.GEMINI_SCORES))
+
+    def extract_batch(self, batch: VideoBatch) -> pd.DataFrame:
+        """Extrait les 16 features du modèle pour tout le batch.
+
+        Les features métadonnées sont vectorisées ; seules les features Gemini
+        restent calculées par vidéo, car elles dépendent du texte d'analyse.
+        """
+        duration = batch.duration
+        times = batch.create_time
+        present = times['present'].to_numpy()
+
+        columns = {
+            'duration': duration,
+            'hashtag_count': batch.hashtag_count,
+            'estimated_hashtag_count': batch.hashtag_count,
+            'hour_of_day': np.where(present, times['hour'].to_numpy(), 12).astype(np.int64),
+            'day_of_week': np.where(present, times['weekday'].to_numpy(), 0).astype(np.int64),
+            'month': np.where(present, times['month'].to_numpy(), 1).astype(np.int64),
+        }
 
-        # 2. hashtag_count
-        hashtags = video_data.get('hashtags', [])
-        # Handle both string list and dict list formats
-        if hashtags and isinstance(hashtags[0], dict):
-            hashtags = [tag['name'] for tag in hashtags]
-        features['hashtag_count'] = len(hashtags)
+        gemini_rows = [self._extract_gemini_features(context)
+                       for context in batch.contexts]
+        for name in gemini_rows[0] if gemini_rows else []:
+            columns[name] = [row[name] for row in gemini_rows]
 
-        # 3. estimated_hashtag_count (même que hashtag_count pour compatibilité)
-        features['estimated_hashtag_count'] = features['hashtag_count']
+        columns['video_duration_optimized'] = np.where(
+            (duration >= 15) & (duration <= 60), 1.0, 0.0)
 
-        # 4-6. Features temporelles
-        post_time = video_data.get('createTimeISO', '')
-        if post_time:
-            import pandas as pd
-            post_time = pd.to_datetime(post_time)
-            features['hour_of_day'] = post_time.hour
-            features['day_of_week'] = post_time.dayofweek
-            features['month'] = post_time.month
-        else:
-            features['hour_of_day'] = 12  # Default
-            features['day_of_week'] = 0   # Monday
-            features['month'] = 1         # January
-
-        # 7-16. Features Gemini (avec fallbacks)
-        if gemini_analysis:
-            # visual_quality_score
-            visual = gemini_analysis.get('visual_analysis', {})
-            features['visual_quality_score'] = 0.8 if 'high quality' in str(
-                visual).lower() else 0.6
-
-            # has_hook
-            content = gemini_analysis.get('content_structure', {})
-            features['has_hook'] = 1.0 if 'hook' in str(
-                content).lower() else 0.0
-
-            # viral_potential_score
-            engagement = gemini_analysis.get('engagement_factors', {})
-            features['viral_potential_score'] = 0.7 if 'viral' in str(
-                engagement).lower() else 0.5
-
-            # emotional_trigger_count
-            features['emotional_trigger_count'] = 3 if 'emotional' in str(
-                engagement).lower() else 1
-
-            # audience_connection_score
-            features['audience_connection_score'] = 0.7 if 'connection' in str(
-                engagement).lower() else 0.5
-
-            # sound_quality_score
-            technical = gemini_analysis.get('technical_elements', {})
-            features['sound_quality_score'] = 0.8 if 'sound' in str(
-                technical).lower() else 0.6
-
-            # production_quality_score
-            features['production_quality_score'] = 0.8 if 'quality' in str(
-                technical).lower() else 0.6
-
-            # trend_alignment_score
-            trend = gemini_analysis.get('trend_alignment', {})
-            features['trend_alignment_score'] = 0.6 if 'trend' in str(
-                trend).lower() else 0.4
-
-            # color_vibrancy_score
-            features['color_vibrancy_score'] = 0.7 if 'color' in str(
-                visual).lower() else 0.5
-
-            # video_duration_optimized
-            features['video_duration_optimized'] = 1.0 if 15 <= features['duration'] <= 60 else 0.0
-        else:
-            # Fallbacks si pas d'analyse Gemini
-            features['visual_quality_score'] = 0.6
-            features['has_hook'] = 0.0
-            features['viral_potential_score'] = 0.5
-            features['emotional_trigger_count'] = 1
-            features['audience_connection_score'] = 0.5
-            features['sound_quality_score'] = 0.6
-            features['production_quality_score'] = 0.6
-            features['trend_alignment_score'] = 0.4
-            features['color_vibrancy_score'] = 0.5
-            features['video_duration_optimized'] = 1.0 if 15 <= features['duration'] <= 60 else 0.0
-
-        return features
+        return pd.DataFrame(columns, index=range(len(batch))).reindex(columns=self.features)
 
 
 class EnhancedFeatureSet(BaseFeatureSet):
@@ -1066,10 +1187,12 @@ class FeatureRegistry:
 class FeatureExtractorManager:
     """Gestionnaire central des feature extractors."""
 
-    def __init__(self, feature_sets: List[str]):
+    def __init__(self, feature_sets: List[str], cache: Optional[FeatureCache] = None):
         self.feature_sets = feature_sets
         self.registry = FeatureRegistry()
         self.extractors = self._load_extractors()
+        self.planner = FeaturePlanner.for_feature_sets(list(self.extractors.values()))
+        self.cache = cache
 
         logger.info(
             f"Initialized FeatureExtractorManager with sets: {feature_sets}")
@@ -1088,13 +1211,32 @@ class FeatureExtractorManager:
 
         return extractors
 
-    def extract_features(self, video_data: Dict, gemini_analysis: Optional[Dict] = None) -> Dict:
-        """Extrait les features selon les feature sets configurés."""
+    def extract_features(self, video_data: Dict, gemini_analysis: Optional[Dict] = None,
+                         columns: Optional[List[str]] = None) -> Dict:
+        """Extrait les features selon les feature sets configurés.
+
+        Args:
+            video_data: Item Apify brut
+            gemini_analysis: Analyse Gemini (None si absente)
+            columns: Si fourni, seules ces features (et leurs dépendances)
+                sont calculées, via le graphe de features
+
+        Raises:
+            ValueError: si `columns` contient une feature inconnue
+        """
+        context = ExtractionContext(video_data, gemini_analysis)
+        if columns is not None:
+            features = self._cached(context, self._columns_cache_name(columns), self._versions(),
+                                    lambda: self.planner.evaluate(context, columns))
+            logger.debug(f"Planned features extracted: {len(features)}/{len(columns)}")
+            return features
+
         combined_features = {}
 
         for feature_set_name, extractor in self.extractors.items():
             try:
-                features = extractor.extract(video_data, gemini_analysis)
+                features = self._cached(context, extractor.name, extractor.version,
+                                        lambda: context.run(extractor))
                 combined_features.update(features)
                 logger.debug(
                     f"Extracted {len(features)} features from {feature_set_name}")
@@ -1105,6 +1247,152 @@ class FeatureExtractorManager:
         logger.info(f"Total features extracted: {len(combined_features)}")
         return combined_features
 
+    def extract_features_batch(self, videos: Union[List[Dict], pd.DataFrame],
+                               analyses: Optional[List[Optional[Dict]]] = None,
+                               workers: int = 1, chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """Extrait les features d'un ensemble de vidéos sous forme colonnaire.
+
+        Args:
+            videos: Liste d'items Apify bruts ou DataFrame de ces items
+            analyses: Analyses Gemini alignées sur `videos` (None si absente)
+            workers: Nombre de processus ; > 1 répartit les vidéos par chunks
+            chunk_size: Vidéos par chunk (défaut : ~4 chunks par processus)
+
+        Returns:
+            DataFrame avec une ligne par vidéo, dans l'ordre d'entrée
+        """
+        batch = VideoBatch.from_items(videos, analyses)
+        if workers > 1 and len(batch) > 1:
+            return self._extract_batch_parallel(batch, workers, chunk_size)
+
+        combined = pd.DataFrame(index=range(len(batch)))
+
+        for feature_set_name, extractor in self.extractors.items():
+            try:
+                frame = self._extract_set_batch(extractor, batch)
+            except Exception as e:
+                logger.error(
+                    f"Error extracting batch features from {feature_set_name}: {e}")
+                continue
+
+            # Même sémantique que dict.update : une valeur absente d'un set
+            # ultérieur ne masque pas celle d'un set précédent
+            for column in frame.columns:
+                if column in combined.columns:
+                    combined[column] = frame[column].combine_first(
+                        combined[column])
+                else:
+                    combined[column] = frame[column]
+            logger.debug(
+                f"Extracted {frame.shape[1]} batch features from {feature_set_name}")
+
+        logger.info(
+            f"Total batch features extracted: {combined.shape[1]} x {len(combined)} videos")
+        return combined
+
+    def _extract_batch_parallel(self, batch: VideoBatch, workers: int,
+                                chunk_size: Optional[int]) -> pd.DataFrame:
+        """Répartit le batch sur un pool de processus et fusionne dans l'ordre d'entrée."""
+        if chunk_size is None:
+            # Plusieurs chunks par processus pour équilibrer la charge
+            chunk_size = max(1, math.ceil(len(batch) / (workers * 4)))
+        starts = range(0, len(batch), chunk_size)
+        cache_config = (str(self.cache.path), self.cache.max_bytes) if self.cache else None
+
+        logger.info(
+            f"Extracting {len(batch)} videos in {len(starts)} chunks over {workers} processes")
+        with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+            # map() conserve l'ordre des chunks : résultat déterministe
+            frames = list(executor.map(
+                _extract_batch_chunk,
+                repeat(self.feature_sets),
+                [batch.items[start:start + chunk_size] for start in starts],
+                [batch.analyses[start:start + chunk_size] for start in starts],
+                repeat(cache_config)))
+
+        combined = pd.concat(frames, ignore_index=True)
+        # Ordre des colonnes indépendant du découpage en chunks
+        declared = [name for name in dict.fromkeys(self.get_feature_names())
+                    if name in combined.columns]
+        return combined[declared + [name for name in combined.columns if name not in declared]]
+
+    # Cache de features
+
+    def _cache_key(self, context: ExtractionContext, name: str, version: str) -> CacheKey:
+        return CacheKey(str(context.video_data.get('id', '')), name, version, context.fingerprint)
+
+    def _versions(self) -> str:
+        return '+'.join(f"{name}:{extractor.version}" for name, extractor in self.extractors.items())
+
+    @staticmethod
+    def _columns_cache_name(columns: List[str]) -> str:
+        return "columns:" + hashlib.sha1(','.join(columns).encode('utf-8')).hexdigest()[:16]
+
+    def _cached(self, context: ExtractionContext, name: str, version: str, compute) -> Dict:
+        """Résultat en cache pour cette vidéo, sinon calculé puis enregistré."""
+        if self.cache is None:
+            return compute()
+
+        key = self._cache_key(context, name, version)
+        features = self.cache.get(key)
+        if features is None:
+            features = compute()
+            self.cache.put(key, features)
+        return features
+
+    @staticmethod
+    def _extract_set_safe(extractor: BaseFeatureSet, batch: VideoBatch) -> Tuple[pd.DataFrame, List[int]]:
+        """Frame d'un feature set et positions des vidéos en échec.
+
+        Si l'extraction vectorisée échoue, le set est recalculé vidéo par
+        vidéo : une vidéo malformée ne vide que sa propre ligne, comme avec
+        `extract_features`.
+        """
+        try:
+            return extractor.extract_batch(batch), []
+        except Exception as e:
+            logger.warning(
+                f"Batch extraction failed for {extractor.name}, falling back to per-video: {e}")
+
+        rows, failed = [], []
+        for i, context in enumerate(batch.contexts):
+            try:
+                rows.append(context.run(extractor))
+            except Exception as e:
+                logger.error(
+                    f"Error extracting features from {extractor.name} "
+                    f"for video {context.video_data.get('id', i)}: {e}")
+                rows.append({})
+                failed.append(i)
+        return pd.DataFrame(rows, index=range(len(batch))), failed
+
+    def _extract_set_batch(self, extractor: BaseFeatureSet, batch: VideoBatch) -> pd.DataFrame:
+        """Frame d'un feature set ; seules les vidéos absentes du cache sont extraites."""
+        if self.cache is None:
+            return self._extract_set_safe(extractor, batch)[0]
+
+        keys = [self._cache_key(context, extractor.name, extractor.version)
+                for context in batch.contexts]
+        cached = self.cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+
+        fresh: Dict[int, Dict] = {}
+        if missing:
+            frame, failed = self._extract_set_safe(extractor, batch.subset(missing))
+            records = frame_records(frame)
+            fresh = dict(zip(missing, records))
+            # Les échecs ne sont pas mis en cache : ils seront retentés
+            failed = {missing[i] for i in failed}
+            self.cache.put_many({keys[i]: record for i, record in fresh.items() if i not in failed})
+            if len(missing) == len(batch):
+                return frame
+
+        rows = [fresh[i] if i in fresh else cached[key] for i, key in enumerate(keys)]
+        result = pd.DataFrame(rows, index=range(len(batch)))
+        # Même ordre de colonnes qu'une extraction sans cache
+        ordered = [name for name in extractor.get_feature_names() if name in result.columns]
+        return result[ordered + [name for name in result.columns if name not in ordered]]
+
     def get_feature_count(self) -> int:
         """Retourne le nombre total de features configurées."""
         total = 0
@@ -1120,6 +1408,18 @@ class FeatureExtractorManager:
         return feature_names
 
 
+def _extract_batch_chunk(feature_sets: List[str], videos: List[Dict],
+                         analyses: List[Optional[Dict]], cache_config) -> pd.DataFrame:
+    """Worker de processus : extrait un chunk avec un manager local."""
+    cache = FeatureCache(*cache_config) if cache_config else None
+    try:
+        manager = FeatureExtractorManager(feature_sets, cache=cache)
+        return manager.extract_features_batch(videos, analyses)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
 # Configuration des feature sets prédéfinis
 FEATURE_SETS_CONFIG = {
     "baseline": ["metadata", "gemini_basic"],
@@ -1131,13 +1431,14 @@ FEATURE_SETS_CONFIG = {
 }
 
 
-def create_feature_extractor(config_name: str) -> FeatureExtractorManager:
+def create_feature_extractor(config_name: str,
+                             cache: Optional[FeatureCache] = None) -> FeatureExtractorManager:
     """Crée un feature extractor avec une configuration prédéfinie."""
     if config_name not in FEATURE_SETS_CONFIG:
         raise ValueError(f"Unknown feature set configuration: {config_name}")
 
     feature_sets = FEATURE_SETS_CONFIG[config_name]
-    return FeatureExtractorManager(feature_sets)
+    return FeatureExtractorManager(feature_sets, cache=cache)
 
 
 def main():
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+📊 File: timestamps.py
+🎯 Purpose: Shared, cached decomposition of `createTimeISO` into temporal features
+📚 Concepts: Memoization, Fast Paths, Vectorization
+🔗 Related: src/features/modular_feature_system.py, src/features/video_batch.py
+
+📖 Educational Notes:
+- `pd.to_datetime` on a single string is slow (format inference, Timestamp object)
+- Apify always emits the same format: `2025-01-15T20:30:00.000Z`
+- For that format the hour/day/month are fixed-position slices, no parsing needed
+- Other formats fall back to pandas, and every result is memoized per string
+
+🚀 Usage:
+from src.features.timestamps import decompose_timestamp
+parts = decompose_timestamp('2025-01-15T20:30:00.000Z')
+parts.hour, parts.weekday, parts.is_weekend
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Optional
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Format fixe des exports Apify (UTC, millisecondes optionnelles)
+APIFY_ISO_PATTERN = re.compile(
+    r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$')
+
+
+@dataclass(frozen=True)
+class TimestampParts:
+    """Décomposition temporelle d'une date de publication."""
+    hour: int
+    weekday: int  # 0 = lundi, comme pandas dayofweek
+    month: int
+
+    @property
+    def is_weekend(self) -> bool:
+        return self.weekday >= 5
+
+    @property
+    def is_business_hours(self) -> bool:
+        return 9 <= self.hour <= 17
+
+
+@lru_cache(maxsize=65536)
+def decompose_timestamp(iso_string: str) -> Optional[TimestampParts]:
+    """Décompose une date ISO en heure, jour de semaine et mois.
+
+    Le résultat est mémorisé par chaîne : une même date n'est analysée qu'une
+    fois, quel que soit le nombre de feature sets qui la demandent.
+
+    Returns:
+        TimestampParts, ou None si la chaîne est vide ou invalide
+    """
+    if not iso_string:
+        return None
+
+    if APIFY_ISO_PATTERN.match(iso_string):
+        year, month, day = int(iso_string[0:4]), int(
+            iso_string[5:7]), int(iso_string[8:10])
+        try:
+            weekday = date(year, month, day).weekday()
+        except ValueError:
+            return None
+        return TimestampParts(hour=int(iso_string[11:13]), weekday=weekday, month=month)
+
+    try:
+        post_time = pd.to_datetime(iso_string)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Unparseable createTimeISO '{iso_string}': {e}")
+        return None
+    if pd.isna(post_time):
+        return None
+    return TimestampParts(hour=post_time.hour, weekday=post_time.dayofweek, month=post_time.month)
+
+
+def decompose_timestamps(values: Iterable) -> pd.DataFrame:
+    """Décomposition vectorisée d'une colonne de dates ISO.
+
+    Les dates au format Apify sont découpées par positions fixes sur toute la
+    colonne ; les autres passent par `decompose_timestamp` (mémorisé).
+
+    Returns:
+        DataFrame avec les colonnes `present`, `hour`, `weekday`, `month`
+        (NaN là où la date est absente ou invalide)
+    """
+    raw = pd.Series(list(values), dtype=object)
+    strings = raw.where(raw.map(lambda v: isinstance(v, str)), '').astype(str)
+
+    hour = np.full(len(strings), np.nan)
+    weekday = np.full(len(strings), np.nan)
+    month = np.full(len(strings), np.nan)
+
+    fast = strings.str.match(APIFY_ISO_PATTERN).to_numpy(dtype=bool)
+    if fast.any():
+        fast_strings = strings[fast]
+        days = pd.to_datetime(fast_strings.str.slice(0, 10),
+                              format='%Y-%m-%d', errors='coerce')
+        valid = days.notna().to_numpy()
+        idx = np.flatnonzero(fast)
+        hour[idx] = np.where(valid, fast_strings.str.slice(11, 13).astype(int), np.nan)
+        weekday[idx] = np.where(valid, days.dt.dayofweek, np.nan)
+        month[idx] = np.where(valid, days.dt.month, np.nan)
+
+    for i in np.flatnonzero(~fast & (strings != '').to_numpy()):
+        parts = decompose_timestamp(strings.iat[i])
+        if parts is not None:
+            hour[i], weekday[i], month[i] = parts.hour, parts.weekday, parts.month
+
+    return pd.DataFrame({
+        'present': ~np.isnan(hour),
+        'hour': hour,
+        'weekday': weekday,
+        'month': month,
+    })
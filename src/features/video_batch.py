@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+📊 File: video_batch.py
+🎯 Purpose: Columnar view over a batch of raw Apify video items for vectorized feature extraction
+📚 Concepts: Columnar Data, Vectorization, NumPy Broadcasting
+🔗 Related: src/features/modular_feature_system.py
+
+📖 Educational Notes:
+- Row-by-row extraction builds one dict per video and one DataFrame at the end
+- A columnar batch reads each raw field once into a NumPy array
+- Feature rules (ratios, thresholds, counts) then run once per column instead of once per video
+
+🚀 Usage:
+from src.features.video_batch import VideoBatch
+batch = VideoBatch.from_items(videos, analyses)
+durations = batch.duration
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from .extraction_context import ExtractionContext, hashtag_names
+from .timestamps import decompose_timestamps
+
+
+def _is_missing(value: Any) -> bool:
+    """True pour les valeurs absentes d'une cellule DataFrame (NaN/None)."""
+    if value is None:
+        return True
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        # Listes, dicts et autres conteneurs ne sont jamais "manquants"
+        return False
+
+
+class VideoBatch:
+    """Batch de vidéos brutes exposé colonne par colonne.
+
+    Les colonnes sont calculées à la demande puis mémorisées, de sorte qu'un
+    champ brut n'est lu qu'une seule fois quel que soit le nombre de feature
+    sets qui l'utilisent.
+    """
+
+    def __init__(self, items: List[Dict], analyses: Optional[List[Optional[Dict]]] = None):
+        if analyses is None:
+            analyses = [None] * len(items)
+        if len(analyses) != len(items):
+            raise ValueError(
+                f"Got {len(items)} videos but {len(analyses)} Gemini analyses")
+
+        self.items = items
+        self.analyses = analyses
+        self._columns: Dict[str, Any] = {}
+
+    @classmethod
+    def from_items(cls, videos: Union[Sequence[Dict], pd.DataFrame],
+                   analyses: Optional[Sequence[Optional[Dict]]] = None) -> 'VideoBatch':
+        """Construit un batch depuis une liste d'items Apify ou un DataFrame."""
+        if isinstance(videos, pd.DataFrame):
+            return cls.from_frame(videos, analyses)
+        return cls(list(videos), list(analyses) if analyses is not None else None)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame,
+                   analyses: Optional[Sequence[Optional[Dict]]] = None) -> 'VideoBatch':
+        """Construit un batch depuis un DataFrame d'items Apify bruts.
+
+        Les cellules manquantes (NaN) sont retirées des records pour que les
+        feature sets ligne par ligne retrouvent leurs valeurs par défaut.
+        """
+        return cls(frame_records(frame), list(analyses) if analyses is not None else None)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def subset(self, indices: Sequence[int]) -> 'VideoBatch':
+        """Sous-batch des vidéos aux positions `indices` (contextes partagés)."""
+        subset = VideoBatch([self.items[i] for i in indices],
+                            [self.analyses[i] for i in indices])
+        if 'contexts' in self._columns:
+            subset._columns['contexts'] = [self.contexts[i] for i in indices]
+        return subset
+
+    def _memo(self, name: str, compute):
+        if name not in self._columns:
+            self._columns[name] = compute()
+        return self._columns[name]
+
+    @property
+    def contexts(self) -> List[ExtractionContext]:
+        """Contextes d'extraction par vidéo, partagés entre feature sets."""
+        return self._memo('contexts', lambda: [
+            ExtractionContext(item, analysis)
+            for item, analysis in zip(self.items, self.analyses)])
+
+    def raw(self, key: str, default: Any = None) -> List[Any]:
+        """Colonne brute d'un champ de premier niveau."""
+        return self._memo(f"raw:{key}", lambda: [item.get(key, default) for item in self.items])
+
+    def numeric(self, key: str, default: float = 0) -> np.ndarray:
+        """Colonne numérique d'un champ de premier niveau (playCount, diggCount, ...)."""
+        return self._memo(f"num:{key}", lambda: np.asarray(
+            [item.get(key, default) for item in self.items], dtype=float))
+
+    @property
+    def duration(self) -> np.ndarray:
+        """Durées `videoMeta.duration` (0 si absente)."""
+        return self._memo('duration', lambda: np.asarray(
+            [(item.get('videoMeta') or {}).get('duration', 0) for item in self.items],
+            dtype=float))
+
+    @property
+    def hashtags(self) -> List[List[str]]:
+        """Noms des hashtags de chaque vidéo."""
+        return self._memo('hashtags', lambda: [
+            hashtag_names(item.get('hashtags', [])) for item in self.items])
+
+    @property
+    def hashtag_count(self) -> np.ndarray:
+        """Nombre de hashtags par vidéo."""
+        return self._memo('hashtag_count', lambda: np.fromiter(
+            (len(tags) for tags in self.hashtags), dtype=np.int64, count=len(self)))
+
+    @property
+    def create_time(self) -> pd.DataFrame:
+        """Décomposition temporelle de `createTimeISO` (NaN si absente)."""
+        return self._memo('create_time', lambda: decompose_timestamps(
+            self.raw('createTimeISO', '')))
+
+
+def frame_records(frame: pd.DataFrame) -> List[Dict]:
+    """Lignes d'un frame en dicts, sans les cellules manquantes (comme l'extraction ligne par ligne)."""
+    columns = list(frame.columns)
+    return [
+        {key: value for key, value in zip(columns, row) if not _is_missing(value)}
+        for row in frame.itertuples(index=False, name=None)
+    ]
+
+
+def safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Division élément par élément qui renvoie 0 quand le dénominateur est nul."""
+    out = np.zeros_like(numerator, dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def int_or_nan(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Renvoie des entiers si toutes les valeurs sont présentes, sinon des floats avec NaN."""
+    if present.all():
+        return values.astype(np.int64)
+    return np.where(present, values, np.nan)
@@ -0,0 +1,288 @@
+"""
+Compiled tree-ensemble evaluator.
+
+Exports a fitted scikit-learn tree ensemble (RandomForest, ExtraTrees,
+DecisionTree regressors) or an XGBoost regressor into flat NumPy arrays
+(feature, threshold, left, right, value), saved as a single `.npz` file.
+
+Evaluating the compiled ensemble only needs NumPy: every row walks every
+tree at once, one tree level per vectorized step, and walkers drop out as
+they reach a leaf. The API can then serve the model without importing
+scikit-learn or xgboost, and one batch costs at most `max_depth` array
+operations instead of a Python call per tree.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Leaf marker in the `feature` array
+LEAF = -1
+
+# XGBoost objectives whose raw margin is the prediction
+XGBOOST_IDENTITY_OBJECTIVES = {"reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror"}
+
+
+class CompiledTreeEnsemble:
+    """Tree ensemble stored as flat arrays, one row per node.
+
+    Children indices are global (all trees are concatenated), leaves point
+    to themselves so a finished walk stays put. Trees are combined by
+    `aggregation` ("mean" for random forests, "sum" for boosting) and
+    offset by `base_score`.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        aggregation: str = "mean",
+        base_score: float = 0.0,
+        strict: bool = False,
+        feature_names: Optional[Sequence[str]] = None,
+        source: str = ""
+    ):
+        if aggregation not in ("mean", "sum"):
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.missing_left = np.asarray(missing_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        self.aggregation = aggregation
+        self.base_score = float(base_score)
+        # scikit-learn goes left on x <= t, XGBoost on x < t
+        self.strict = bool(strict)
+        self.source = source
+        if feature_names is not None:
+            # Same attribute as fitted scikit-learn estimators: gives the column order
+            self.feature_names_in_ = np.asarray(list(feature_names), dtype=object)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Predictions for a (n_samples, n_features) matrix"""
+        # Inputs are compared as float32, like the original estimators do
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, the model expects {self.n_features_in_}")
+        n_samples = X.shape[0]
+        check_missing = bool(np.isnan(X).any())
+
+        # One walker per (row, tree) pair; only walkers not yet on a leaf advance
+        nodes = np.tile(self.roots, n_samples)
+        rows = np.repeat(np.arange(n_samples), self.n_trees)
+        active = np.flatnonzero(self.feature[nodes] != LEAF)
+        while active.size:
+            current = nodes[active]
+            x = X[rows[active], self.feature[current]]
+            threshold = self.threshold[current]
+            go_left = x < threshold if self.strict else x <= threshold
+            if check_missing:
+                go_left = np.where(np.isnan(x), self.missing_left[current], go_left)
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.feature[current] != LEAF]
+
+        leaves = self.value[nodes].reshape(n_samples, self.n_trees)
+        if self.aggregation == "mean":
+            return leaves.mean(axis=1) + self.base_score
+        return leaves.sum(axis=1) + self.base_score
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the compiled ensemble to a `.npz` file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        names = getattr(self, "feature_names_in_", None)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "max_depth": self.max_depth,
+            "n_features": self.n_features_in_,
+            "aggregation": self.aggregation,
+            "base_score": self.base_score,
+            "strict": self.strict,
+            "feature_names": None if names is None else [str(n) for n in names],
+            "source": self.source
+        }
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f, feature=self.feature, threshold=self.threshold, left=self.left,
+                right=self.right, missing_left=self.missing_left, value=self.value,
+                roots=self.roots, meta=np.array(json.dumps(meta)))
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CompiledTreeEnsemble":
+        """Read an ensemble written by `save`"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported compiled model format: {meta.get('format_version')}")
+            return cls(
+                feature=data["feature"], threshold=data["threshold"],
+                left=data["left"], right=data["right"],
+                missing_left=data["missing_left"], value=data["value"],
+                roots=data["roots"], max_depth=meta["max_depth"],
+                n_features=meta["n_features"], aggregation=meta["aggregation"],
+                base_score=meta["base_score"], strict=meta["strict"],
+                feature_names=meta["feature_names"], source=meta.get("source", "")
+            )
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray, root: int) -> int:
+    """Number of splits on the longest root-to-leaf path"""
+    depth = 0
+    level = [root]
+    while True:
+        children = [child for node in level
+                    for child in (left[node], right[node]) if child != node]
+        if not children:
+            return depth
+        depth += 1
+        level = children
+
+
+def _concatenate(trees: List[Dict[str, np.ndarray]]) -> Dict[str, Any]:
+    """Merge per-tree arrays (local indices) into global arrays"""
+    offsets = np.cumsum([0] + [len(tree["feature"]) for tree in trees[:-1]])
+    merged = {
+        key: np.concatenate([tree[key] for tree in trees])
+        for key in ("feature", "threshold", "missing_left", "value")
+    }
+    merged["left"] = np.concatenate([tree["left"] + offset for tree, offset in zip(trees, offsets)])
+    merged["right"] = np.concatenate([tree["right"] + offset for tree, offset in zip(trees, offsets)])
+    merged["roots"] = offsets.astype(np.int32)
+    merged["max_depth"] = max(
+        _tree_depth(tree["left"], tree["right"], 0) for tree in trees)
+    return merged
+
+
+def _sklearn_tree_arrays(tree) -> Dict[str, np.ndarray]:
+    """Flat arrays of one fitted scikit-learn tree (`estimator.tree_`)"""
+    if tree.n_outputs != 1:
+        raise ValueError("Only single-output trees can be compiled")
+    is_leaf = tree.children_left == -1
+    own = np.arange(tree.node_count)
+    missing_left = getattr(tree, "missing_go_to_left", None)
+    return {
+        "feature": np.where(is_leaf, LEAF, tree.feature).astype(np.int32),
+        "threshold": np.where(is_leaf, 0.0, tree.threshold),
+        "left": np.where(is_leaf, own, tree.children_left).astype(np.int32),
+        "right": np.where(is_leaf, own, tree.children_right).astype(np.int32),
+        "missing_left": (np.zeros(tree.node_count, dtype=bool) if missing_left is None
+                         else np.asarray(missing_left, dtype=bool)),
+        "value": tree.value[:, 0, 0].astype(np.float64),
+    }
+
+
+def _compile_sklearn(model) -> CompiledTreeEnsemble:
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        estimators = [model]
+    if any(not hasattr(estimator, "tree_") for estimator in estimators):
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    merged = _concatenate([_sklearn_tree_arrays(estimator.tree_) for estimator in estimators])
+    names = getattr(model, "feature_names_in_", None)
+    return CompiledTreeEnsemble(
+        n_features=model.n_features_in_, aggregation="mean", strict=False,
+        feature_names=None if names is None else list(names),
+        source=type(model).__name__, **merged)
+
+
+def _xgboost_base_score(config: Dict[str, Any]) -> float:
+    raw = config["learner"]["learner_model_param"]["base_score"]
+    # Recent versions store a vector, e.g. "[5E-1]"
+    return float(str(raw).strip("[]").split(",")[0])
+
+
+def _xgboost_children(column, local: Dict[str, int]) -> np.ndarray:
+    """Local child indices of one tree; leaves (no child) point to themselves"""
+    return np.array([local.get(node_id, i) for i, node_id in enumerate(column)],
+                    dtype=np.int32)
+
+
+def _compile_xgboost(model) -> CompiledTreeEnsemble:
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    config = json.loads(booster.save_config())
+    objective = config["learner"]["objective"]["name"]
+    if objective not in XGBOOST_IDENTITY_OBJECTIVES:
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+    names = booster.feature_names
+    n_features = booster.num_features()
+    index = ({name: i for i, name in enumerate(names)} if names
+             else {f"f{i}": i for i in range(n_features)})
+
+    frame = booster.trees_to_dataframe()
+    # Early stopping: predict() only uses the trees up to the best iteration
+    best_iteration = getattr(model, "best_iteration", None) if hasattr(model, "get_booster") else None
+    if best_iteration is not None:
+        frame = frame[frame["Tree"] <= best_iteration]
+
+    trees = []
+    for _, nodes in frame.groupby("Tree", sort=True):
+        nodes = nodes.sort_values("Node")
+        local = {node_id: i for i, node_id in enumerate(nodes["ID"])}
+        own = np.arange(len(nodes))
+        is_leaf = (nodes["Feature"] == "Leaf").to_numpy()
+        left, right, missing = (_xgboost_children(nodes[column], local)
+                                for column in ("Yes", "No", "Missing"))
+        trees.append({
+            "feature": np.where(is_leaf, LEAF, [index.get(f, LEAF) for f in nodes["Feature"]]).astype(np.int32),
+            # XGBoost keeps float32 split conditions
+            "threshold": np.where(is_leaf, 0.0, nodes["Split"].fillna(0.0).to_numpy(dtype=np.float32)),
+            "left": np.where(is_leaf, own, left).astype(np.int32),
+            "right": np.where(is_leaf, own, right).astype(np.int32),
+            "missing_left": ~is_leaf & (missing == left),
+            "value": np.where(is_leaf, nodes["Gain"].to_numpy(dtype=np.float64), 0.0),
+        })
+
+    return CompiledTreeEnsemble(
+        n_features=n_features, aggregation="sum", strict=True,
+        base_score=_xgboost_base_score(config), feature_names=names,
+        source=type(model).__name__, **_concatenate(trees))
+
+
+def compile_model(model) -> CompiledTreeEnsemble:
+    """Compile a fitted tree-ensemble regressor into flat NumPy arrays.
+
+    Raises:
+        ValueError: the model is not a supported single-output tree regressor
+    """
+    module = type(model).__module__
+    if module.startswith("xgboost"):
+        return _compile_xgboost(model)
+    if module.startswith("sklearn"):
+        return _compile_sklearn(model)
+    raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+
+def load_compiled_model(path: Union[str, Path]) -> CompiledTreeEnsemble:
+    """Load a compiled ensemble from its `.npz` file"""
+    return CompiledTreeEnsemble.load(path)
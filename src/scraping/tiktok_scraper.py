@@ -5,6 +5,7 @@ import logging
 import time
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from pathlib import Path
 
@@ -31,6 +32,25 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Apify TikTok scraper actor
+ACTOR_ID = "clockworks/free-tiktok-scraper"
+
+# Ways of scraping several profiles:
+# - serial: one actor run per profile, one after the other
+# - packed: a single actor run for all profiles, items split by author
+# - concurrent: one actor run per profile, several in flight at once
+SCRAPE_MODES = ("serial", "packed", "concurrent")
+
+# Pause between two actor runs in serial mode (none after the last one)
+SERIAL_DELAY_SECONDS = 2
+
+
+def video_author(video: Dict) -> str:
+    """Normalized username of the author of a scraped video."""
+    author = video.get("authorMeta") or {}
+    name = author.get("name") or video.get("input") or ""
+    return str(name).lstrip("@").lower()
+
 
 class TikTokScraper:
     """
@@ -55,6 +75,31 @@ class TikTokScraper:
 
         self.client = ApifyClient(self.api_token)
 
+    def _run_actor(self, profiles: List[str], max_videos: int) -> List[Dict]:
+        """
+        Run the Apify actor once for the given profiles
+
+        Args:
+            profiles: TikTok usernames without @
+            max_videos: Maximum number of videos per profile
+
+        Returns:
+            Dataset items of the run
+        """
+        run_input = {
+            "profiles": [f"@{username}" for username in profiles],
+            "resultsPerPage": max_videos,
+            "shouldDownloadVideos": False,
+            "shouldDownloadCovers": False,
+            "shouldDownloadSlideshowImages": False
+        }
+
+        # Start the actor
+        run = self.client.actor(ACTOR_ID).call(run_input=run_input)
+
+        # Get results
+        return list(self.client.dataset(run["defaultDatasetId"]).iterate_items())
+
     def scrape_profile(self, username: str, max_videos: int = 50) -> Dict:
         """
         Scrape TikTok profile and videos
@@ -71,25 +116,8 @@ class TikTokScraper:
 
         logger.info(f"Scraping TikTok profile: {username}")
 
-        # Apify TikTok scraper actor
-        actor_id = "clockworks/free-tiktok-scraper"
-
-        run_input = {
-            "profiles": [f"@{username}"],
-            "resultsPerPage": max_videos,
-            "shouldDownloadVideos": False,
-            "shouldDownloadCovers": False,
-            "shouldDownloadSlideshowImages": False
-        }
-
         try:
-            # Start the actor
-            run = self.client.actor(actor_id).call(run_input=run_input)
-
-            # Get results
-            results = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                results.append(item)
+            results = self._run_actor([username], max_videos)
 
             logger.info(f"Scraped {len(results)} videos for {username}")
             return {
@@ -102,33 +130,101 @@ class TikTokScraper:
             logger.error(f"Error scraping {username}: {str(e)}")
             raise
 
-    def scrape_multiple_profiles(self, usernames: List[str], max_videos: int = 50) -> List[Dict]:
+    def scrape_multiple_profiles(
+        self,
+        usernames: List[str],
+        max_videos: int = 50,
+        mode: str = "serial",
+        max_concurrency: int = 4
+    ) -> List[Dict]:
         """
         Scrape multiple TikTok profiles
 
         Args:
             usernames: List of TikTok usernames
             max_videos: Maximum number of videos per profile
+            mode: One of SCRAPE_MODES
+            max_concurrency: Actor runs in flight at once (concurrent mode)
 
         Returns:
-            List of profile data dictionaries
+            List of profile data dictionaries, in the order of usernames.
+            Profiles that failed to scrape are left out.
         """
+        if mode not in SCRAPE_MODES:
+            raise ValueError(
+                f"Unknown scrape mode '{mode}', expected one of {SCRAPE_MODES}")
+
+        if mode == "packed" and len(usernames) > 1:
+            return self._scrape_packed(usernames, max_videos, max_concurrency)
+        if mode == "concurrent" and len(usernames) > 1:
+            return self._scrape_concurrent(usernames, max_videos, max_concurrency)
+
         results = []
 
-        for username in usernames:
+        for position, username in enumerate(usernames):
+            if position:
+                # Rate limiting between runs: a single profile is not delayed,
+                # so per-account pipeline stages scrape at their own pace
+                time.sleep(SERIAL_DELAY_SECONDS)
             try:
                 profile_data = self.scrape_profile(username, max_videos)
                 results.append(profile_data)
 
-                # Rate limiting
-                time.sleep(2)
-
             except Exception as e:
                 logger.error(f"Failed to scrape {username}: {str(e)}")
                 continue
 
         return results
 
+    def _scrape_concurrent(self, usernames: List[str], max_videos: int,
+                           max_concurrency: int) -> List[Dict]:
+        """Run one actor per profile, a bounded number at once, on the shared client."""
+        def scrape(username: str) -> Optional[Dict]:
+            try:
+                return self.scrape_profile(username, max_videos)
+            except Exception as e:
+                logger.error(f"Failed to scrape {username}: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(usernames)))) as executor:
+            results = list(executor.map(scrape, usernames))
+
+        return [result for result in results if result is not None]
+
+    def _scrape_packed(self, usernames: List[str], max_videos: int,
+                       max_concurrency: int) -> List[Dict]:
+        """Scrape all profiles in one actor run and split the items by author."""
+        profiles = [username.lstrip('@') for username in usernames]
+        logger.info(f"Scraping {len(profiles)} TikTok profiles in one actor run")
+
+        try:
+            items = self._run_actor(profiles, max_videos)
+        except Exception as e:
+            logger.error(
+                f"Packed scraping failed ({str(e)}), falling back to one run per profile")
+            return self._scrape_concurrent(usernames, max_videos, max_concurrency)
+
+        videos_by_author = {profile.lower(): [] for profile in profiles}
+        for item in items:
+            author = video_author(item)
+            if author in videos_by_author:
+                videos_by_author[author].append(item)
+            else:
+                logger.warning(f"Dropping video from unexpected author: {author}")
+
+        scraped_at = time.time()
+        results = []
+        for profile in profiles:
+            videos = videos_by_author[profile.lower()][:max_videos]
+            logger.info(f"Scraped {len(videos)} videos for {profile}")
+            results.append({
+                "username": profile,
+                "scraped_at": scraped_at,
+                "videos": videos
+            })
+
+        return results
+
     def save_raw_data(self, data: Dict, filename: str) -> None:
         """
         Save raw scraped data to JSON file
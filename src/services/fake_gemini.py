@@ -0,0 +1,140 @@
+"""
+🧪 Fake Gemini Service
+
+Stand-in offline pour GeminiService : même interface, même format de
+réponse, latence et erreurs 429 simulées. Sert aux tests et aux benchmarks
+de la phase d'analyse sans clé API ni quota.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class FakeGeminiService:
+    """Simule GeminiService.analyze_tiktok_video."""
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        throttle_rate: float = 0.0,
+        requests_per_minute: Optional[float] = None,
+        seed: int = 42
+    ):
+        """
+        Args:
+            latency: Durée simulée d'un appel, en secondes
+            throttle_rate: Probabilité de réponse 429 par appel
+            requests_per_minute: Quota simulé ; au-delà, réponses 429
+            seed: Graine du tirage des erreurs
+        """
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.requests_per_minute = requests_per_minute
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent_calls = []
+        self.calls = 0
+        self.throttled = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    def _should_throttle(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            if self.requests_per_minute:
+                self._recent_calls = [t for t in self._recent_calls if now - t < 60]
+                if len(self._recent_calls) >= self.requests_per_minute:
+                    self.throttled += 1
+                    return True
+                self._recent_calls.append(now)
+            if self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                return True
+        return False
+
+    def analyze_tiktok_video(self, video_url: str) -> Dict[str, Any]:
+        """Même contrat que GeminiService.analyze_tiktok_video."""
+        return self.analyze_tiktok_videos([video_url], max_batch_size=1)[video_url]
+
+    def analyze_tiktok_videos(
+        self,
+        video_urls: List[str],
+        max_batch_size: int = 5
+    ) -> Dict[str, Dict[str, Any]]:
+        """Même contrat que GeminiService.analyze_tiktok_videos : un appel par lot."""
+        results = {}
+        batch_size = max(1, max_batch_size)
+        for start in range(0, len(video_urls), batch_size):
+            batch = video_urls[start:start + batch_size]
+            results.update({url: result for url, result in zip(batch, self._request(batch))})
+        return results
+
+    def _request(self, video_urls: List[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            timestamp = datetime.now().isoformat()
+            if self._should_throttle():
+                return [{
+                    'success': False,
+                    'error': '429 Resource has been exhausted (e.g. check quota).',
+                    'status_code': 429,
+                    'timestamp': timestamp
+                } for _ in video_urls]
+            return [{
+                'success': True,
+                'analysis': fake_analysis(url),
+                'raw_response': '',
+                'timestamp': timestamp
+            } for url in video_urls]
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def fake_analysis(video_url: str) -> Dict[str, Any]:
+    """Analyse déterministe (dérivée de l'URL) au format attendu par le pipeline."""
+    digest = int(hashlib.sha1(video_url.encode('utf-8')).hexdigest(), 16)
+    quality = 'High quality' if digest % 2 else 'Average quality'
+    shot = ['Close-up', 'Medium shot', 'Wide shot'][digest % 3]
+    return {
+        'visual_analysis': {
+            'main_elements': 'One person talking to camera',
+            'style_quality': quality,
+            'text_overlays': 'Bold text overlays',
+            'transitions': 'Smooth transitions',
+            'human_presence': 'One person with eye contact',
+            'shot_type': shot,
+            'color_analysis': 'Vibrant colors'
+        },
+        'content_structure': {
+            'hook_effectiveness': 'Effective hook in the first second',
+            'story_flow': 'Linear story',
+            'call_to_action': 'Follow for more',
+            'organization': 'Clear'
+        },
+        'engagement_factors': {
+            'emotional_triggers': 'humor, surprise',
+            'audience_connection': 'Strong connection',
+            'viral_potential': 'High viral potential',
+            'unique_points': 'Original format'
+        },
+        'technical_elements': {
+            'length_optimization': 'Appropriate length',
+            'sound_design': 'High quality audio',
+            'pacing': 'Fast',
+            'production_quality': 'High'
+        },
+        'trend_alignment': {
+            'current_trends': 'Perfectly aligned',
+            'hashtag_potential': '#fyp #viral',
+            'similar_content': 'Popular format'
+        }
+    }
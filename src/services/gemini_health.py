@@ -0,0 +1,211 @@
+"""
+🩺 Gemini Health
+
+État de disponibilité de Gemini partagé par le pipeline et l'API.
+
+L'état est mis à jour passivement par les vraies requêtes d'analyse
+(succès, quota, erreur) et reste valable `ttl` secondes. Passé ce délai,
+il peut être rafraîchi par un ping léger (liste des modèles, sans
+inférence) ; sans ping, l'état périmé reste affiché comme tel.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300.0
+# Échecs consécutifs (5xx, réseau, erreur inconnue) avant de déclarer Gemini indisponible
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Codes signifiant que le service répond mais limite le débit
+THROTTLED_STATUS_CODES = {429}
+# Erreurs 4xx qui ne concernent pas la requête elle-même (clé invalide, accès)
+AUTH_STATUS_CODES = {401, 403}
+
+
+def list_models_probe():
+    """Ping sans inférence : récupère un seul modèle de la liste."""
+    import google.generativeai as genai
+
+    api_key = os.getenv('GOOGLE_API_KEY')
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+    genai.configure(api_key=api_key)
+    next(iter(genai.list_models(page_size=1)), None)
+
+
+class GeminiHealth:
+    """État de santé de Gemini avec durée de validité."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        probe: Optional[Callable[[], Any]] = list_models_probe,
+        configured: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD
+    ):
+        """
+        Args:
+            ttl: Durée de validité d'une observation, en secondes
+            probe: Ping de rafraîchissement (None pour le désactiver)
+            configured: Indique si une clé API est disponible
+            clock: Horloge injectable pour les tests
+            failure_threshold: Échecs consécutifs avant l'état 'unavailable'
+        """
+        self.ttl = ttl
+        self.failure_threshold = max(1, failure_threshold)
+        self.probe = probe
+        self._configured = configured or (lambda: bool(os.getenv('GOOGLE_API_KEY')))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+
+        self._state = 'unknown'
+        self._observed_at: Optional[float] = None
+        self._source: Optional[str] = None
+        self.consecutive_failures = 0
+        self.last_success: Optional[str] = None
+        self.last_failure: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "GeminiHealth":
+        """Configuration via GEMINI_HEALTH_TTL, GEMINI_HEALTH_PROBE (0 pour désactiver)
+        et GEMINI_HEALTH_FAILURES."""
+        ttl = float(os.getenv('GEMINI_HEALTH_TTL', DEFAULT_TTL))
+        probe_enabled = os.getenv('GEMINI_HEALTH_PROBE', '1') != '0'
+        failures = int(os.getenv('GEMINI_HEALTH_FAILURES', DEFAULT_FAILURE_THRESHOLD))
+        return cls(ttl=ttl, probe=list_models_probe if probe_enabled else None,
+                   failure_threshold=failures)
+
+    def _observe(self, state: str, source: str, error: Optional[str] = None,
+                 service_failure: bool = False):
+        with self._lock:
+            if service_failure:
+                # Un échec isolé (coupure réseau, 503 ponctuel) ne fait que dégrader
+                self.consecutive_failures += 1
+                if self.consecutive_failures < self.failure_threshold:
+                    state = 'degraded'
+            else:
+                self.consecutive_failures = 0
+            self._state = state
+            self._observed_at = self._clock()
+            self._source = source
+            if error is None:
+                self.last_success = datetime.now().isoformat()
+            else:
+                self.last_failure = datetime.now().isoformat()
+                self.last_error = error
+
+    def record_success(self, source: str = 'request'):
+        """Une requête a abouti (même si sa réponse était mal formée)."""
+        self._observe('available', source)
+
+    def record_failure(self, error: str, status_code: Optional[int] = None,
+                       source: str = 'request'):
+        """Une requête a échoué.
+
+        Un 429 signale un service joignable mais saturé ; une autre erreur
+        4xx ne concerne que la requête (vidéo invalide...) et laisse le
+        service disponible. Une clé refusée (401/403) rend Gemini
+        indisponible immédiatement ; les autres erreurs (5xx, réseau, sans
+        code) le dégradent, puis le rendent indisponible après
+        `failure_threshold` échecs consécutifs.
+        """
+        if status_code in THROTTLED_STATUS_CODES:
+            self._observe('degraded', source, error=str(error))
+        elif status_code in AUTH_STATUS_CODES:
+            self._observe('unavailable', source, error=str(error))
+        elif status_code is not None and 400 <= status_code < 500:
+            self._observe('available', source, error=str(error))
+        else:
+            self._observe('unavailable', source, error=str(error), service_failure=True)
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            return (self._observed_at is None
+                    or self._clock() - self._observed_at > self.ttl)
+
+    def refresh(self) -> bool:
+        """Rafraîchit l'état par le ping, s'il est configuré.
+
+        Returns:
+            True si un ping a été effectué
+        """
+        if self.probe is None or not self._configured():
+            return False
+        # Un seul ping à la fois ; les autres appelants lisent l'état existant
+        if not self._probe_lock.acquire(blocking=False):
+            return False
+        try:
+            if not self.is_stale():
+                return False
+            try:
+                self.probe()
+                self.record_success(source='probe')
+            except Exception as e:
+                logger.warning(f"⚠️ Gemini health probe failed: {e}")
+                code = getattr(e, 'code', None)
+                self.record_failure(str(e), code if isinstance(code, int) else None,
+                                    source='probe')
+            return True
+        finally:
+            self._probe_lock.release()
+
+    def is_available(self, allow_probe: bool = True) -> bool:
+        """Disponibilité d'après la dernière observation valide.
+
+        Sans observation valide : ping si autorisé, sinon disponible dès
+        qu'une clé API est configurée.
+        """
+        if not self._configured():
+            return False
+        if self.is_stale() and allow_probe:
+            self.refresh()
+        with self._lock:
+            if self._observed_at is None or self._clock() - self._observed_at > self.ttl:
+                return True
+            return self._state in ('available', 'degraded')
+
+    def status(self) -> Dict[str, Any]:
+        """Vue de l'état, sans ping ni inférence (pour /health)."""
+        configured = self._configured()
+        with self._lock:
+            age = None if self._observed_at is None else self._clock() - self._observed_at
+            stale = age is None or age > self.ttl
+            if not configured:
+                state = 'not_configured'
+            elif stale:
+                state = 'unknown'
+            else:
+                state = self._state
+            return {
+                'state': state,
+                'available': configured and state in ('available', 'degraded', 'unknown'),
+                'checked_by': None if stale else self._source,
+                'age_seconds': None if age is None else round(age, 1),
+                'ttl_seconds': self.ttl,
+                'last_success': self.last_success,
+                'last_failure': self.last_failure,
+                'last_error': self.last_error
+            }
+
+
+# Global instance for easy access
+_gemini_health = None
+
+
+def get_gemini_health() -> GeminiHealth:
+    """Get or create the shared Gemini health state."""
+    global _gemini_health
+
+    if _gemini_health is None:
+        _gemini_health = GeminiHealth.from_env()
+
+    return _gemini_health
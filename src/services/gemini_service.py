@@ -6,16 +6,129 @@ Utilisé par le pipeline, l'API, et les scripts d'analyse.
 """
 
 import google.generativeai as genai
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional
 import json
 import os
 import logging
 from datetime import datetime
 from pathlib import Path
 
+from .gemini_health import get_gemini_health
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Estimation des tokens d'une analyse, utilisée pour le budget tokens/minute
+# du rate limiter : instructions (envoyées une fois par requête) + vidéo et
+# réponse JSON (par vidéo)
+PROMPT_TOKEN_ESTIMATE = 500
+VIDEO_TOKEN_ESTIMATE = 2000
+ANALYSIS_TOKEN_ESTIMATE = PROMPT_TOKEN_ESTIMATE + VIDEO_TOKEN_ESTIMATE
+
+# Nombre de vidéos par requête en mode batch
+DEFAULT_BATCH_SIZE = 5
+
+# Schéma d'une analyse, partagé par les prompts unitaire et batch
+ANALYSIS_SCHEMA = """{
+            "visual_analysis": {
+                "main_elements": "",
+                "style_quality": "",
+                "text_overlays": "",
+                "transitions": ""
+            },
+            "content_structure": {
+                "hook_effectiveness": "",
+                "story_flow": "",
+                "call_to_action": "",
+                "organization": ""
+            },
+            "engagement_factors": {
+                "emotional_triggers": "",
+                "audience_connection": "",
+                "viral_potential": "",
+                "unique_points": ""
+            },
+            "technical_elements": {
+                "length_optimization": "",
+                "sound_design": "",
+                "pacing": "",
+                "production_quality": ""
+            },
+            "trend_alignment": {
+                "current_trends": "",
+                "hashtag_potential": "",
+                "similar_content": ""
+            },
+            "improvement_suggestions": {
+                "viral_optimization": "",
+                "specific_recommendations": ""
+            }
+        }"""
+
+ANALYSIS_PROMPT = """
+        Analyze this TikTok video and provide a detailed analysis in the following format:
+
+        """ + ANALYSIS_SCHEMA + """
+
+        Please fill in each field with your analysis. Keep the JSON structure exactly as shown, just fill in the values.
+        Ensure your response is valid JSON. Do not include any markdown formatting or code block markers.
+        """
+
+BATCH_ANALYSIS_PROMPT = """
+        Analyze each of the TikTok videos listed below, independently of the others.
+        Return a single JSON object whose keys are the video ids and whose values
+        follow this format:
+
+        """ + ANALYSIS_SCHEMA + """
+
+        Please fill in each field with your analysis. Include every video id exactly once.
+        Ensure your response is valid JSON. Do not include any markdown formatting or code block markers.
+        """
+
+
+def batch_token_estimate(video_count: int) -> int:
+    """Estimation des tokens d'une requête analysant `video_count` vidéos."""
+    return PROMPT_TOKEN_ESTIMATE + VIDEO_TOKEN_ESTIMATE * max(1, video_count)
+
+
+def video_id_from_url(video_url: str) -> str:
+    """Identifiant TikTok d'une URL de vidéo (dernier segment, sans query string)."""
+    return video_url.rstrip('/').split('?')[0].split('/')[-1]
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Code HTTP d'une exception google.api_core (429, 503...), sinon None."""
+    code = getattr(error, 'code', None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _incomplete(error: str, timestamp: str) -> Dict[str, Any]:
+    """Échec d'une vidéo dans un lot, à renvoyer par l'appelant."""
+    return {'success': False, 'error': error, 'incomplete': True, 'timestamp': timestamp}
+
+
+def incomplete_retries(video_urls: List[str],
+                       results: Dict[str, Dict[str, Any]]) -> List[List[str]]:
+    """Lots à renvoyer pour les vidéos `incomplete` d'une requête groupée.
+
+    Si tout le lot est à refaire (réponse illisible), il est coupé en deux ;
+    sinon seules les vidéos manquantes sont redemandées. Chaque lot renvoyé
+    est strictement plus petit : les tentatives se terminent toujours.
+    """
+    incomplete = [url for url in video_urls if results.get(url, {}).get('incomplete')]
+    if not incomplete:
+        return []
+    if len(incomplete) == len(video_urls):
+        if len(incomplete) == 1:
+            return []
+        middle = len(incomplete) // 2
+        return [incomplete[:middle], incomplete[middle:]]
+    return [incomplete]
+
 
 class GeminiService:
     """Service d'analyse Gemini pour les vidéos TikTok."""
@@ -56,6 +169,58 @@ class GeminiService:
             logger.error(f"Error cleaning JSON string: {e}")
             return s
 
+    def _video_request(self, video_url: str) -> List[str]:
+        """Contenu de la requête d'analyse d'une vidéo."""
+        # Test prompt for comprehensive video analysis
+        prompt = ANALYSIS_PROMPT
+        return [
+            prompt,
+            f"Video URL: {video_url}\nPlease analyze this video and provide the response in the exact JSON format specified above."
+        ]
+
+    def _parse_video_response(self, response) -> Dict[str, Any]:
+        """Résultat d'analyse à partir de la réponse Gemini d'une vidéo."""
+        logger.info("📥 Received response from Gemini")
+        get_gemini_health().record_success()
+
+        # Log raw response for debugging
+        raw_response = response.text
+        logger.debug(f"Raw response:\n{raw_response}")
+
+        try:
+            # Clean and parse JSON
+            cleaned_json = self._clean_json_string(raw_response)
+            analysis = json.loads(cleaned_json)
+            logger.info("✅ Successfully parsed JSON response")
+
+            return {
+                'success': True,
+                'analysis': analysis,
+                'raw_response': raw_response,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except json.JSONDecodeError as je:
+            logger.error(f"❌ Failed to parse JSON: {je}")
+            return {
+                'success': False,
+                'error': f"JSON parsing error: {str(je)}",
+                'raw_response': raw_response,
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def _request_failure(self, error: Exception) -> Dict[str, Any]:
+        """Résultat d'échec d'un appel à l'API Gemini."""
+        logger.error(f"❌ Error during analysis: {str(error)}")
+        get_gemini_health().record_failure(str(error), _status_code(error))
+        return {
+            'success': False,
+            'error': str(error),
+            'status_code': _status_code(error),
+            'error_type': type(error).__name__,
+            'timestamp': datetime.now().isoformat()
+        }
+
     def analyze_tiktok_video(self, video_url: str) -> Dict[str, Any]:
         """
         Analyze a TikTok video using Gemini 2.0 Flash.
@@ -66,106 +231,157 @@ class GeminiService:
         Returns:
             Dictionary containing analysis results
         """
-        # Test prompt for comprehensive video analysis
-        prompt = """
-        Analyze this TikTok video and provide a detailed analysis in the following format:
+        try:
+            logger.info(f"🧠 Analyzing video: {video_url}")
+            logger.info("📤 Sending request to Gemini...")
 
-        {
-            "visual_analysis": {
-                "main_elements": "",
-                "style_quality": "",
-                "text_overlays": "",
-                "transitions": ""
-            },
-            "content_structure": {
-                "hook_effectiveness": "",
-                "story_flow": "",
-                "call_to_action": "",
-                "organization": ""
-            },
-            "engagement_factors": {
-                "emotional_triggers": "",
-                "audience_connection": "",
-                "viral_potential": "",
-                "unique_points": ""
-            },
-            "technical_elements": {
-                "length_optimization": "",
-                "sound_design": "",
-                "pacing": "",
-                "production_quality": ""
-            },
-            "trend_alignment": {
-                "current_trends": "",
-                "hashtag_potential": "",
-                "similar_content": ""
-            },
-            "improvement_suggestions": {
-                "viral_optimization": "",
-                "specific_recommendations": ""
-            }
-        }
+            # Generate response from Gemini
+            response = self.model.generate_content(self._video_request(video_url))
+            return self._parse_video_response(response)
 
-        Please fill in each field with your analysis. Keep the JSON structure exactly as shown, just fill in the values.
-        Ensure your response is valid JSON. Do not include any markdown formatting or code block markers.
+        except Exception as e:
+            return self._request_failure(e)
+
+    async def analyze_tiktok_video_async(
+        self,
+        video_url: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
+        Analyse asynchrone d'une vidéo (API async du SDK), sans bloquer la
+        boucle d'événements.
+
+        Args:
+            video_url: Direct URL to TikTok video
+            timeout: Délai maximum de l'appel, en secondes (None : illimité)
 
+        Returns:
+            Dictionary containing analysis results
+        """
         try:
-            logger.info(f"🧠 Analyzing video: {video_url}")
-            logger.info("📤 Sending request to Gemini...")
+            logger.info(f"🧠 Analyzing video (async): {video_url}")
+            response = await asyncio.wait_for(
+                self.model.generate_content_async(self._video_request(video_url)),
+                timeout=timeout)
+            return self._parse_video_response(response)
+
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ Gemini analysis timed out after {timeout}s: {video_url}")
+            return {
+                'success': False,
+                'error': f"Gemini analysis timed out after {timeout}s",
+                'status_code': 504,
+                'timestamp': datetime.now().isoformat()
+            }
 
-            # Generate response from Gemini
-            response = self.model.generate_content([
-                prompt,
-                f"Video URL: {video_url}\nPlease analyze this video and provide the response in the exact JSON format specified above."
-            ])
+        except Exception as e:
+            return self._request_failure(e)
 
-            logger.info("📥 Received response from Gemini")
+    def analyze_tiktok_videos(
+        self,
+        video_urls: List[str],
+        max_batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyse plusieurs vidéos en envoyant les instructions une seule fois
+        par requête.
 
-            # Log raw response for debugging
-            raw_response = response.text
-            logger.debug(f"Raw response:\n{raw_response}")
-
-            try:
-                # Clean and parse JSON
-                cleaned_json = self._clean_json_string(raw_response)
-                analysis = json.loads(cleaned_json)
-                logger.info("✅ Successfully parsed JSON response")
-
-                return {
-                    'success': True,
-                    'analysis': analysis,
-                    'raw_response': raw_response,
-                    'timestamp': datetime.now().isoformat()
-                }
-
-            except json.JSONDecodeError as je:
-                logger.error(f"❌ Failed to parse JSON: {je}")
-                return {
-                    'success': False,
-                    'error': f"JSON parsing error: {str(je)}",
-                    'raw_response': raw_response,
-                    'timestamp': datetime.now().isoformat()
-                }
+        Une seule requête par lot : les vidéos d'une réponse illisible ou
+        absentes de la réponse reviennent en échec marqué `incomplete`, à
+        renvoyer par l'appelant (voir `incomplete_retries`) en passant par
+        son limiteur de débit.
+
+        Args:
+            video_urls: URLs des vidéos TikTok
+            max_batch_size: Nombre maximum de vidéos par requête
+
+        Returns:
+            Résultat par URL, au même format que analyze_tiktok_video
+        """
+        results = {}
+        batch_size = max(1, max_batch_size)
+        for start in range(0, len(video_urls), batch_size):
+            results.update(self._analyze_batch(video_urls[start:start + batch_size]))
+        return results
+
+    def _analyze_batch(self, video_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Une requête pour le lot, sans nouvelle tentative.
+
+        Les URLs d'une même vidéo (query string, lien court et lien
+        canonique) ne sont demandées qu'une fois : le résultat est recopié
+        pour chacune d'elles.
+        """
+        urls_by_id: Dict[str, List[str]] = {}
+        for url in video_urls:
+            urls_by_id.setdefault(video_id_from_url(url), []).append(url)
+
+        if len(urls_by_id) == 1:
+            result = self.analyze_tiktok_video(video_urls[0])
+            return {url: dict(result) for url in video_urls}
+
+        video_list = "\n".join(f"- id: {video_id}, URL: {urls[0]}"
+                               for video_id, urls in urls_by_id.items())
 
+        try:
+            logger.info(f"🧠 Analyzing {len(urls_by_id)} videos in one request")
+            response = self.model.generate_content([
+                BATCH_ANALYSIS_PROMPT,
+                f"Videos:\n{video_list}\nPlease analyze these videos and provide the response in the exact JSON format specified above."
+            ])
+            raw_response = response.text
+            logger.debug(f"Raw batch response:\n{raw_response}")
+            get_gemini_health().record_success()
         except Exception as e:
-            logger.error(f"❌ Error during analysis: {str(e)}")
-            return {
+            # Erreur d'API (quota, indisponibilité) : la couper ne servirait à rien
+            logger.error(f"❌ Error during batch analysis: {str(e)}")
+            get_gemini_health().record_failure(str(e), _status_code(e))
+            failure = {
                 'success': False,
                 'error': str(e),
+                'status_code': _status_code(e),
+                'error_type': type(e).__name__,
                 'timestamp': datetime.now().isoformat()
             }
+            return {url: dict(failure) for url in video_urls}
 
-    def is_available(self) -> bool:
-        """Check if Gemini service is available and working."""
+        timestamp = datetime.now().isoformat()
         try:
-            # Simple test to verify the service is working
-            test_result = self.analyze_tiktok_video(
-                "https://www.tiktok.com/@test/video/123")
-            return test_result.get('success', False)
-        except Exception as e:
-            logger.warning(f"⚠️ Gemini service not available: {e}")
-            return False
+            analyses = json.loads(self._clean_json_string(raw_response))
+            if not isinstance(analyses, dict):
+                raise ValueError("batch response is not a JSON object")
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"⚠️ Unparsable batch response for {len(video_urls)} videos: {e}")
+            return {url: _incomplete("Unparsable batch response", timestamp) for url in video_urls}
+
+        results = {}
+        for video_id, urls in urls_by_id.items():
+            analysis = analyses.get(video_id)
+            for url in urls:
+                if isinstance(analysis, dict):
+                    results[url] = {
+                        'success': True,
+                        'analysis': analysis,
+                        # Uniquement la partie de la réponse propre à cette vidéo
+                        'raw_response': json.dumps(analysis, ensure_ascii=False),
+                        'batch_size': len(urls_by_id),
+                        'timestamp': timestamp
+                    }
+                else:
+                    results[url] = _incomplete("Missing from batch response", timestamp)
+
+        missing = sum(1 for result in results.values() if not result['success'])
+        if missing:
+            logger.warning(f"⚠️ {missing} videos missing from batch response")
+        logger.info(f"✅ Batch analysis parsed for {len(results) - missing} videos")
+        return results
+
+    def is_available(self) -> bool:
+        """Check if Gemini service is available, from the shared health state.
+
+        No analysis is sent: the state comes from recent requests, or from a
+        model-list ping once it is older than its TTL.
+        """
+        return get_gemini_health().is_available()
 
 
 # Global instance for easy access
@@ -205,3 +421,56 @@ def analyze_tiktok_video(video_url: str) -> Dict[str, Any]:
         }
 
     return service.analyze_tiktok_video(video_url)
+
+
+async def analyze_tiktok_video_async(
+    video_url: str,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Convenience coroutine to analyze a TikTok video without blocking the event loop.
+
+    Args:
+        video_url: Direct URL to TikTok video
+        timeout: Maximum duration of the call, in seconds
+
+    Returns:
+        Dictionary containing analysis results
+    """
+    service = get_gemini_service()
+    if service is None:
+        return {
+            'success': False,
+            'error': 'Gemini service not available',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    return await service.analyze_tiktok_video_async(video_url, timeout=timeout)
+
+
+def analyze_tiktok_videos(
+    video_urls: List[str],
+    max_batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Convenience function to analyze several TikTok videos in batched requests.
+
+    Args:
+        video_urls: Direct URLs to TikTok videos
+        max_batch_size: Maximum number of videos per request
+
+    Returns:
+        Analysis results keyed by video URL
+    """
+    service = get_gemini_service()
+    if service is None:
+        return {
+            url: {
+                'success': False,
+                'error': 'Gemini service not available',
+                'timestamp': datetime.now().isoformat()
+            }
+            for url in video_urls
+        }
+
+    return service.analyze_tiktok_videos(video_urls, max_batch_size)
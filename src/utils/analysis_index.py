@@ -0,0 +1,91 @@
+"""
+Index of Gemini analysis files by video id.
+
+The pipeline stores one file per video under
+data/dataset_<name>/gemini_analysis/<account>/<date>/video_<id>_analysis.json.
+Looking each video up with rglob walks the whole tree once per video; the
+index walks it once and is then kept up to date by run_gemini_phase.
+"""
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_FILE_PATTERN = re.compile(r'^video_(.+)_analysis\.json$')
+
+
+class GeminiAnalysisIndex:
+    """Maps video ids to their Gemini analysis file under a root directory."""
+
+    def __init__(self, root: Path):
+        """Initialize an index for `root`; the tree is walked on first use."""
+        self.root = Path(root)
+        self._paths: Dict[str, Path] = {}
+        self._built = False
+        self._lock = threading.Lock()
+
+    def build(self) -> 'GeminiAnalysisIndex':
+        """Walk the tree once. The first file in sorted path order wins for duplicate ids."""
+        with self._lock:
+            self._paths = {}
+            if self.root.exists():
+                for path in sorted(self.root.rglob('video_*_analysis.json')):
+                    match = ANALYSIS_FILE_PATTERN.match(path.name)
+                    if match:
+                        self._paths.setdefault(match.group(1), path)
+            self._built = True
+        logger.info(f"📇 Indexed {len(self._paths)} Gemini analyses under {self.root}")
+        return self
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def add(self, video_id: str, path: Path):
+        """Register a newly written analysis file without walking the tree again."""
+        with self._lock:
+            if self._built:
+                self._paths.setdefault(str(video_id), Path(path))
+
+    def get(self, video_id: str) -> Optional[Path]:
+        """Path of the analysis file for `video_id`, or None."""
+        self._ensure_built()
+        return self._paths.get(str(video_id))
+
+    def load(self, video_id: str) -> Optional[Dict]:
+        """Load the analysis for `video_id`, unwrapping the service response if needed."""
+        path = self.get(video_id)
+        if path is None:
+            return None
+
+        with open(path, 'r') as f:
+            analysis_data = json.load(f)
+
+        # Extract the analysis field from the response structure
+        if analysis_data.get('success') and 'analysis' in analysis_data:
+            return analysis_data['analysis']
+        return analysis_data  # Fallback for old format
+
+    def __contains__(self, video_id: str) -> bool:
+        return self.get(video_id) is not None
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._paths)
+
+
+_indexes: Dict[Path, GeminiAnalysisIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_analysis_index(root: Path) -> GeminiAnalysisIndex:
+    """Shared index for `root`, so writers and readers of one run see the same map."""
+    key = Path(root).resolve()
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = GeminiAnalysisIndex(key)
+        return _indexes[key]
@@ -0,0 +1,141 @@
+"""
+Token-bucket rate limiting for external API calls (Gemini).
+
+Two buckets are enforced together: requests per minute and tokens per
+minute. Callers block in acquire() until both budgets allow the call.
+Throttling responses (429/5xx) trigger an adaptive backoff: a global pause
+that grows exponentially, plus a rate reduction that recovers gradually
+on success (AIMD).
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Status codes treated as "slow down" rather than as a failed analysis
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# google.api_core exception classes of the same errors, when no code was kept
+RETRYABLE_ERROR_TYPES = {'ResourceExhausted', 'TooManyRequests', 'InternalServerError',
+                         'BadGateway', 'ServiceUnavailable', 'GatewayTimeout',
+                         'DeadlineExceeded'}
+
+
+def is_retryable_failure(result: dict) -> bool:
+    """True when a failed service result is throttling or a server error.
+
+    Decided from `status_code`, else from `error_type` (exception class
+    name), never from the error text: a parse error mentioning "column
+    1503" must not cost another paid request.
+    """
+    if result.get('success'):
+        return False
+    status_code = result.get('status_code')
+    if status_code is not None:
+        return int(status_code) in RETRYABLE_STATUS_CODES
+    return result.get('error_type') in RETRYABLE_ERROR_TYPES
+
+
+class _Bucket:
+    """One token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float, rate_factor: float):
+        self.level = min(self.capacity,
+                         self.level + (now - self.updated) * self.rate * rate_factor)
+        self.updated = now
+
+    def wait_time(self, amount: float, rate_factor: float) -> float:
+        # Une demande plus grosse que la capacité attend un bucket plein
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / (self.rate * rate_factor)
+
+
+class TokenBucketLimiter:
+    """Thread-safe limiter honoring requests-per-minute and tokens-per-minute budgets."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        initial_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            requests_per_minute: Request budget (also the burst size)
+            tokens_per_minute: Token budget, None for no token limit
+            initial_backoff: First pause after a throttled call, in seconds
+            max_backoff: Upper bound of the exponential pause
+            clock, sleep: Injectable for tests
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now)
+        self._tokens = _Bucket(tokens_per_minute, now) if tokens_per_minute else None
+
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._backoff = initial_backoff
+        self._paused_until = 0.0
+        self.rate_factor = 1.0
+        self.throttled_count = 0
+
+    def acquire(self, tokens: float = 0) -> float:
+        """Block until one request (and `tokens` tokens) may be sent.
+
+        Returns:
+            Total time waited, in seconds
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._requests.refill(now, self.rate_factor)
+                if self._tokens:
+                    self._tokens.refill(now, self.rate_factor)
+
+                wait = max(self._paused_until - now,
+                           self._requests.wait_time(1, self.rate_factor),
+                           self._tokens.wait_time(tokens, self.rate_factor) if self._tokens else 0.0)
+                if wait <= 0:
+                    self._requests.level -= 1
+                    if self._tokens:
+                        self._tokens.level -= min(tokens, self._tokens.capacity)
+                    return waited
+
+            self._sleep(wait)
+            waited += wait
+
+    def report_success(self):
+        """Recover the rate gradually after throttling (additive increase)."""
+        with self._lock:
+            self._backoff = self.initial_backoff
+            self.rate_factor = min(1.0, self.rate_factor + 0.05)
+
+    def report_throttled(self, retry_after: Optional[float] = None):
+        """Pause every caller and halve the rate (multiplicative decrease)."""
+        with self._lock:
+            pause = retry_after if retry_after is not None else self._backoff
+            self._paused_until = max(self._paused_until, self._clock() + pause)
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            self.rate_factor = max(0.1, self.rate_factor / 2)
+            self.throttled_count += 1
+        logger.warning(
+            f"⏳ Throttled by API: pausing {pause:.1f}s, rate at {self.rate_factor:.0%}")
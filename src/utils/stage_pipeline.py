@@ -0,0 +1,122 @@
+"""
+Streaming stage pipeline with bounded queues.
+
+Items flow through a chain of stages, each served by its own worker
+threads. Bounded queues between stages apply backpressure: a fast stage
+blocks instead of running a whole batch ahead of a slow one. An item moves
+to the next stage as soon as it leaves the previous one, so a batch takes
+about as long as its slowest stage instead of the sum of all stages.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline.
+
+    `func` receives the payload produced by the previous stage and returns
+    the payload for the next one. Returning None drops the item (e.g. it
+    failed validation and was already reported); raising marks it failed.
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of StagePipeline.run, in completion order."""
+    completed: List[Tuple[Hashable, Any]] = field(default_factory=list)
+    failed: List[Tuple[Hashable, str, Exception]] = field(default_factory=list)
+    dropped: List[Tuple[Hashable, str]] = field(default_factory=list)
+    # Busy time per stage, summed over its workers
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class StagePipeline:
+    """Runs (key, payload) items through stages connected by bounded queues."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, items: Iterable[Tuple[Hashable, Any]]) -> PipelineResult:
+        """Feed `items` through every stage and wait for the last one to drain."""
+        result = PipelineResult(stage_seconds={stage.name: 0.0 for stage in self.stages})
+        lock = threading.Lock()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [max(1, stage.workers) for stage in self.stages]
+
+        def worker(index: int):
+            stage = self.stages[index]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(self.stages) else None
+            try:
+                while True:
+                    entry = inbox.get()
+                    if entry is _DONE:
+                        break
+                    key, payload = entry
+
+                    start = time.perf_counter()
+                    try:
+                        output = stage.func(payload)
+                    except Exception as e:
+                        logger.error(f"❌ Stage {stage.name} failed for {key}: {e}")
+                        with lock:
+                            result.failed.append((key, stage.name, e))
+                        continue
+                    finally:
+                        with lock:
+                            result.stage_seconds[stage.name] += time.perf_counter() - start
+
+                    if output is None:
+                        with lock:
+                            result.dropped.append((key, stage.name))
+                    elif outbox is None:
+                        with lock:
+                            result.completed.append((key, output))
+                    else:
+                        outbox.put((key, output))
+            finally:
+                # The last worker of a stage closes the next stage
+                with lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                if last and outbox is not None:
+                    for _ in range(max(1, self.stages[index + 1].workers)):
+                        outbox.put(_DONE)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,),
+                             name=f"stage-{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(max(1, stage.workers))
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(max(1, self.stages[0].workers)):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        result.elapsed = time.perf_counter() - start
+
+        return result
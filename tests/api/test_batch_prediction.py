@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for batched model inference: one model call for many videos.
+"""
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.ml_model import MLModelManager, ml_manager
+from src.api.models import MAX_BATCH_PREDICTIONS
+
+
+class CountingModel:
+    """Model double recording every predict call; the score grows with duration."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, matrix):
+        self.calls.append(len(matrix))
+        # "duration" is the first model column
+        return np.log1p(np.asarray(matrix, dtype=float)[:, 0] / 100)
+
+
+def _manager():
+    manager = MLModelManager()
+    manager.model = CountingModel()
+    return manager
+
+
+def test_predict_batch_uses_one_model_call():
+    """Fifty videos are scored with a single predict call."""
+    manager = _manager()
+    features_list = [{"duration": float(i)} for i in range(50)]
+
+    predictions = manager.predict_batch(features_list)
+
+    assert manager.model.calls == [50]
+    assert len(predictions) == 50
+    assert predictions[30]["virality_score"] == pytest.approx(0.3)
+
+
+def test_predict_batch_matches_single_predictions():
+    """Batch scores, recommendations and metadata match per-video predict."""
+    manager = _manager()
+    features_list = [
+        {"duration": 50.0, "estimated_hashtag_count": 12},
+        {"duration": 250.0, "audience_connection_score": 0.9},
+        {"duration": -50.0},
+    ]
+
+    batch = manager.predict_batch(features_list)
+    single = [manager.predict(features) for features in features_list]
+
+    assert batch == single
+    assert batch[1]["virality_score"] == pytest.approx(2.5e-6)
+    assert batch[2]["virality_score"] == 0.0
+
+
+def test_predict_batch_endpoint(monkeypatch):
+    """/inference/predict-batch returns one prediction per feature dict."""
+    model = CountingModel()
+    monkeypatch.setattr(ml_manager, "model", model)
+
+    client = TestClient(app)
+    response = client.post("/inference/predict-batch",
+                           json={"features": [{"duration": 10}, {"duration": 40}]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert [p["virality_score"] for p in body["predictions"]] == pytest.approx([0.1, 0.4])
+    assert model.calls == [2]
+
+
+def test_bad_row_only_mocks_its_own_prediction():
+    """A value that is not a number mocks that video only; the rest go to the model."""
+    manager = _manager()
+    features_list = [{"duration": 10.0}, {"duration": None}, {"duration": "abc"}, {"duration": 40.0}]
+
+    predictions = manager.predict_batch(features_list)
+
+    assert manager.model.calls == [2]
+    assert [p["virality_score"] for p in predictions] == pytest.approx([0.1, 0.75, 0.75, 0.4])
+
+
+def test_predict_batch_endpoint_rejects_oversized_batches():
+    """/inference/predict-batch refuses more than MAX_BATCH_PREDICTIONS feature dicts."""
+    client = TestClient(app)
+    response = client.post("/inference/predict-batch",
+                           json={"features": [{"duration": 1}] * (MAX_BATCH_PREDICTIONS + 1)})
+
+    assert response.status_code == 422
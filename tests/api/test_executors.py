@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded executors that keep model, feature and cache work
+off the event loop.
+"""
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src.api import executors
+from src.api.executors import BoundedExecutor, run_external, run_io
+from src.api.main import app, gemini_service
+from src.api.tiered_cache import TieredCache
+
+
+def test_backlog_is_bounded():
+    """Callers beyond max_pending wait on the loop instead of queueing in the pool."""
+    executor = BoundedExecutor("test", max_workers=1, max_pending=2)
+    release = threading.Event()
+    started = []
+
+    def work(i):
+        started.append(i)
+        release.wait(5)
+        return i
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(executor.run(work, i)) for i in range(5)]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        release.set()
+        return stats, await asyncio.gather(*tasks)
+
+    stats, results = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert results == [0, 1, 2, 3, 4]
+    assert stats["in_flight"] == 2
+    assert stats["waiting"] == 3
+    assert executor.stats()["completed"] == 5
+
+
+def test_event_loop_stays_responsive_during_cpu_work():
+    """A blocking call in the pool does not stall other coroutines."""
+    executor = BoundedExecutor("test", max_workers=1, max_pending=4)
+
+    async def scenario():
+        ticks = 0
+        work = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+        while not work.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks
+
+    ticks = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert ticks >= 10
+
+
+def test_executor_restarts_after_shutdown():
+    """Pools are recreated on the next call after a shutdown (app restarts, tests)."""
+    executor = BoundedExecutor("test", max_workers=2, max_pending=2)
+
+    assert asyncio.run(executor.run(sum, [1, 2])) == 3
+    executor.shutdown()
+    assert asyncio.run(executor.run(sum, [3, 4])) == 7
+    executor.shutdown()
+
+
+def test_slow_external_calls_do_not_block_io(monkeypatch):
+    """A saturated external pool leaves the I/O pool (cache, /health, /metrics) free."""
+    monkeypatch.setattr(executors, "external_executor", BoundedExecutor("external", 1, 1))
+    release = threading.Event()
+
+    async def scenario():
+        slow = [asyncio.ensure_future(run_external(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        result = await asyncio.wait_for(run_io(sum, [1, 2]), timeout=1)
+        release.set()
+        await asyncio.gather(*slow)
+        return result
+
+    assert asyncio.run(scenario()) == 3
+    executors.external_executor.shutdown()
+
+
+def test_async_cache_access(tmp_path):
+    """aget/aset go through the I/O pool and share the tiers of get/set."""
+    cache = TieredCache("video", ttl_seconds=60, path=tmp_path / "cache.sqlite")
+
+    async def scenario():
+        await cache.aset("k", {"views": 1})
+        return await cache.aget("k"), await cache.aget("missing")
+
+    assert asyncio.run(scenario()) == ({"views": 1}, None)
+    assert cache.get("k") == {"views": 1}
+    assert cache.stats()["misses"] == 1
+
+
+def test_health_reports_executors():
+    """/health exposes the usage of the CPU, I/O and external pools."""
+    with TestClient(app) as client:
+        response = client.get("/health")
+
+    pools = response.json()["executors"]
+    assert set(pools) == {"cpu", "io", "external"}
+    assert pools["cpu"]["workers"] >= 1
+    assert pools["io"]["max_pending"] >= pools["io"]["workers"]
+
+
+def test_health_probe_runs_on_the_external_pool(monkeypatch):
+    """The Gemini ping of /health is a network call: it stays off the I/O pool."""
+    threads = []
+
+    def health_status(probe=False):
+        threads.append(threading.current_thread().name)
+        return {"available": False, "state": "not_installed"}
+
+    monkeypatch.setattr(gemini_service, "health_status", health_status)
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+
+    assert threads and threads[0].startswith("api-external")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the async Gemini path of the API: no blocking on the event loop,
+bounded concurrency and per-request timeouts.
+"""
+import asyncio
+import json
+import time
+
+import src.api.gemini_integration as gemini_integration
+from src.services.gemini_service import GeminiService
+
+
+class SlowAsyncModel:
+    """Gemini model double whose async call takes `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def generate_content_async(self, parts):
+        await asyncio.sleep(self.delay)
+        return type("Response", (), {"text": json.dumps({"visual_analysis": {}})})()
+
+
+def _service(delay):
+    service = GeminiService.__new__(GeminiService)
+    service.model = SlowAsyncModel(delay)
+    return service
+
+
+def test_async_analysis_times_out():
+    """A call slower than the timeout returns a retryable failure instead of hanging."""
+    result = asyncio.run(_service(0.5).analyze_tiktok_video_async(
+        "https://www.tiktok.com/@test/video/1", timeout=0.05))
+
+    assert not result["success"]
+    assert result["status_code"] == 504
+
+
+def test_analysis_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    """Other coroutines keep running while analyses are in flight, within the concurrency bound."""
+    monkeypatch.chdir(tmp_path)
+    in_flight, peak = 0, 0
+
+    async def fake_analyze(video_url, timeout=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return {"success": True, "analysis": {}}
+
+    monkeypatch.setattr(gemini_integration, "analyze_tiktok_video_async", fake_analyze,
+                        raising=False)
+    monkeypatch.setenv("GEMINI_MAX_CONCURRENCY", "2")
+    service = gemini_integration.GeminiIntegrationService()
+    service.available = True
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        urls = [f"https://www.tiktok.com/@test/video/{i}" for i in range(4)]
+        await asyncio.gather(ticker(), *(service.analyze_video(url, use_cache=False)
+                                         for url in urls))
+        return ticks
+
+    assert asyncio.run(scenario()) == 10
+    assert peak == 2
+
+
+def _batch_service(monkeypatch, batch_size=2):
+    monkeypatch.setenv("GEMINI_BATCH_SIZE", str(batch_size))
+    service = gemini_integration.GeminiIntegrationService()
+    service.available = True
+    return service
+
+
+def test_batch_analysis_checks_cache_and_resends_incomplete(monkeypatch):
+    """Cached videos are not sent; videos missing from a response are sent again."""
+    requests = []
+
+    def fake_batch(video_urls, max_batch_size=5):
+        requests.append(list(video_urls))
+        first_try = len(requests) <= 2
+        return {url: ({"success": False, "error": "Missing from batch response", "incomplete": True}
+                      if first_try and url.endswith("/2") else
+                      {"success": True, "analysis": {"id": url[-1]}})
+                for url in video_urls}
+
+    monkeypatch.setattr(gemini_integration, "analyze_tiktok_videos", fake_batch, raising=False)
+    service = _batch_service(monkeypatch)
+    urls = [f"https://www.tiktok.com/@test/video/{i}" for i in range(5)]
+
+    async def scenario():
+        await service.cache_gemini_analysis(urls[0], {"success": True, "analysis": {"id": "cached"}})
+        return await service.analyze_videos(urls)
+
+    results = asyncio.run(scenario())
+
+    assert sorted(map(sorted, requests)) == [[urls[1], urls[2]], [urls[2]], [urls[3], urls[4]]]
+    assert results[urls[0]]["analysis"] == {"id": "cached"}
+    assert all(results[url]["success"] for url in urls)
+    assert service.cache.get(service._get_cache_key(urls[2]))["analysis"] == {"id": "2"}
+
+
+def test_single_video_callers_join_the_batch(monkeypatch):
+    """analyze_video for a video being batched waits on the batch instead of calling Gemini."""
+    single_calls = []
+
+    def fake_batch(video_urls, max_batch_size=5):
+        time.sleep(0.1)
+        return {url: {"success": True, "analysis": {"id": url[-1]}} for url in video_urls}
+
+    async def fake_analyze(video_url, timeout=None):
+        single_calls.append(video_url)
+        return {"success": True, "analysis": {"id": "single"}}
+
+    monkeypatch.setattr(gemini_integration, "analyze_tiktok_videos", fake_batch, raising=False)
+    monkeypatch.setattr(gemini_integration, "analyze_tiktok_video_async", fake_analyze,
+                        raising=False)
+    service = _batch_service(monkeypatch, batch_size=5)
+    urls = [f"https://www.tiktok.com/@test/video/{i}" for i in range(3)]
+
+    async def scenario():
+        batch = asyncio.ensure_future(service.analyze_videos(urls, use_cache=False))
+        await asyncio.sleep(0.02)
+        single = await service.analyze_video(urls[1], use_cache=False)
+        return single, await batch
+
+    single, results = asyncio.run(scenario())
+
+    assert single_calls == []
+    assert single["analysis"] == {"id": "1"}
+    assert results[urls[1]]["analysis"] == {"id": "1"}
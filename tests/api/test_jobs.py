@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Tests for the background job subsystem: SQLite job state, bounded
+asyncio workers and the /jobs routes.
+"""
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import src.api.services.tiktok_service as tiktok_service
+from src.api.jobs import JobManager, JobStore, job_manager
+from src.api.main import app
+
+
+def _manager(tmp_path, **kwargs):
+    return JobManager(JobStore(tmp_path / "jobs.sqlite"), poll_interval=0.01, **kwargs)
+
+
+async def _wait_finished(manager, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.store.get(job_id)
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_runs_in_background_and_records_progress(tmp_path):
+    """Submit returns a queued job; a worker runs it and stores events and result."""
+    manager = _manager(tmp_path)
+
+    async def handler(params, report):
+        for i in range(params["steps"]):
+            await report("step", {"i": i})
+            await asyncio.sleep(0)
+        return {"total": params["steps"]}
+
+    manager.register("count", handler)
+
+    async def scenario():
+        job = await manager.submit("count", {"steps": 3})
+        assert job["status"] == "queued"
+        finished = await _wait_finished(manager, job["id"])
+        events = [event async for event in manager.follow(job["id"])]
+        await manager.stop()
+        return finished, events
+
+    finished, events = asyncio.run(scenario())
+
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"total": 3}
+    assert [name for name, _ in events] == ["step", "step", "step", "job"]
+    assert events[-1][1]["status"] == "succeeded"
+
+
+def test_worker_pool_is_bounded(tmp_path):
+    """No more jobs run at once than there are workers."""
+    manager = _manager(tmp_path, workers=2)
+    running = {"now": 0, "max": 0}
+
+    async def handler(params, report):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+
+    manager.register("sleep", handler)
+
+    async def scenario():
+        ids = [(await manager.submit("sleep", {}))["id"] for _ in range(6)]
+        jobs = [await _wait_finished(manager, job_id) for job_id in ids]
+        await manager.stop()
+        return jobs
+
+    jobs = asyncio.run(scenario())
+
+    assert all(job["status"] == "succeeded" for job in jobs)
+    assert running["max"] == 2
+
+
+def test_failures_timeouts_and_cancellation(tmp_path):
+    """Errors and timeouts fail the job; cancel stops a running job."""
+    manager = _manager(tmp_path, workers=3, timeout=0.1)
+
+    async def fail(params, report):
+        raise RuntimeError("Apify down")
+
+    async def hang(params, report):
+        await asyncio.sleep(10)
+
+    manager.register("fail", fail)
+    manager.register("hang", hang)
+
+    async def scenario():
+        failed = (await manager.submit("fail", {}))["id"]
+        timed_out = (await manager.submit("hang", {}))["id"]
+        cancelled = (await manager.submit("hang", {}))["id"]
+        await asyncio.sleep(0.05)
+        await manager.cancel(cancelled)
+        jobs = [await _wait_finished(manager, job_id) for job_id in (failed, timed_out, cancelled)]
+        await manager.stop()
+        return jobs
+
+    failed, timed_out, cancelled = asyncio.run(scenario())
+
+    assert (failed["status"], failed["error"]) == ("failed", "Apify down")
+    assert timed_out["status"] == "failed" and "Timed out" in timed_out["error"]
+    assert cancelled["status"] == "cancelled"
+
+
+def test_stale_running_jobs_are_requeued(tmp_path):
+    """A job whose worker stopped heart-beating goes back to the queue."""
+    now = {"t": 1000.0}
+    store = JobStore(tmp_path / "jobs.sqlite", clock=lambda: now["t"])
+    job_id = store.create("count", {})
+    assert store.claim_next("dead-worker", ["count"])["id"] == job_id
+    assert store.claim_next("other", ["count"]) is None
+
+    now["t"] += 60
+    assert store.requeue_stale(stale_after=120) == 0
+    now["t"] += 120
+    assert store.requeue_stale(stale_after=120) == 1
+
+    claimed = store.claim_next("other", ["count"])
+    assert claimed["id"] == job_id
+    assert claimed["attempts"] == 2
+
+
+def test_jobs_that_keep_losing_their_worker_fail(tmp_path):
+    """After max_attempts lost workers, a stale job is failed instead of re-queued."""
+    now = {"t": 1000.0}
+    store = JobStore(tmp_path / "jobs.sqlite", clock=lambda: now["t"])
+    job_id = store.create("count", {})
+
+    for attempt in (1, 2):
+        assert store.claim_next("worker", ["count"])["attempts"] == attempt
+        now["t"] += 300
+        requeued = store.requeue_stale(stale_after=120, max_attempts=2)
+
+    assert requeued == 0
+    job = store.get(job_id)
+    assert job["status"] == "failed"
+    assert "lost 2 times" in job["error"]
+    assert store.claim_next("worker", ["count"]) is None
+
+
+def test_stale_worker_cannot_overwrite_the_new_owner(tmp_path):
+    """A worker whose job was re-queued and claimed elsewhere does not record its outcome."""
+    now = {"t": 1000.0}
+    store = JobStore(tmp_path / "jobs.sqlite", clock=lambda: now["t"])
+    job_id = store.create("count", {})
+    store.claim_next("stale-worker", ["count"])
+    now["t"] += 300
+    store.requeue_stale(stale_after=120)
+    store.claim_next("new-worker", ["count"])
+
+    assert not store.finish(job_id, "stale-worker", "failed", error="late")
+    assert store.get(job_id)["status"] == "running"
+    assert store.finish(job_id, "new-worker", "succeeded", result={"ok": True})
+    assert not store.finish(job_id, "new-worker", "failed", error="twice")
+
+    job = store.get(job_id)
+    assert (job["status"], job["result"], job["error"]) == ("succeeded", {"ok": True}, None)
+
+
+def test_clean_stop_does_not_use_an_attempt(tmp_path):
+    """Jobs re-queued by a stopping worker keep their attempt count."""
+    store = JobStore(tmp_path / "jobs.sqlite")
+    store.create("count", {})
+    store.claim_next("worker", ["count"])
+
+    assert store.requeue_owned("worker") == 1
+    assert store.claim_next("worker", ["count"])["attempts"] == 1
+
+
+def test_store_calls_stay_off_the_event_loop(tmp_path):
+    """Claims, progress events and results are written from the I/O pool."""
+    loop_thread = threading.get_ident()
+    threads = set()
+
+    class RecordingStore(JobStore):
+        def claim_next(self, owner, kinds):
+            threads.add(threading.get_ident())
+            return super().claim_next(owner, kinds)
+
+        def add_event(self, job_id, event, payload):
+            threads.add(threading.get_ident())
+            return super().add_event(job_id, event, payload)
+
+        def finish(self, job_id, owner, status, result=None, error=None):
+            threads.add(threading.get_ident())
+            return super().finish(job_id, owner, status, result, error)
+
+    manager = JobManager(RecordingStore(tmp_path / "jobs.sqlite"), poll_interval=0.01)
+
+    async def handler(params, report):
+        await report("step", {})
+        return {}
+
+    manager.register("count", handler)
+
+    async def scenario():
+        job = await manager.submit("count", {})
+        finished = await _wait_finished(manager, job["id"])
+        await manager.stop()
+        return finished
+
+    assert asyncio.run(scenario())["status"] == "succeeded"
+    assert threads and loop_thread not in threads
+
+
+class FakeScraperIntegration:
+    async def get_profile_data(self, username, max_videos):
+        return {"profile_info": {"username": username},
+                "videos": [{"id": str(i), "videoMeta": {"duration": 20}} for i in range(max_videos)]}
+
+
+class RecordingModelManager:
+    def get_feature_names(self):
+        return ["duration"]
+
+    def predict_batch(self, features_list):
+        return [{"virality_score": 0.5} for _ in features_list]
+
+
+def test_profile_analysis_job_routes(tmp_path, monkeypatch):
+    """POST /jobs/profile-analysis returns 202 and the job can be polled and streamed."""
+    monkeypatch.setattr(job_manager, "store", JobStore(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(job_manager, "poll_interval", 0.01)
+    monkeypatch.setattr(tiktok_service, "tiktok_scraper_integration", FakeScraperIntegration())
+    monkeypatch.setattr(tiktok_service, "ml_manager", RecordingModelManager())
+
+    with TestClient(app) as client:
+        submitted = client.post("/jobs/profile-analysis",
+                                json={"username": "t", "max_videos": 3, "use_cache": False,
+                                      "use_gemini": False})
+        assert submitted.status_code == 202
+        job_id = submitted.json()["id"]
+
+        deadline = time.monotonic() + 5
+        while client.get(f"/jobs/{job_id}").json()["status"] != "succeeded":
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+        job = client.get(f"/jobs/{job_id}").json()
+        streamed = client.get(f"/jobs/{job_id}/events?stream=ndjson").text.splitlines()
+        missing = client.get("/jobs/unknown")
+
+    assert job["result"]["videos_analyzed"] == 3
+    assert len(job["result"]["video_analyses"]) == 3
+    assert len(streamed) == 1 + 3 + 1 + 1  # profile, videos, summary, final job state
+    assert missing.status_code == 404
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus-style metrics: histograms, the `timed` decorator,
+the HTTP middleware and the /metrics endpoint.
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.metrics import (EXTERNAL_ERRORS, STAGE_LATENCY, MetricsRegistry, cache_families,
+                             timed)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative, with +Inf, _sum and _count per label set."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_latency_seconds", "Test latency", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, stage="a")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{stage="a"} 4.05' in lines
+    assert 'test_latency_seconds_count{stage="a"} 4' in lines
+
+
+def test_labels_must_match_declaration():
+    """A metric refuses label sets it was not declared with."""
+    registry = MetricsRegistry()
+    errors = registry.counter("test_errors_total", "Test errors", ["service"])
+
+    with pytest.raises(ValueError):
+        errors.inc(stage="x")
+
+
+def test_timed_records_latency_and_external_errors():
+    """Sync and async functions are timed; exceptions and failed results count as errors."""
+    @timed("test_sync", service="test_sync_service")
+    def fetch(fail):
+        if fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+    @timed("test_async", service="test_async_service", failed=lambda result: not result["success"])
+    async def analyze(success):
+        await asyncio.sleep(0)
+        return {"success": success}
+
+    assert fetch(False) == "ok"
+    with pytest.raises(RuntimeError):
+        fetch(True)
+    asyncio.run(analyze(True))
+    asyncio.run(analyze(False))
+
+    assert STAGE_LATENCY.count(stage="test_sync") == 2
+    assert STAGE_LATENCY.count(stage="test_async") == 2
+    assert EXTERNAL_ERRORS.value(service="test_sync_service") == 1
+    assert EXTERNAL_ERRORS.value(service="test_async_service") == 1
+
+
+def test_cache_hit_ratio_from_stats():
+    """Hit ratio counts every tier as a hit and misses as misses."""
+    families = {f.name: f for f in cache_families({
+        "video": {"memory_hits": 6, "disk_hits": 1, "legacy_hits": 1, "misses": 2},
+        "feature": {"hits": 0, "misses": 0},
+    })}
+
+    ratios = {s.labels["cache"]: s.value for s in families["api_cache_hit_ratio"].samples}
+    lookups = {(s.labels["cache"], s.labels["result"]): s.value
+               for s in families["api_cache_lookups_total"].samples}
+    assert ratios == {"video": 0.8}
+    assert lookups[("video", "miss")] == 2
+    assert lookups[("feature", "hit")] == 0
+
+
+def test_metrics_endpoint_exposes_requests_and_stages():
+    """/metrics reports HTTP traffic by route template, model latency and pool usage."""
+    before = STAGE_LATENCY.count(stage="model_predict")
+
+    with TestClient(app) as client:
+        client.post("/inference/predict-batch", json={"features": [{"duration": 20}, {"duration": 40}]})
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'api_http_requests_total{method="POST",route="/inference/predict-batch",status="200"}' in body
+    assert "api_http_requests_in_flight " in body
+    assert 'api_cache_lookups_total{cache="gemini",result="miss"}' in body
+    assert 'api_executor_workers{pool="cpu"}' in body
+    assert STAGE_LATENCY.count(stage="model_predict") == before + 1
+
+
+def test_unmatched_paths_share_one_label():
+    """Unknown paths do not create one time series each."""
+    with TestClient(app) as client:
+        client.get("/no-such-page-123")
+        body = client.get("/metrics").text
+
+    assert "/no-such-page-123" not in body
+    assert 'route="unmatched",status="404"' in body
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the DataFrame-free single-row prediction path.
+"""
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.api.ml_model import EXPECTED_FEATURE_NAMES, MLModelManager
+
+
+def _fitted_manager(tmp_path):
+    """Manager loading a small forest fitted on a DataFrame with shuffled columns."""
+    rng = np.random.default_rng(0)
+    columns = list(reversed(EXPECTED_FEATURE_NAMES))
+    frame = pd.DataFrame(rng.uniform(0, 10, size=(200, len(columns))), columns=columns)
+    target = np.log1p(frame["duration"] / 20 + frame["hour_of_day"] / 40)
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(frame, target)
+
+    path = tmp_path / "model.pkl"
+    joblib.dump(model, path)
+    manager = MLModelManager()
+    manager.model_path = path
+    assert manager.load_model()
+    return manager, model, columns
+
+
+def test_fast_path_matches_dataframe_prediction(tmp_path, recwarn):
+    """NumPy rows in the fitted column order give the DataFrame scores, without warnings."""
+    manager, model, columns = _fitted_manager(tmp_path)
+    features = {"duration": 12.0, "hour_of_day": 7, "has_hook": True, "unknown": "ignored"}
+
+    expected_row = pd.DataFrame([[float(features.get(name, 0.0)) for name in columns]],
+                                columns=columns)
+    expected = manager._normalize_score(float(model.predict(expected_row)[0]))
+
+    prediction = manager.predict(features)
+
+    assert manager.get_feature_names() == columns
+    assert prediction["virality_score"] == pytest.approx(expected, rel=1e-6)
+    assert manager.predict_batch([features])[0] == prediction
+    assert not [w for w in recwarn if "feature names" in str(w.message)]
+
+
+def test_process_warning_filters_are_left_alone(tmp_path):
+    """Loading and predicting do not add entries to the global warning filters."""
+    filters = list(warnings.filters)
+    manager, _, _ = _fitted_manager(tmp_path)
+    manager.load_model()
+    manager.predict({"duration": 12.0})
+    manager.predict_batch([{"duration": 12.0}])
+
+    assert warnings.filters == filters
+
+
+def test_row_buffers_are_per_thread(tmp_path):
+    """Concurrent predictions do not overwrite each other's input row."""
+    manager, _, _ = _fitted_manager(tmp_path)
+    inputs = [{"duration": float(d), "hour_of_day": d % 24} for d in range(40)]
+    expected = [manager.predict(features)["virality_score"] for features in inputs]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        scores = list(pool.map(lambda f: manager.predict(f)["virality_score"], inputs))
+
+    assert scores == expected
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for profile analysis: concurrent Gemini lookups, batch feature
+extraction and a single vectorized prediction.
+"""
+import asyncio
+import time
+
+import src.api.services.tiktok_service as tiktok_service
+from src.api.models import TikTokProfileRequest
+
+
+class FakeScraperIntegration:
+    """Profile source without Apify."""
+
+    def __init__(self, videos):
+        self.videos = videos
+
+    async def get_profile_data(self, username, max_videos):
+        return {"profile_info": {"username": username}, "videos": self.videos[:max_videos]}
+
+
+class SlowGeminiService:
+    """Gemini double: each uncached analysis takes `delay` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batches = []
+
+    def is_available(self):
+        return True
+
+    async def analyze_video(self, url, use_cache=True):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if url.endswith("/3"):
+            return {"success": False, "error": "quota"}
+        return {"success": True, "analysis": {"engagement_factors": {"viral_potential": "High"}}}
+
+    async def analyze_videos(self, urls, use_cache=True):
+        self.batches.append(list(urls))
+        results = await asyncio.gather(*(self.analyze_video(url, use_cache) for url in urls))
+        return dict(zip(urls, results))
+
+
+class RecordingModelManager:
+    """Model manager double recording batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def get_feature_names(self):
+        return ["duration", "viral_potential_score"]
+
+    def predict_batch(self, features_list):
+        self.batches.append(len(features_list))
+        return [{"virality_score": 0.5} for _ in features_list]
+
+
+def _videos(count):
+    return [{"id": str(i), "webVideoUrl": f"https://www.tiktok.com/@test/video/{i}",
+             "videoMeta": {"duration": 20 + i}, "text": "video"} for i in range(count)]
+
+
+def test_profile_analysis_fans_out_and_batches(monkeypatch):
+    """Gemini lookups go out as one batched call and every video is scored in one model call."""
+    gemini = SlowGeminiService(delay=0.2)
+    models = RecordingModelManager()
+    monkeypatch.setattr(tiktok_service, "tiktok_scraper_integration", FakeScraperIntegration(_videos(10)))
+    monkeypatch.setattr(tiktok_service, "gemini_service", gemini)
+    monkeypatch.setattr(tiktok_service, "ml_manager", models)
+
+    start = time.perf_counter()
+    result = asyncio.run(tiktok_service.analyze_tiktok_profile_service(
+        TikTokProfileRequest(username="test", max_videos=10, use_cache=False)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0  # sequential lookups would take 2 s
+    assert gemini.max_in_flight == 10
+    assert gemini.batches == [[video["webVideoUrl"] for video in _videos(10)]]
+    assert models.batches == [10]
+    assert result["videos_analyzed"] == 10
+    assert result["gemini_videos_analyzed"] == 9
+    assert [v["gemini_used"] for v in result["video_analyses"]][2:5] == [True, False, True]
+    assert set(result["video_analyses"][0]["features"]) <= {"duration", "viral_potential_score"}
+
+
+def test_profile_analysis_without_gemini(monkeypatch):
+    """use_gemini=False skips Gemini entirely."""
+    gemini = SlowGeminiService(delay=0.2)
+    monkeypatch.setattr(tiktok_service, "tiktok_scraper_integration", FakeScraperIntegration(_videos(3)))
+    monkeypatch.setattr(tiktok_service, "gemini_service", gemini)
+    monkeypatch.setattr(tiktok_service, "ml_manager", RecordingModelManager())
+
+    result = asyncio.run(tiktok_service.analyze_tiktok_profile_service(
+        TikTokProfileRequest(username="test", max_videos=3, use_cache=False, use_gemini=False)))
+
+    assert gemini.max_in_flight == 0
+    assert result["gemini_used"] is False
+    assert result["videos_analyzed"] == 3
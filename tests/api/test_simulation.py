@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized pre-publication simulation grid.
+"""
+import asyncio
+
+import numpy as np
+
+from src.api.ml_model import MLModelManager
+from src.api.simulation_endpoint import (
+    SimulationRequest, SimulationScenario, TikTokSimulationService
+)
+
+
+class CountingModel:
+    """Model double recording the size of every predict call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, matrix):
+        self.calls.append(len(matrix))
+        # Score driven by hashtag count (third model column)
+        return np.log1p(np.asarray(matrix, dtype=float)[:, 2] / 10)
+
+
+class FakeScraperIntegration:
+    """Video data source without Apify."""
+
+    async def get_cached_video_data(self, url):
+        return {"duration": 30}
+
+
+def _request(seed, scenarios=20, repeats=20):
+    return SimulationRequest(
+        video_url="https://www.tiktok.com/@test/video/1",
+        simulation_count=repeats,
+        random_seed=seed,
+        scenarios=[
+            SimulationScenario(
+                name=f"s{i}", description="scenario", publication_hour=8,
+                publication_day="saturday", hashtags=["fyp"] * (i % 6),
+                trending_hashtags=["viral"])
+            for i in range(scenarios)
+        ])
+
+
+def _service():
+    ml_manager = MLModelManager()
+    ml_manager.model = CountingModel()
+    return TikTokSimulationService(None, ml_manager, FakeScraperIntegration())
+
+
+def test_simulation_grid_is_one_model_call():
+    """20 scenarios x 6 variations x 20 repeats cost a single prediction over the unique rows."""
+    service = _service()
+
+    response = asyncio.run(service.run_simulation(_request(seed=1)))
+
+    assert service.ml_manager.model.calls == [1 + 20 * 6]
+    assert all(len(result.simulations) == 6 * 20 for result in response.scenarios)
+    for result in response.scenarios:
+        for simulation in result.simulations:
+            expected = simulation["features"]["estimated_hashtag_count"] / 10
+            assert 0.0 <= simulation["virality_score"] <= 1.0
+            assert abs(simulation["virality_score"] - expected) <= 0.05 + 1e-9
+
+
+def test_simulation_is_reproducible_with_a_seed():
+    """The same seed gives the same hashtags and noisy scores."""
+    first = asyncio.run(_service().run_simulation(_request(seed=7, scenarios=3)))
+    second = asyncio.run(_service().run_simulation(_request(seed=7, scenarios=3)))
+    other = asyncio.run(_service().run_simulation(_request(seed=8, scenarios=3)))
+
+    assert first.model_dump() == second.model_dump()
+    assert first.model_dump() != other.model_dump()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of duplicate in-flight analyses.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.single_flight import SingleFlight
+from src.api.tiktok_scraper_integration import TikTokScraperIntegration
+
+
+def test_concurrent_callers_share_one_call():
+    """Callers with the same key wait on one task; followers get their own copy."""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"views": 1}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.run("video_1", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert all(result == {"views": 1} for result in results)
+    assert results[0] is not results[1]
+    assert flight.stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+
+def test_errors_are_shared_but_not_cached():
+    """Waiters see the failure; the next call starts fresh work."""
+    flight = SingleFlight("test")
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise ValueError("actor failed")
+        return "ok"
+
+    async def scenario():
+        first = await asyncio.gather(flight.run("k", flaky), flight.run("k", flaky),
+                                     return_exceptions=True)
+        return first, await flight.run("k", flaky)
+
+    first, second = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in first)
+    assert second == "ok"
+    assert attempts == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    """A client disconnecting does not abort the work others wait on."""
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "done"
+
+
+class CountingApifyClient:
+    """Apify client double: a blocking actor run that counts invocations."""
+
+    def __init__(self):
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def actor(self, actor_id):
+        return self
+
+    def call(self, run_input):
+        with self._lock:
+            self.runs += 1
+        time.sleep(0.1)
+        return {"defaultDatasetId": "1"}
+
+    def dataset(self, dataset_id):
+        item = {"id": "7300000000000000001", "authorMeta": {"name": "test"}}
+        return type("Dataset", (), {"iterate_items": lambda _self: iter([item])})()
+
+
+def test_duplicate_video_requests_start_one_actor_run(tmp_path, monkeypatch):
+    """Concurrent requests for a trending video trigger a single actor run."""
+    monkeypatch.chdir(tmp_path)
+    integration = TikTokScraperIntegration()
+    integration.client = CountingApifyClient()
+    integration.available = True
+    url = "https://www.tiktok.com/@test/video/7300000000000000001"
+
+    async def scenario():
+        return await asyncio.gather(
+            *(integration.get_video_data_from_url(url) for _ in range(4)))
+
+    results = asyncio.run(scenario())
+
+    assert integration.client.runs == 1
+    assert {result["id"] for result in results} == {"7300000000000000001"}
+
+
+def test_invalid_url_is_rejected_before_coalescing(tmp_path, monkeypatch):
+    """Validation errors are raised per caller, without starting an actor run."""
+    monkeypatch.chdir(tmp_path)
+    integration = TikTokScraperIntegration()
+    integration.client = CountingApifyClient()
+    integration.available = True
+
+    with pytest.raises(ValueError):
+        asyncio.run(integration.get_video_data_from_url("https://example.com/video"))
+    assert integration.client.runs == 0
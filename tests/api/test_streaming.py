@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the NDJSON / SSE streaming modes of the profile and simulation endpoints.
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import src.api.routers.simulation as simulation_router
+import src.api.services.tiktok_service as tiktok_service
+from src.api.main import app
+from src.api.ml_model import MLModelManager
+from src.api.simulation_endpoint import TikTokSimulationService
+from src.api.streaming import format_event, resolve_stream_format
+
+
+class ConstantModel:
+    def predict(self, matrix):
+        return np.full(len(matrix), np.log1p(0.5))
+
+
+class FakeScraperIntegration:
+    """Video and profile source without Apify."""
+
+    async def get_cached_video_data(self, url):
+        return {"duration": 30}
+
+    async def get_profile_data(self, username, max_videos):
+        return {"profile_info": {"username": username},
+                "videos": [{"id": str(i), "webVideoUrl": f"https://www.tiktok.com/@t/video/{i}",
+                            "videoMeta": {"duration": 20}} for i in range(max_videos)]}
+
+
+class DelayedGeminiService:
+    """Gemini double: video i answers after delays[i] seconds."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    def is_available(self):
+        return True
+
+    async def analyze_video(self, url, use_cache=True):
+        await asyncio.sleep(self.delays[int(url.rsplit("/", 1)[1])])
+        return {"success": True, "analysis": {}}
+
+
+class RecordingModelManager:
+    def __init__(self):
+        self.batches = []
+
+    def get_feature_names(self):
+        return ["duration"]
+
+    def predict_batch(self, features_list):
+        self.batches.append(len(features_list))
+        return [{"virality_score": 0.5} for _ in features_list]
+
+
+def _events(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_event_formats():
+    """NDJSON writes one JSON line per event, SSE one event/data block."""
+    assert json.loads(format_event("video", {"id": 1}, "ndjson")) == {"event": "video", "data": {"id": 1}}
+    assert format_event("video", {"id": 1}, "sse") == 'event: video\ndata: {"id": 1}\n\n'
+
+
+def test_stream_format_negotiation():
+    """The query parameter wins over the Accept header; unknown formats are rejected."""
+    assert resolve_stream_format(None, "application/json") is None
+    assert resolve_stream_format(None, "text/event-stream") == "sse"
+    assert resolve_stream_format("NDJSON", "text/event-stream") == "ndjson"
+    with pytest.raises(HTTPException):
+        resolve_stream_format("xml")
+
+
+def test_simulation_streams_scenarios_without_features(monkeypatch):
+    """Each scenario is its own event, and include_features=False drops the feature payloads."""
+    ml_manager = MLModelManager()
+    ml_manager.model = ConstantModel()
+    monkeypatch.setattr(simulation_router, "simulation_service",
+                        TikTokSimulationService(None, ml_manager, FakeScraperIntegration()))
+    scenarios = [{"name": f"s{i}", "description": "d", "publication_hour": 9,
+                  "publication_day": "monday"} for i in range(3)]
+
+    response = TestClient(app).post(
+        "/simulation/simulate-virality?stream=ndjson",
+        json={"video_url": "https://www.tiktok.com/@t/video/1", "scenarios": scenarios,
+              "simulation_count": 4, "include_features": False, "random_seed": 1})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = _events(response)
+    assert [event["event"] for event in events] == ["base", "scenario", "scenario", "scenario", "summary"]
+    simulations = events[1]["data"]["simulations"]
+    assert len(simulations) == 5 * 4
+    assert all("features" not in simulation for simulation in simulations)
+    assert events[-1]["data"]["summary"]["scenarios_tested"] == 3
+
+
+def test_profile_streams_videos_as_they_are_ready(monkeypatch):
+    """Fast lookups are scored together and emitted before slow ones, over SSE."""
+    models = RecordingModelManager()
+    monkeypatch.setattr(tiktok_service, "tiktok_scraper_integration", FakeScraperIntegration())
+    monkeypatch.setattr(tiktok_service, "gemini_service", DelayedGeminiService([0.3, 0.0, 0.0, 0.3]))
+    monkeypatch.setattr(tiktok_service, "ml_manager", models)
+
+    response = TestClient(app).post(
+        "/analysis/analyze-tiktok-profile", headers={"Accept": "text/event-stream"},
+        json={"username": "t", "max_videos": 4, "use_cache": False})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    names = [block[0].removeprefix("event: ") for block in blocks]
+    payloads = [json.loads(block[1].removeprefix("data: ")) for block in blocks]
+    assert names == ["profile", "video", "video", "video", "video", "summary"]
+    assert [payload["video_id"] for payload in payloads[1:3]] == ["1", "2"]
+    assert models.batches[0] == 2
+    assert payloads[-1]["videos_analyzed"] == 4
+    assert payloads[-1]["gemini_videos_analyzed"] == 4
+
+
+def test_stream_reports_errors_in_band(monkeypatch):
+    """A failure after the headers are sent becomes an error event."""
+    class FailingScraper(FakeScraperIntegration):
+        async def get_profile_data(self, username, max_videos):
+            raise RuntimeError("Apify down")
+
+    monkeypatch.setattr(tiktok_service, "tiktok_scraper_integration", FailingScraper())
+
+    response = TestClient(app).post(
+        "/analysis/analyze-tiktok-profile?stream=ndjson",
+        json={"username": "t", "use_cache": False})
+
+    assert _events(response) == [{"event": "error", "data": {"detail": "Apify down"}}]
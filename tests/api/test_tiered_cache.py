@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered (memory LRU + SQLite) API cache.
+"""
+import json
+
+from src.api.tiered_cache import TieredCache, legacy_json_loader
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(tmp_path, clock, **kwargs):
+    return TieredCache("video", ttl_seconds=60, path=tmp_path / "cache.sqlite",
+                       clock=clock, **kwargs)
+
+
+def test_hits_are_served_from_memory_then_disk(tmp_path):
+    """A fresh instance (new process) falls back to disk, then serves from memory."""
+    clock = FakeClock()
+    _cache(tmp_path, clock).set("video_1", {"playCount": 10})
+
+    cache = _cache(tmp_path, clock)
+    assert cache.get("video_1") == {"playCount": 10}
+    assert cache.get("video_1") == {"playCount": 10}
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_entries_expire_after_their_ttl(tmp_path):
+    """Stale entries are misses in both tiers."""
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    cache.set("video_1", {"playCount": 10})
+
+    clock.now += 61
+    assert cache.get("video_1") is None
+    assert cache.stats()["expired"] == 2
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    """The LRU keeps at most `memory_items` entries; the disk keeps them all."""
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock, memory_items=2)
+    for i in range(3):
+        cache.set(f"video_{i}", {"i": i})
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2 and stats["evictions"] == 1
+    assert cache.get("video_0") == {"i": 0}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_cached_value_is_decoupled_from_the_caller(tmp_path):
+    """Mutating the stored object afterwards does not alter the cache."""
+    cache = _cache(tmp_path, FakeClock())
+    value = {"hashtags": ["fyp"]}
+    cache.set("video_1", value)
+    value["hashtags"].append("viral")
+
+    assert cache.get("video_1") == {"hashtags": ["fyp"]}
+
+
+def test_legacy_json_files_are_migrated(tmp_path):
+    """Files of the former per-key JSON cache are unwrapped and moved to the store."""
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "video_1.json").write_text(json.dumps(
+        {"url": "u", "video_data": {"playCount": 5}, "cached_at": "2025-01-06T00:00:00Z"}))
+
+    import time
+    cache = TieredCache("video", ttl_seconds=3600, path=tmp_path / "cache.sqlite",
+                        legacy_loader=legacy_json_loader(legacy_dir, "video_data"),
+                        clock=time.time)
+    assert cache.get("video_1") == {"playCount": 5}
+    assert cache.stats()["legacy_hits"] == 1
+    assert cache.stats()["disk_entries"] == 1
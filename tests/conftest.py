@@ -0,0 +1,40 @@
+"""
+📊 Test File: conftest.py
+🎯 Purpose: Keep the API, feature and job caches out of the repository during tests
+🔗 Related: src/api/tiered_cache.py, src/features/feature_cache.py, src/api/jobs.py
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_session_dir = None
+
+
+def _cache_env(root: Path) -> dict:
+    return {
+        "API_CACHE_PATH": str(root / "api_cache" / "api_cache.sqlite"),
+        "FEATURE_CACHE_PATH": str(root / "feature_cache" / "features.sqlite"),
+        "API_JOBS_PATH": str(root / "api_jobs" / "jobs.sqlite"),
+    }
+
+
+def pytest_configure(config):
+    """Les singletons de src.api sont créés à l'import : rediriger avant la collecte."""
+    global _session_dir
+    _session_dir = tempfile.mkdtemp(prefix="virality-tests-")
+    os.environ.update(_cache_env(Path(_session_dir)))
+
+
+def pytest_unconfigure(config):
+    if _session_dir:
+        shutil.rmtree(_session_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Chaque test qui appelle from_env() obtient ses propres bases SQLite."""
+    for name, value in _cache_env(tmp_path).items():
+        monkeypatch.setenv(name, value)
@@ -0,0 +1,65 @@
+"""
+📊 Test File: conftest.py
+🎯 Purpose: Shared fixtures for the feature extraction tests
+🔗 Related: src/features/modular_feature_system.py
+"""
+import pytest
+
+
+@pytest.fixture
+def sample_videos():
+    """Raw Apify items covering missing timestamps and zero views."""
+    return [
+        {
+            'id': '1', 'text': 'Funny challenge 😂', 'videoMeta': {'duration': 25.5},
+            'playCount': 15000, 'diggCount': 1200, 'commentCount': 150, 'shareCount': 80,
+            'hashtags': [{'name': 'fyp'}, {'name': 'viral'}, {'name': 'cooking'}],
+            'musicMeta': {'musicName': 'Song', 'musicAuthor': 'Artist'},
+            'createTimeISO': '2025-01-18T20:30:00.000Z'
+        },
+        {
+            'id': '2', 'text': 'Quiet morning', 'videoMeta': {'duration': 75},
+            'playCount': 0, 'diggCount': 0, 'commentCount': 0, 'shareCount': 0,
+            'hashtags': [], 'musicMeta': {},
+            'createTimeISO': '2025-04-09T08:05:00.000Z'
+        },
+        {
+            'id': '3', 'text': 'No timestamp', 'videoMeta': {'duration': 12},
+            'playCount': 500, 'diggCount': 50, 'commentCount': 5, 'shareCount': 1,
+            'hashtags': [{'name': 'tiktok'}]
+        },
+    ]
+
+
+@pytest.fixture
+def sample_analysis():
+    """Minimal Gemini analysis in the pipeline format."""
+    return {
+        'visual_analysis': {
+            'human_presence': 'One person with eye contact',
+            'shot_type': 'Medium close-up',
+            'color_analysis': 'Vibrant colors',
+            'text_overlays': 'Bold text overlays',
+            'transitions': 'Smooth transitions',
+            'style_quality': 'High quality'
+        },
+        'content_structure': {
+            'hook_effectiveness': 'Effective hook',
+            'story_flow': 'Unique linear story',
+            'call_to_action': 'Clear call to action'
+        },
+        'engagement_factors': {
+            'viral_potential': 'High viral potential',
+            'emotional_triggers': 'humor, surprise',
+            'audience_connection': 'Strong connection'
+        },
+        'technical_elements': {
+            'length_optimization': 'Appropriate length',
+            'sound_design': 'High quality audio',
+            'production_quality': 'High quality'
+        },
+        'trend_alignment': {
+            'current_trends': 'Perfectly aligned',
+            'hashtag_potential': '#trending #viral'
+        }
+    }
@@ -0,0 +1,129 @@
+"""
+📊 Test File: test_feature_cache.py
+🎯 Purpose: Tests for the persistent content-addressed feature cache
+📚 Concepts: Content Addressing, SQLite, LRU Eviction
+🔗 Related: src/features/feature_cache.py, src/features/modular_feature_system.py
+"""
+import inspect
+
+import pandas as pd
+
+from src.features import keyword_rules, modular_feature_system
+from src.features.feature_cache import CacheKey, FeatureCache
+from src.features.modular_feature_system import (
+    FeatureExtractorManager, MetadataFeatureSet, ModelCompatibleFeatureSet)
+
+
+def _count_calls(monkeypatch, feature_set_class):
+    calls = []
+    original = feature_set_class.extract_from_context
+
+    def counting(self, context):
+        calls.append(context.video_data.get('id'))
+        return original(self, context)
+
+    monkeypatch.setattr(feature_set_class, 'extract_from_context', counting)
+    return calls
+
+
+def test_rerun_is_served_from_cache(tmp_path, monkeypatch, sample_videos, sample_analysis):
+    """Same inputs hit the cache; a new analysis or a version bump recomputes."""
+    calls = _count_calls(monkeypatch, ModelCompatibleFeatureSet)
+    cache = FeatureCache(tmp_path / "features.sqlite")
+    manager = FeatureExtractorManager(['model_compatible'], cache=cache)
+    video = sample_videos[0]
+
+    first = manager.extract_features(video, sample_analysis)
+    assert manager.extract_features(video, sample_analysis) == first
+    assert calls == ['1']
+
+    manager.extract_features(video, None)
+    assert calls == ['1', '1']
+
+    monkeypatch.setattr(ModelCompatibleFeatureSet, 'version', '2')
+    manager.extract_features(video, sample_analysis)
+    assert calls == ['1', '1', '1']
+
+
+def test_version_follows_the_rule_tables():
+    """Changing a set's score table yields a new version, and so a cache miss."""
+    class Retuned(ModelCompatibleFeatureSet):
+        GEMINI_SCORES = {**ModelCompatibleFeatureSet.GEMINI_SCORES,
+                         'has_hook': ('section_content_hook', 1.0, 0.5)}
+
+    base = ModelCompatibleFeatureSet().version
+    assert ModelCompatibleFeatureSet().version == base
+    assert Retuned().version != base
+    assert MetadataFeatureSet().version != base
+
+
+def test_version_follows_the_shared_keyword_rules(monkeypatch):
+    """Editing the shared keyword rules changes every feature set version."""
+    before = ModelCompatibleFeatureSet().version
+    original = inspect.getsource
+
+    def edited(obj):
+        source = original(obj)
+        return source.replace("'high quality'", "'hd'") if obj is keyword_rules else source
+
+    monkeypatch.setattr(inspect, 'getsource', edited)
+    modular_feature_system._shared_sources_digest.cache_clear()
+    modular_feature_system.feature_set_version.cache_clear()
+    try:
+        assert ModelCompatibleFeatureSet().version != before
+    finally:
+        monkeypatch.undo()
+        modular_feature_system._shared_sources_digest.cache_clear()
+        modular_feature_system.feature_set_version.cache_clear()
+    assert ModelCompatibleFeatureSet().version == before
+
+
+def test_cache_persists_across_instances(tmp_path, sample_videos):
+    """Entries survive reopening the SQLite file (pipeline reruns)."""
+    path = tmp_path / "features.sqlite"
+    FeatureExtractorManager(['metadata'], cache=FeatureCache(path)).extract_features(sample_videos[0])
+
+    reopened = FeatureCache(path)
+    assert reopened.stats()['entries'] == 1
+    features = FeatureExtractorManager(['metadata'], cache=reopened).extract_features(sample_videos[0])
+    assert reopened.stats()['hits'] == 1
+    assert features['hashtags'] == 'fyp,viral,cooking'
+
+
+def test_batch_extracts_only_missing_videos(tmp_path, monkeypatch, sample_videos, sample_analysis):
+    """A partially cached batch equals an uncached batch and only extracts new videos."""
+    analyses = [sample_analysis, None, None]
+    uncached = FeatureExtractorManager(['metadata', 'model_compatible']).extract_features_batch(
+        sample_videos, analyses)
+
+    cache = FeatureCache(tmp_path / "features.sqlite")
+    manager = FeatureExtractorManager(['metadata', 'model_compatible'], cache=cache)
+    manager.extract_features_batch(sample_videos[:2], analyses[:2])
+
+    batches = []
+    original = MetadataFeatureSet.extract_batch
+    monkeypatch.setattr(MetadataFeatureSet, 'extract_batch',
+                        lambda self, batch: batches.append(len(batch)) or original(self, batch))
+    cached = manager.extract_features_batch(sample_videos, analyses)
+
+    assert batches == [1]
+    assert list(cached.columns) == list(uncached.columns)
+    pd.testing.assert_frame_equal(cached, uncached, check_dtype=False)
+
+
+def test_size_based_lru_eviction(tmp_path):
+    """The least recently read entries are evicted first once max_bytes is exceeded."""
+    cache = FeatureCache(tmp_path / "features.sqlite", max_bytes=300)
+    keys = [CacheKey(str(i), 'metadata', '1', 'hash') for i in range(4)]
+    payload = {'title': 'x' * 80}
+
+    cache.put(keys[0], payload)
+    cache.put(keys[1], payload)
+    cache.put(keys[2], payload)
+    cache.get(keys[0])          # keys[1] devient la plus ancienne
+    cache.put(keys[3], payload)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == payload
+    assert cache.get(keys[3]) == payload
+    assert cache.stats()['size_bytes'] <= 300
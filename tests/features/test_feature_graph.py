@@ -0,0 +1,97 @@
+"""
+📊 Test File: test_feature_graph.py
+🎯 Purpose: Tests for the per-feature dependency graph and column planner
+📚 Concepts: Dependency Graphs, Topological Sort, Lazy Evaluation
+🔗 Related: src/features/feature_graph.py, src/features/modular_feature_system.py
+"""
+import pytest
+
+from src.features.extraction_context import ExtractionContext
+from src.features.feature_graph import FeatureNode, FeaturePlanner, SKIP
+from src.features.modular_feature_system import (
+    ComprehensiveFeatureSet, FeatureExtractorManager, create_feature_extractor)
+
+MODEL_COLUMNS = create_feature_extractor('model_compatible').get_feature_names()
+
+
+def _counting_planner(calls):
+    def node(name, value, inputs=(), **kwargs):
+        def compute(context, values):
+            calls.append(name)
+            return value(values) if callable(value) else value
+        return FeatureNode(name, compute, inputs=inputs, **kwargs)
+
+    return FeaturePlanner([
+        node('a', 1),
+        node('b', lambda v: v['a'] + 1, inputs=('a',)),
+        node('c', lambda v: v['b'] * 10, inputs=('b',)),
+        node('unused', 99),
+        node('gemini_only', 5, requires_gemini=True),
+        node('gemini_fallback', 5, requires_gemini=True, fallback=0),
+        node('needs_gemini', lambda v: v['gemini_only'], inputs=('gemini_only',)),
+        node('skipped', SKIP),
+    ])
+
+
+def test_planner_computes_only_requested_closure_in_order():
+    """Dependencies run first; unrelated nodes never run."""
+    calls = []
+    planner = _counting_planner(calls)
+
+    features = planner.evaluate(ExtractionContext({}), ['c'])
+
+    assert features == {'c': 20}
+    assert calls == ['a', 'b', 'c']
+
+
+def test_gemini_nodes_use_fallback_or_are_skipped():
+    """Without analysis: fallbacks are used, other Gemini nodes and their dependents are dropped."""
+    calls = []
+    planner = _counting_planner(calls)
+    columns = ['gemini_only', 'gemini_fallback', 'needs_gemini', 'skipped', 'a']
+
+    without = planner.evaluate(ExtractionContext({}), columns)
+    assert without == {'gemini_fallback': 0, 'a': 1}
+    assert 'gemini_only' not in calls and 'gemini_fallback' not in calls
+
+    with_analysis = planner.evaluate(ExtractionContext({}, {'any': {}}), columns)
+    assert with_analysis == {'gemini_only': 5, 'gemini_fallback': 5, 'needs_gemini': 5, 'a': 1}
+
+
+def test_planner_rejects_unknown_and_circular_features():
+    """Unknown columns and dependency cycles are configuration errors."""
+    planner = FeaturePlanner([
+        FeatureNode('x', lambda c, v: v['y'], inputs=('y',)),
+        FeatureNode('y', lambda c, v: v['x'], inputs=('x',)),
+    ])
+    with pytest.raises(ValueError):
+        planner.plan(['missing'], has_gemini=False)
+    with pytest.raises(ValueError):
+        planner.plan(['x'], has_gemini=False)
+
+
+@pytest.mark.parametrize("config_name", ["model_compatible", "baseline", "experimental"])
+def test_planned_columns_match_full_extraction(config_name, sample_videos, sample_analysis):
+    """Requesting a subset of columns gives the same values as a full extraction."""
+    manager = create_feature_extractor(config_name)
+    columns = [name for name in manager.get_feature_names()
+               if name not in ('video_id', 'title', 'description')][:12]
+
+    for video in sample_videos:
+        for analysis in (None, sample_analysis):
+            full = manager.extract_features(video, analysis)
+            planned = manager.extract_features(video, analysis, columns=columns)
+            assert planned == {name: full[name] for name in columns if name in full}
+
+
+def test_serving_columns_skip_comprehensive_placeholders(monkeypatch, sample_videos, sample_analysis):
+    """The model's columns never trigger the comprehensive set when another set provides them."""
+    def fail(self, context):
+        raise AssertionError("comprehensive set should not be computed")
+
+    monkeypatch.setattr(ComprehensiveFeatureSet, 'extract_from_context', fail)
+    manager = FeatureExtractorManager(['comprehensive', 'model_compatible'])
+
+    features = manager.extract_features(sample_videos[0], sample_analysis, columns=MODEL_COLUMNS)
+
+    assert list(features) == MODEL_COLUMNS
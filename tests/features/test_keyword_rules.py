@@ -0,0 +1,133 @@
+"""
+📊 Test File: test_keyword_rules.py
+🎯 Purpose: Tests for the compiled Gemini keyword matcher
+📚 Concepts: Rule Tables, Regex Alternation, Substring Semantics
+🔗 Related: src/features/keyword_rules.py
+"""
+import itertools
+
+import pytest
+
+from src.features.keyword_rules import (
+    GEMINI_KEYWORD_RULES, KeywordMatcher, KeywordRule)
+from src.features.modular_feature_system import ModelCompatibleFeatureSet
+
+
+def _naive_hits(rules, analysis):
+    """Reference implementation: one `in` test per rule, as before compilation."""
+    hits = set()
+    for rule in rules:
+        section = analysis.get(rule.section, {})
+        if rule.field is None:
+            text = str(section).lower()
+        else:
+            fields = section if isinstance(section, dict) else {}
+            value = fields.get(rule.field, '')
+            text = value.lower() if isinstance(value, str) else ''
+        if any(keyword in text for keyword in rule.keywords):
+            hits.add(rule.name)
+    return hits
+
+
+def test_overlapping_keywords_all_match():
+    """'high quality' must not hide 'high' nor 'quality' starting at the same offset."""
+    rules = [
+        KeywordRule('long', 'tech', ('high quality',), field='sound'),
+        KeywordRule('short', 'tech', ('high',), field='sound'),
+        KeywordRule('suffix', 'tech', ('quality',), field='sound'),
+    ]
+    matcher = KeywordMatcher(rules)
+
+    assert matcher.scan({'tech': {'sound': 'High Quality audio'}}) == {'long', 'short', 'suffix'}
+    assert matcher.scan({'tech': {'sound': 'high pitch'}}) == {'short'}
+
+
+def test_field_rules_do_not_leak_across_fields():
+    """A keyword in one field never satisfies a rule on another field."""
+    rules = [
+        KeywordRule('in_a', 'section', ('story',), field='a'),
+        KeywordRule('in_b', 'section', ('story',), field='b'),
+        KeywordRule('anywhere', 'section', ('story',)),
+    ]
+    matcher = KeywordMatcher(rules)
+
+    assert matcher.scan({'section': {'a': 'A story', 'b': 'none'}}) == {'in_a', 'anywhere'}
+    # Les clés comptent pour les règles "section entière" (str(section))
+    assert matcher.scan({'section': {'story': 1}}) == {'anywhere'}
+
+
+def test_missing_or_malformed_analysis():
+    """No analysis, missing sections and non-text values produce no field hits."""
+    matcher = KeywordMatcher(GEMINI_KEYWORD_RULES)
+
+    assert matcher.scan(None) == frozenset()
+    assert matcher.scan({}) == frozenset()
+    assert matcher.scan({'visual_analysis': 'not a dict',
+                         'content_structure': {'story_flow': None}}) == frozenset()
+
+
+def test_gemini_rules_match_naive_substring_checks():
+    """The compiled matcher agrees with per-rule `in` checks on mixed texts."""
+    phrases = ['High quality', 'two people, eye contact', 'close-up then wide',
+               'vibrant but dull', 'effective hook', 'linear story, unique',
+               'strong connection', 'perfectly on trend', 'smooth transitions',
+               'call to action', 'appropriate length', 'sound', '']
+    sections = {rule.section for rule in GEMINI_KEYWORD_RULES}
+    fields = {rule.field for rule in GEMINI_KEYWORD_RULES if rule.field}
+    matcher = KeywordMatcher(GEMINI_KEYWORD_RULES)
+
+    for offset, combo in enumerate(itertools.combinations(phrases, 2)):
+        analysis = {
+            section: {field: combo[(i + offset) % 2] for i, field in enumerate(sorted(fields))}
+            for section in sections
+        }
+        assert matcher.scan(analysis) == _naive_hits(GEMINI_KEYWORD_RULES, analysis)
+
+
+def test_duplicate_rule_names_rejected():
+    """Rule names are unique identifiers."""
+    with pytest.raises(ValueError):
+        KeywordMatcher([KeywordRule('dup', 'a', ('x',)), KeywordRule('dup', 'b', ('y',))])
+
+
+def _baseline_model_compatible(gemini_analysis):
+    """Gemini part of model_compatible before compilation: `in str(section)` per feature."""
+    visual = gemini_analysis.get('visual_analysis', {})
+    content = gemini_analysis.get('content_structure', {})
+    engagement = gemini_analysis.get('engagement_factors', {})
+    technical = gemini_analysis.get('technical_elements', {})
+    trend = gemini_analysis.get('trend_alignment', {})
+    return {
+        'visual_quality_score': 0.8 if 'high quality' in str(visual).lower() else 0.6,
+        'has_hook': 1.0 if 'hook' in str(content).lower() else 0.0,
+        'viral_potential_score': 0.7 if 'viral' in str(engagement).lower() else 0.5,
+        'emotional_trigger_count': 3 if 'emotional' in str(engagement).lower() else 1,
+        'audience_connection_score': 0.7 if 'connection' in str(engagement).lower() else 0.5,
+        'sound_quality_score': 0.8 if 'sound' in str(technical).lower() else 0.6,
+        'production_quality_score': 0.8 if 'quality' in str(technical).lower() else 0.6,
+        'trend_alignment_score': 0.6 if 'trend' in str(trend).lower() else 0.4,
+        'color_vibrancy_score': 0.7 if 'color' in str(visual).lower() else 0.5,
+    }
+
+
+@pytest.mark.parametrize("analysis", [
+    # Sections en texte brut, telles que Gemini les renvoie parfois
+    {'visual_analysis': 'High quality footage, warm colors',
+     'content_structure': 'Strong hook in the first second',
+     'engagement_factors': 'Emotional, viral, real connection',
+     'technical_elements': 'Crisp sound, good quality',
+     'trend_alignment': 'Follows a current trend'},
+    {'visual_analysis': 'plain', 'content_structure': '',
+     'engagement_factors': ['viral'], 'technical_elements': None},
+    # Sections structurées et mélange des deux
+    {'visual_analysis': {'style_quality': 'High quality', 'color': 'bright'},
+     'content_structure': {'hook_effectiveness': 'weak'},
+     'engagement_factors': 'emotional story'},
+])
+def test_model_compatible_matches_baseline_on_unstructured_sections(analysis):
+    """Whole-section rules give the per-keyword baseline results, string sections included."""
+    video = {'id': '1', 'videoMeta': {'duration': 30}, 'hashtags': []}
+    features = ModelCompatibleFeatureSet().extract(video, analysis)
+    expected = _baseline_model_compatible(analysis)
+
+    assert {name: features[name] for name in expected} == expected
@@ -0,0 +1,101 @@
+"""
+📊 Test File: test_modular_feature_system.py
+🎯 Purpose: Tests for the modular feature extraction system
+📚 Concepts: Feature Engineering, Vectorization, Row/Batch Equivalence
+🔗 Related: src/features/modular_feature_system.py
+"""
+import pandas as pd
+import pytest
+
+from src.features.modular_feature_system import FeatureExtractorManager
+
+
+def _row_frame(manager, videos, analyses):
+    return pd.DataFrame([manager.extract_features(video, analysis)
+                         for video, analysis in zip(videos, analyses)])
+
+
+@pytest.mark.parametrize("feature_sets", [
+    ["metadata"],
+    ["model_compatible"],
+    ["metadata", "gemini_basic", "visual_granular"],
+    ["metadata", "visual_granular", "comprehensive"],
+])
+def test_batch_matches_row_extraction(feature_sets, sample_videos, sample_analysis):
+    """Batch extraction returns the same table as the per-video loop."""
+    manager = FeatureExtractorManager(feature_sets)
+    analyses = [sample_analysis, None, sample_analysis]
+
+    expected = _row_frame(manager, sample_videos, analyses)
+    result = manager.extract_features_batch(sample_videos, analyses)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_batch_accepts_dataframe(sample_videos):
+    """A DataFrame of raw Apify items is accepted as batch input."""
+    manager = FeatureExtractorManager(["metadata"])
+
+    expected = manager.extract_features_batch(sample_videos)
+    result = manager.extract_features_batch(pd.DataFrame(sample_videos))
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_batch_rejects_misaligned_analyses(sample_videos):
+    """Analyses must be aligned one-to-one with videos."""
+    manager = FeatureExtractorManager(["metadata"])
+
+    with pytest.raises(ValueError):
+        manager.extract_features_batch(sample_videos, [None])
+
+
+def test_parallel_batch_matches_single_process(sample_videos, sample_analysis):
+    """Chunked multi-process extraction keeps input order and values."""
+    manager = FeatureExtractorManager(["metadata", "gemini_basic", "model_compatible"])
+    videos = sample_videos * 3
+    analyses = [sample_analysis, None, sample_analysis] * 3
+
+    expected = manager.extract_features_batch(videos, analyses)
+    result = manager.extract_features_batch(videos, analyses, workers=2, chunk_size=2)
+
+    assert set(result.columns) == set(expected.columns)
+    assert list(result['video_id']) == [video['id'] for video in videos]
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_experimental_config_computes_metadata_once(monkeypatch, sample_videos, sample_analysis):
+    """Shared extraction context: comprehensive reuses metadata/visual results."""
+    from src.features import modular_feature_system as mfs
+
+    calls = []
+    original = mfs.MetadataFeatureSet.extract_from_context
+
+    def counting(self, context):
+        calls.append(self.name)
+        return original(self, context)
+
+    monkeypatch.setattr(mfs.MetadataFeatureSet, "extract_from_context", counting)
+
+    manager = mfs.create_feature_extractor("experimental")
+    features = manager.extract_features(sample_videos[0], sample_analysis)
+
+    assert calls == ["metadata"]
+    assert features["hashtag_count"] == 3
+    assert "cultural_relevance_score" in features
+
+
+def test_malformed_video_only_loses_its_own_row(sample_videos):
+    """A video that breaks a set's vectorized pass does not empty the set for the batch."""
+    manager = FeatureExtractorManager(["enhanced_quality"])
+    malformed = {'id': 'bad', 'text': 'Broken item', 'videoMeta': {'duration': 'abc'}}
+    videos = [sample_videos[0], malformed, sample_videos[2]]
+
+    result = manager.extract_features_batch(videos)
+
+    assert result.loc[1].isna().all()
+    for position, video in ((0, sample_videos[0]), (2, sample_videos[2])):
+        expected = manager.extract_features(video)
+        assert expected
+        assert result.loc[position, list(expected)].tolist() == list(expected.values())
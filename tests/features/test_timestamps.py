@@ -0,0 +1,65 @@
+"""
+📊 Test File: test_timestamps.py
+🎯 Purpose: Tests for the shared createTimeISO decomposition layer
+📚 Concepts: Memoization, Fast Paths, Vectorization
+🔗 Related: src/features/timestamps.py
+"""
+import math
+
+import pandas as pd
+import pytest
+
+from src.features.timestamps import decompose_timestamp, decompose_timestamps
+
+
+@pytest.mark.parametrize("iso_string", [
+    "2025-01-15T20:30:00.000Z",   # Apify fast path
+    "2025-03-01T00:00:00Z",       # fast path without milliseconds
+    "2024-12-29T09:15:00+02:00",  # pandas fallback with offset
+    "2025-06-07 17:59:59",        # pandas fallback, naive
+])
+def test_decompose_matches_pandas(iso_string):
+    """Fast path and fallback agree with pd.to_datetime."""
+    expected = pd.to_datetime(iso_string)
+    parts = decompose_timestamp(iso_string)
+
+    assert parts.hour == expected.hour
+    assert parts.weekday == expected.dayofweek
+    assert parts.month == expected.month
+    assert parts.is_weekend == (expected.dayofweek >= 5)
+    assert parts.is_business_hours == (9 <= expected.hour <= 17)
+
+
+def test_decompose_invalid_and_empty():
+    """Empty or unparseable strings yield None instead of raising."""
+    assert decompose_timestamp("") is None
+    assert decompose_timestamp("not a date") is None
+    assert decompose_timestamp("2025-02-30T10:00:00.000Z") is None
+
+
+def test_decompose_is_cached():
+    """Repeated strings are parsed once."""
+    decompose_timestamp.cache_clear()
+    decompose_timestamp("2025-01-15T20:30:00.000Z")
+    decompose_timestamp("2025-01-15T20:30:00.000Z")
+
+    info = decompose_timestamp.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_vectorized_matches_scalar():
+    """The batch path returns the same parts as the scalar path."""
+    values = ["2025-01-15T20:30:00.000Z", "", None,
+              "2024-12-29T09:15:00+02:00", "garbage", "2025-04-09T08:05:00.000Z"]
+    frame = decompose_timestamps(values)
+
+    for i, value in enumerate(values):
+        parts = decompose_timestamp(value) if isinstance(value, str) else None
+        if parts is None:
+            assert not frame['present'][i]
+            assert math.isnan(frame['hour'][i])
+        else:
+            assert frame['present'][i]
+            assert (frame['hour'][i], frame['weekday'][i], frame['month'][i]) == \
+                (parts.hour, parts.weekday, parts.month)
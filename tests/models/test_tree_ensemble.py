@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled NumPy tree-ensemble evaluator.
+"""
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from src.api.ml_model import EXPECTED_FEATURE_NAMES, MLModelManager
+from src.models.tree_ensemble import CompiledTreeEnsemble, compile_model
+
+
+def _data(rows, seed, missing=0.0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 6))
+    X[rng.random(X.shape) < missing] = np.nan
+    y = 2 * np.nan_to_num(X[:, 0]) - np.nan_to_num(X[:, 3]) + rng.normal(scale=0.1, size=rows)
+    return X, y
+
+
+@pytest.mark.parametrize("model", [
+    RandomForestRegressor(n_estimators=20, random_state=0),
+    ExtraTreesRegressor(n_estimators=10, random_state=0),
+    DecisionTreeRegressor(random_state=0),
+])
+def test_compiled_predictions_match_original(model):
+    """Compiled ensembles reproduce the estimator, including rows with missing values."""
+    X, y = _data(300, seed=0, missing=0.05)
+    model.fit(X, y)
+    X_test, _ = _data(500, seed=1, missing=0.05)
+
+    compiled = compile_model(model)
+
+    np.testing.assert_allclose(compiled.predict(X_test), model.predict(X_test), atol=1e-9)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """The .npz export keeps predictions and fitted feature names."""
+    X, y = _data(200, seed=2)
+    columns = [f"c{i}" for i in range(X.shape[1])]
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(
+        pd.DataFrame(X, columns=columns), y)
+
+    path = compile_model(model).save(tmp_path / "model.npz")
+    loaded = CompiledTreeEnsemble.load(path)
+
+    assert list(loaded.feature_names_in_) == columns
+    np.testing.assert_allclose(loaded.predict(X), model.predict(pd.DataFrame(X, columns=columns)),
+                               atol=1e-9)
+
+
+def test_unsupported_models_are_rejected():
+    """Non-tree models raise instead of compiling to something wrong."""
+    from sklearn.linear_model import LinearRegression
+
+    X, y = _data(50, seed=3)
+    with pytest.raises(ValueError):
+        compile_model(LinearRegression().fit(X, y))
+
+
+def test_api_serves_compiled_model(tmp_path):
+    """MLModelManager prefers an up-to-date .npz next to the pickle."""
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame(rng.uniform(0, 10, size=(200, len(EXPECTED_FEATURE_NAMES))),
+                         columns=list(EXPECTED_FEATURE_NAMES))
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(
+        frame, np.log1p(frame["duration"] / 20))
+    model_path = tmp_path / "iter_test_model.pkl"
+    joblib.dump(model, model_path)
+
+    manager = MLModelManager()
+    manager.model_path = model_path
+    assert manager.load_model()
+    expected = manager.predict_batch([{"duration": 3.0}, {"duration": 9.0}])
+
+    compile_model(model).save(model_path.with_suffix(".npz"))
+    assert manager.load_model()
+    assert isinstance(manager.model, CompiledTreeEnsemble)
+    for compiled, original in zip(manager.predict_batch([{"duration": 3.0}, {"duration": 9.0}]),
+                                  expected):
+        assert compiled["virality_score"] == pytest.approx(original["virality_score"], rel=1e-6)
+
+    # A pickle newer than its export is served as is
+    later = model_path.stat().st_mtime + 10
+    os.utime(model_path, (later, later))
+    assert manager.load_model()
+    assert not isinstance(manager.model, CompiledTreeEnsemble)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test end-to-end du traitement d'un batch en pipeline (scraping → analyse →
+features), avec un scraper en mémoire et le service Gemini simulé.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import scripts.run_pipeline as run_pipeline  # noqa: E402
+from src.utils.batch_tracker import BatchTracker  # noqa: E402
+
+
+class FakeScraper:
+    """Renvoie quelques vidéos récentes et valides par compte."""
+
+    def scrape_multiple_profiles(self, usernames, max_videos=50, mode="serial",
+                                 max_concurrency=4):
+        created = datetime.now() - timedelta(days=10)
+        results = []
+        for username in usernames:
+            name = username.lstrip("@")
+            videos = [{
+                "id": f"{abs(hash(name)) % 10**6}{i}",
+                "text": "hello #fyp",
+                "playCount": 1000, "diggCount": 10, "commentCount": 1, "shareCount": 1,
+                "createTime": int(created.timestamp()),
+                "createTimeISO": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "webVideoUrl": f"https://www.tiktok.com/@{name}/video/{abs(hash(name)) % 10**6}{i}",
+                "authorMeta": {"name": name},
+                "videoMeta": {"duration": 20},
+                "hashtags": [{"name": "fyp"}],
+            } for i in range(max_videos)]
+            results.append({"username": name, "scraped_at": 0, "videos": videos})
+        return results
+
+
+def test_batch_runs_every_stage_per_account(tmp_path, monkeypatch):
+    """Chaque compte traverse toutes les étapes et n'a que ses propres vidéos."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_pipeline, "TikTokScraper", FakeScraper)
+    args = argparse.Namespace(
+        dataset="pipelined", videos_per_account=3, scrape_mode="concurrent",
+        scrape_concurrency=2, gemini_concurrency=2, gemini_rpm=6000, gemini_tpm=None,
+        gemini_stub=True, feature_workers=1, no_feature_cache=True,
+        feature_system="modular", feature_set="metadata", stage_queue_size=1)
+    tracker = BatchTracker("pipelined")
+
+    assert run_pipeline.process_batch(["@alice", "@bob"], args, tracker)
+
+    dataset_dir = tmp_path / "data" / "dataset_pipelined"
+    assert sorted(tracker.load_processed_accounts()) == ["alice", "bob"]
+    assert len(list(dataset_dir.glob("batch_*.json"))) == 1
+    assert len(list((dataset_dir / "gemini_analysis").rglob("*_analysis.json"))) == 6
+    for account in ("alice", "bob"):
+        features = pd.read_csv(dataset_dir / "features" / f"{account}_features_metadata.csv")
+        assert len(features) == 3
+
+
+class RecordingTracker(BatchTracker):
+    """Tracker gardant les erreurs en mémoire (dans le processus qui le détient)."""
+
+    def __init__(self, dataset_name):
+        super().__init__(dataset_name)
+        self.errors = []
+
+    def log_error(self, account, phase, error):
+        self.errors.append((account, phase))
+        super().log_error(account, phase, error)
+
+
+def test_feature_worker_errors_reach_parent_tracker(tmp_path, monkeypatch):
+    """Les erreurs d'extraction des processus workers sont enregistrées par le parent."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_pipeline, "TikTokScraper", FakeScraper)
+    args = argparse.Namespace(
+        dataset="sharded", videos_per_account=2, scrape_mode="concurrent",
+        scrape_concurrency=2, gemini_concurrency=2, gemini_rpm=6000, gemini_tpm=None,
+        gemini_stub=True, feature_workers=2, no_feature_cache=True,
+        feature_system="legacy", feature_set="metadata", stage_queue_size=1)
+    tracker = RecordingTracker("sharded")
+
+    run_pipeline.process_batch(["@alice", "@bob"], args, tracker)
+
+    # Comme en mono-processus : l'erreur de la phase, puis le compte marqué en échec
+    assert sorted(tracker.errors) == [("alice", "features")] * 2 + [("bob", "features")] * 2
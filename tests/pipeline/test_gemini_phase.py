@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests de la phase d'analyse Gemini concurrente (avec le service simulé).
+"""
+import json
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.run_pipeline import run_gemini_phase  # noqa: E402
+from src.services.fake_gemini import FakeGeminiService, fake_analysis  # noqa: E402
+from src.services.gemini_service import GeminiService  # noqa: E402
+from src.utils.batch_tracker import BatchTracker  # noqa: E402
+from src.utils.rate_limiter import TokenBucketLimiter  # noqa: E402
+
+
+def _videos(count):
+    return [{"webVideoUrl": f"https://www.tiktok.com/@test/video/{i}"} for i in range(count)]
+
+
+def _analysis_files(tmp_path):
+    return sorted((tmp_path / "data").rglob("video_*_analysis.json"))
+
+
+def test_concurrent_phase_writes_every_analysis(tmp_path, monkeypatch):
+    """Les analyses tournent en parallèle et chaque résultat est écrit."""
+    monkeypatch.chdir(tmp_path)
+    service = FakeGeminiService(latency=0.05)
+
+    run_gemini_phase(_videos(8), "@test", BatchTracker("gemini_phase"),
+                     concurrency=4, limiter=TokenBucketLimiter(requests_per_minute=6000),
+                     analyzer=service.analyze_tiktok_video)
+
+    files = _analysis_files(tmp_path)
+    assert len(files) == 8
+    assert service.max_in_flight > 1
+    assert json.loads(files[0].read_text())["success"] is True
+
+
+def test_throttled_calls_are_retried(tmp_path, monkeypatch):
+    """Une réponse 429 déclenche un backoff puis une nouvelle tentative."""
+    monkeypatch.chdir(tmp_path)
+    service = FakeGeminiService(latency=0.0, throttle_rate=0.3, seed=1)
+    limiter = TokenBucketLimiter(requests_per_minute=6000, initial_backoff=0.01,
+                                 max_backoff=0.05)
+
+    run_gemini_phase(_videos(10), "@test", BatchTracker("gemini_phase"),
+                     concurrency=2, limiter=limiter,
+                     analyzer=service.analyze_tiktok_video, max_retries=10)
+
+    assert len(_analysis_files(tmp_path)) == 10
+    assert service.throttled > 0
+    assert limiter.throttled_count == service.throttled
+
+
+def test_batched_requests_cover_every_video(tmp_path, monkeypatch):
+    """Avec batch_size=4, 10 vidéos partent en 3 requêtes."""
+    monkeypatch.chdir(tmp_path)
+    service = FakeGeminiService(latency=0.0)
+
+    run_gemini_phase(_videos(10), "@test", BatchTracker("gemini_phase"),
+                     concurrency=2, limiter=TokenBucketLimiter(requests_per_minute=6000),
+                     analyzer=service.analyze_tiktok_video, batch_size=4,
+                     batch_analyzer=service.analyze_tiktok_videos)
+
+    assert len(_analysis_files(tmp_path)) == 10
+    assert service.calls == 3
+
+
+class CountingLimiter(TokenBucketLimiter):
+    """Limiteur comptant les requêtes autorisées."""
+
+    def __init__(self):
+        super().__init__(requests_per_minute=6000)
+        self.acquired = 0
+
+    def acquire(self, tokens=0):
+        self.acquired += 1
+        return super().acquire(tokens)
+
+
+class TruncatingModel:
+    """Modèle Gemini dont les réponses de plus de 2 vidéos sont tronquées."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def generate_content(self, parts):
+        self.requests += 1
+        ids = re.findall(r"id: (\w+)", parts[1])
+        if not ids:
+            return SimpleNamespace(text=json.dumps(fake_analysis(parts[1])))
+        if len(ids) > 2:
+            return SimpleNamespace(text='{"truncated": ')
+        return SimpleNamespace(text=json.dumps({video_id: fake_analysis(video_id) for video_id in ids}))
+
+
+def test_batch_retries_go_through_the_limiter(tmp_path, monkeypatch):
+    """Les lots renvoyés après une réponse illisible consomment aussi le budget."""
+    monkeypatch.chdir(tmp_path)
+    model = TruncatingModel()
+    service = GeminiService.__new__(GeminiService)
+    service.model = model
+    limiter = CountingLimiter()
+
+    run_gemini_phase(_videos(4), "@test", BatchTracker("gemini_phase"),
+                     limiter=limiter, analyzer=service.analyze_tiktok_video, batch_size=4,
+                     batch_analyzer=service.analyze_tiktok_videos)
+
+    assert len(_analysis_files(tmp_path)) == 4
+    assert model.requests == 3
+    assert limiter.acquired == model.requests
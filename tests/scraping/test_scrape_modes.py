@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-profile scraping modes (serial, packed, concurrent).
+
+The Apify client is replaced by an in-memory double that records actor runs.
+"""
+import threading
+import time
+
+import pytest
+
+import src.scraping.tiktok_scraper as tiktok_scraper
+from src.scraping.tiktok_scraper import TikTokScraper
+
+
+class FakeApifyClient:
+    """Minimal ApifyClient double: actor(...).call() then dataset(...).iterate_items()."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.runs = []
+        self.datasets = {}
+        self._lock = threading.Lock()
+
+    def actor(self, actor_id):
+        return self
+
+    def call(self, run_input):
+        time.sleep(self.latency)
+        items = [
+            {"id": f"{profile}-{i}", "authorMeta": {"name": profile.lstrip("@")}}
+            for profile in run_input["profiles"]
+            for i in range(run_input["resultsPerPage"])
+        ]
+        with self._lock:
+            self.runs.append(run_input["profiles"])
+            dataset_id = str(len(self.runs))
+            self.datasets[dataset_id] = items
+        return {"defaultDatasetId": dataset_id}
+
+    def dataset(self, dataset_id):
+        items = self.datasets[dataset_id]
+        return type("Dataset", (), {"iterate_items": lambda _self: iter(items)})()
+
+
+def _scraper(client):
+    scraper = TikTokScraper.__new__(TikTokScraper)
+    scraper.client = client
+    return scraper
+
+
+def test_packed_mode_uses_one_run_and_splits_by_author():
+    """All profiles go into one actor run; videos come back grouped per account."""
+    client = FakeApifyClient()
+    results = _scraper(client).scrape_multiple_profiles(
+        ["@alice", "@bob"], max_videos=3, mode="packed")
+
+    assert client.runs == [["@alice", "@bob"]]
+    assert [r["username"] for r in results] == ["alice", "bob"]
+    assert all(len(r["videos"]) == 3 for r in results)
+    assert {v["authorMeta"]["name"] for v in results[1]["videos"]} == {"bob"}
+
+
+def test_concurrent_mode_overlaps_actor_runs():
+    """Runs share one client and overlap: wall time is about one run, not the sum."""
+    client = FakeApifyClient(latency=0.2)
+    start = time.perf_counter()
+    results = _scraper(client).scrape_multiple_profiles(
+        ["@a", "@b", "@c", "@d"], max_videos=2, mode="concurrent", max_concurrency=4)
+    elapsed = time.perf_counter() - start
+
+    assert [r["username"] for r in results] == ["a", "b", "c", "d"]
+    assert len(client.runs) == 4
+    assert elapsed < 0.6
+
+
+def test_unknown_mode_is_rejected():
+    """A typo in the mode fails loudly instead of silently scraping serially."""
+    with pytest.raises(ValueError):
+        _scraper(FakeApifyClient()).scrape_multiple_profiles(["@a"], mode="parallel")
+
+
+def test_serial_mode_only_pauses_between_runs(monkeypatch):
+    """The pause separates runs: a single profile (pipeline stage) is not delayed."""
+    pauses = []
+    monkeypatch.setattr(tiktok_scraper.time, "sleep", pauses.append)
+    scraper = _scraper(FakeApifyClient())
+
+    scraper.scrape_multiple_profiles(["@a"], max_videos=1)
+    assert pauses == [0.0]  # the fake client's own latency only
+
+    pauses.clear()
+    scraper.scrape_multiple_profiles(["@a", "@b", "@c"], max_videos=1)
+    assert pauses.count(tiktok_scraper.SERIAL_DELAY_SECONDS) == 2
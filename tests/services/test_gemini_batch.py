@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests de l'analyse Gemini par lots (un prompt pour plusieurs vidéos).
+
+Le modèle Gemini est remplacé par un double qui répond à partir des ids
+présents dans la requête.
+"""
+import json
+import re
+
+from src.services.gemini_service import GeminiService, incomplete_retries, video_id_from_url
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Répond un objet JSON par id ; `broken` casse la réponse au-delà d'une taille de lot."""
+
+    def __init__(self, broken_above=None, drop_ids=()):
+        self.broken_above = broken_above
+        self.drop_ids = set(drop_ids)
+        self.requests = []
+
+    def generate_content(self, parts):
+        ids = re.findall(r"id: (\w+)", parts[1]) or [parts[1].rsplit("/", 1)[-1].split("\n")[0]]
+        self.requests.append(ids)
+        if self.broken_above and len(ids) > self.broken_above:
+            return FakeResponse('{"truncated": ')
+        if len(ids) == 1 and "id:" not in parts[1]:
+            return FakeResponse(json.dumps({"visual_analysis": {"main_elements": ids[0]}}))
+        return FakeResponse(json.dumps({
+            video_id: {"visual_analysis": {"main_elements": video_id}}
+            for video_id in ids if video_id not in self.drop_ids
+        }))
+
+
+def _service(model):
+    service = GeminiService.__new__(GeminiService)
+    service.model = model
+    return service
+
+
+URLS = [f"https://www.tiktok.com/@test/video/{i}" for i in range(100, 108)]
+
+
+def test_batch_analysis_uses_one_request_per_batch():
+    """8 vidéos en lots de 4 : deux requêtes, un résultat par URL."""
+    model = FakeModel()
+    results = _service(model).analyze_tiktok_videos(URLS, max_batch_size=4)
+
+    assert len(model.requests) == 2
+    assert set(results) == set(URLS)
+    for url, result in results.items():
+        assert result["success"]
+        assert result["analysis"]["visual_analysis"]["main_elements"] == video_id_from_url(url)
+
+
+def test_unparsable_response_is_returned_for_retry():
+    """Une réponse illisible ne relance rien : le lot revient `incomplete`, à couper en deux."""
+    model = FakeModel(broken_above=2)
+    results = _service(model).analyze_tiktok_videos(URLS[:4], max_batch_size=4)
+
+    assert [len(ids) for ids in model.requests] == [4]
+    assert all(result["incomplete"] and not result["success"] for result in results.values())
+    assert incomplete_retries(URLS[:4], results) == [URLS[:2], URLS[2:4]]
+
+
+def test_videos_missing_from_response_are_returned_for_retry():
+    """Seules les vidéos absentes de la réponse sont à redemander ; aucun appel caché."""
+    model = FakeModel(drop_ids={"101"})
+    results = _service(model).analyze_tiktok_videos(URLS[:3], max_batch_size=3)
+
+    assert len(model.requests) == 1
+    assert results[URLS[1]]["incomplete"]
+    assert incomplete_retries(URLS[:3], results) == [[URLS[1]]]
+
+
+def test_each_video_keeps_only_its_part_of_the_response():
+    """raw_response d'une vidéo ne contient que sa propre analyse."""
+    model = FakeModel()
+    results = _service(model).analyze_tiktok_videos(URLS[:3], max_batch_size=3)
+
+    for result in results.values():
+        assert json.loads(result["raw_response"]) == result["analysis"]
+    assert video_id_from_url(URLS[0]) not in results[URLS[1]]["raw_response"]
+
+
+def test_urls_sharing_a_video_id_all_get_the_result():
+    """Deux URLs d'une même vidéo : l'id n'est demandé qu'une fois, le résultat va aux deux."""
+    model = FakeModel()
+    urls = [URLS[0], URLS[0] + "?is_from_webapp=1", URLS[1]]
+    results = _service(model).analyze_tiktok_videos(urls, max_batch_size=3)
+
+    assert model.requests == [["100", "101"]]
+    assert set(results) == set(urls)
+    assert results[urls[0]]["success"] and results[urls[1]]["success"]
+    assert results[urls[1]]["analysis"] == results[urls[0]]["analysis"]
+    assert incomplete_retries(urls, results) == []
+
+
+def test_missing_shared_id_marks_every_url_for_retry():
+    """Une vidéo absente de la réponse est redemandée pour chacune de ses URLs."""
+    model = FakeModel(drop_ids={"100"})
+    urls = [URLS[0], URLS[0] + "?lang=fr", URLS[1]]
+    results = _service(model).analyze_tiktok_videos(urls, max_batch_size=3)
+
+    assert incomplete_retries(urls, results) == [urls[:2]]
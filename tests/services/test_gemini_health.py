@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests de l'état de santé Gemini partagé (TTL, mises à jour passives, ping).
+"""
+from src.services.gemini_health import GeminiHealth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingProbe:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+
+
+def _health(clock, probe=None, configured=True, ttl=60):
+    return GeminiHealth(ttl=ttl, probe=probe, configured=lambda: configured, clock=clock)
+
+
+def test_request_outcomes_update_state_until_ttl():
+    """Des erreurs serveur répétées rendent Gemini indisponible, jusqu'à expiration du TTL."""
+    clock = FakeClock()
+    health = _health(clock)
+
+    for _ in range(3):
+        health.record_failure("503 Service Unavailable", 503)
+    assert not health.is_available()
+    assert health.status()["state"] == "unavailable"
+
+    clock.now = 61
+    assert health.is_available()
+    assert health.status()["state"] == "unknown"
+
+
+def test_throttling_and_request_errors_keep_service_available():
+    """429 = service saturé mais joignable ; 400 = requête invalide, pas le service."""
+    clock = FakeClock()
+    health = _health(clock)
+
+    health.record_failure("429 quota", 429)
+    assert health.is_available() and health.status()["state"] == "degraded"
+
+    health.record_failure("400 invalid video", 400)
+    assert health.status()["state"] == "available"
+
+    health.record_failure("403 API key invalid", 403)
+    assert not health.is_available()
+
+
+def test_probe_runs_only_when_state_is_stale():
+    """Le ping n'est lancé qu'une fois l'état périmé, jamais à chaque appel."""
+    clock = FakeClock()
+    probe = CountingProbe()
+    health = _health(clock, probe=probe)
+
+    assert health.is_available()
+    assert health.is_available()
+    assert probe.calls == 1
+    assert health.status()["checked_by"] == "probe"
+
+    health.record_success()
+    clock.now = 30
+    health.is_available()
+    assert probe.calls == 1
+
+    clock.now = 100
+    probe.error = ConnectionError("unreachable")
+    assert health.is_available()
+    assert health.status()["state"] == "degraded"
+    assert probe.calls == 2
+
+
+def test_isolated_failures_only_degrade():
+    """Une erreur sans code (coupure réseau) dégrade ; il en faut plusieurs d'affilée
+    pour déclarer Gemini indisponible, et un succès remet le compteur à zéro."""
+    health = _health(FakeClock())
+
+    health.record_failure("Connection reset")
+    health.record_failure("Connection reset")
+    assert health.is_available() and health.status()["state"] == "degraded"
+
+    health.record_success()
+    health.record_failure("Connection reset")
+    assert health.status()["state"] == "degraded"
+
+    health.record_failure("Connection reset")
+    health.record_failure("Connection reset")
+    assert not health.is_available()
+    assert health.status()["state"] == "unavailable"
+
+
+def test_missing_api_key_is_never_available():
+    """Sans clé API : indisponible, sans ping."""
+    probe = CountingProbe()
+    health = _health(FakeClock(), probe=probe, configured=False)
+
+    assert not health.is_available()
+    assert health.status()["state"] == "not_configured"
+    assert probe.calls == 0
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the Gemini analysis index used by the feature extraction phase.
+"""
+import json
+
+from src.utils.analysis_index import GeminiAnalysisIndex, get_analysis_index
+
+
+def _write(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+    return path
+
+
+def test_index_finds_nested_analyses_and_unwraps(tmp_path):
+    """Files under any date folder are indexed; service responses are unwrapped."""
+    _write(tmp_path / "20250101" / "video_111_analysis.json",
+           {"success": True, "analysis": {"visual_analysis": {"shot_type": "wide"}}})
+    _write(tmp_path / "20250102" / "video_222_analysis.json",
+           {"visual_analysis": {"shot_type": "close-up"}})
+
+    index = GeminiAnalysisIndex(tmp_path)
+
+    assert len(index) == 2
+    assert index.load("111") == {"visual_analysis": {"shot_type": "wide"}}
+    assert index.load("222") == {"visual_analysis": {"shot_type": "close-up"}}
+    assert index.load("333") is None
+
+
+def test_index_walks_once_and_is_updated_incrementally(tmp_path):
+    """New files are only seen through add(), never through another walk."""
+    index = GeminiAnalysisIndex(tmp_path).build()
+    path = _write(tmp_path / "20250103" / "video_444_analysis.json", {"a": 1})
+
+    assert "444" not in index
+    index.add("444", path)
+    assert index.get("444") == path
+
+
+def test_shared_index_per_root(tmp_path):
+    """Writers and readers of the same directory share one index."""
+    assert get_analysis_index(tmp_path) is get_analysis_index(tmp_path / ".")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-bucket rate limiter used by the Gemini analysis phase.
+"""
+import pytest
+
+from src.utils.rate_limiter import TokenBucketLimiter, is_retryable_failure
+
+
+class FakeClock:
+    """Deterministic clock: sleeping advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _limiter(clock, **kwargs):
+    return TokenBucketLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_requests_per_minute_budget():
+    """A burst up to the RPM budget is immediate, then calls are spaced evenly."""
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_minute=60)
+
+    for _ in range(60):
+        limiter.acquire()
+    assert clock.now == 0
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_tokens_per_minute_budget():
+    """The token budget throttles large requests even when the RPM budget allows them."""
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_minute=1000, tokens_per_minute=6000)
+
+    limiter.acquire(tokens=3000)
+    limiter.acquire(tokens=3000)
+    assert clock.now == 0
+
+    limiter.acquire(tokens=3000)
+    assert clock.now == pytest.approx(30.0)
+
+
+def test_adaptive_backoff_on_throttling():
+    """429s pause every caller with exponential backoff and halve the rate."""
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_minute=600, initial_backoff=2.0)
+
+    limiter.report_throttled()
+    assert limiter.rate_factor == 0.5
+    limiter.acquire()
+    assert clock.now == pytest.approx(2.0)
+
+    limiter.report_throttled()
+    limiter.acquire()
+    assert clock.now == pytest.approx(6.0)
+
+    limiter.report_success()
+    assert limiter.rate_factor == pytest.approx(0.3)
+
+
+def test_retryable_failures():
+    """Only throttling and server errors are retried."""
+    assert is_retryable_failure({'success': False, 'status_code': 429})
+    assert is_retryable_failure({'success': False, 'error': 'Quota exceeded',
+                                 'error_type': 'ResourceExhausted'})
+    assert not is_retryable_failure({'success': False, 'status_code': 400})
+    assert not is_retryable_failure({'success': False, 'error': 'JSON parsing error'})
+    assert not is_retryable_failure({'success': True})
+
+
+def test_error_text_is_not_used_for_retries():
+    """Digit runs or words in an error message do not make it retryable."""
+    assert not is_retryable_failure(
+        {'success': False, 'error': 'JSON parsing error: line 1 column 1503 (char 1502)'})
+    assert not is_retryable_failure({'success': False, 'error': '503 Service Unavailable'})
+    assert not is_retryable_failure({'success': False, 'error': 'quota',
+                                     'error_type': 'ValueError'})
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming stage pipeline.
+"""
+import threading
+import time
+
+from src.utils.stage_pipeline import Stage, StagePipeline
+
+
+def _sleepy(seconds, transform=lambda x: x):
+    def func(payload):
+        time.sleep(seconds)
+        return transform(payload)
+    return func
+
+
+def test_items_flow_through_every_stage():
+    """Each item is transformed by every stage, in order."""
+    pipeline = StagePipeline([
+        Stage("double", lambda x: x * 2),
+        Stage("increment", lambda x: x + 1, workers=3),
+    ])
+    result = pipeline.run((i, i) for i in range(10))
+
+    assert sorted(result.completed) == [(i, i * 2 + 1) for i in range(10)]
+    assert not result.failed and not result.dropped
+
+
+def test_stages_overlap():
+    """Wall time approaches the slowest stage, not the sum of all stages."""
+    stage_time, items = 0.05, 6
+    pipeline = StagePipeline([Stage(name, _sleepy(stage_time))
+                              for name in ("scrape", "analyze", "extract")])
+    result = pipeline.run((i, i) for i in range(items))
+
+    sequential = 3 * stage_time * items
+    assert len(result.completed) == items
+    assert result.elapsed < 0.7 * sequential
+    assert result.stage_seconds["analyze"] >= stage_time * items
+
+
+def test_failures_and_drops_are_reported_per_stage():
+    """An error or a None return stops the item without stopping the others."""
+    def check(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return None if x == 5 else x
+
+    result = StagePipeline([Stage("check", check), Stage("keep", lambda x: x)]).run(
+        (i, i) for i in range(7))
+
+    assert sorted(key for key, _ in result.completed) == [0, 1, 2, 4, 6]
+    assert [(key, stage) for key, stage, _ in result.failed] == [(3, "check")]
+    assert result.dropped == [(5, "check")]
+
+
+def test_bounded_queues_apply_backpressure():
+    """A fast producer never runs more than the queue capacity ahead."""
+    release = threading.Event()
+    produced = []
+
+    def produce(x):
+        produced.append(x)
+        return x
+
+    def blocked(x):
+        release.wait()
+        return x
+
+    pipeline = StagePipeline([Stage("produce", produce), Stage("slow", blocked)],
+                             queue_size=1)
+    runner = threading.Thread(target=pipeline.run, args=([(i, i) for i in range(20)],))
+    runner.start()
+    time.sleep(0.1)
+
+    # One item in "slow", one queued, one blocked in put(), one queued upstream
+    assert len(produced) <= 4
+    release.set()
+    runner.join(timeout=5)
+    assert len(produced) == 20